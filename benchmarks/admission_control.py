@@ -0,0 +1,190 @@
+"""
+Deadline-day load test for the admission-control waiting room.
+
+Serves the app on a throwaway test database from a WSGI server with a fixed
+pool of WORKERS threads, like gunicorn: connections beyond that wait in a
+queue. CONCURRENT_USERS logged-in students keep loading the payment page,
+whose Razorpay order call is simulated as a GATEWAY_DELAY wait. The run
+happens once with admission control off and once with it on. Clients honour
+Retry-After (capped at MAX_CLIENT_SLEEP so the run stays short). Reports
+latency percentiles for admitted requests, plus how many were held back or
+failed.
+
+    python benchmarks/admission_control.py
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exam_form_system.settings')
+
+import django
+
+django.setup()
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.core.servers.basehttp import WSGIRequestHandler, WSGIServer
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment
+from django.urls import reverse
+
+# Configuration
+CONCURRENT_USERS = 100  # students on the payment page at the same time
+TEST_DURATION = 20  # seconds per scenario
+WORKERS = 8  # server threads, like gunicorn workers
+GATEWAY_DELAY = 0.5  # seconds for the simulated Razorpay order call
+MAX_IN_FLIGHT = 6  # ADMISSION_MAX_IN_FLIGHT for the controlled run; below WORKERS so queued users are answered fast
+MAX_CLIENT_SLEEP = 1.0  # cap on honouring Retry-After, seconds
+REQUEST_TIMEOUT = 30  # seconds; slower counts as a failure
+
+SCENARIOS = [
+    ('no admission control', {'ADMISSION_CONTROL': False}),
+    (f'admission control ({MAX_IN_FLIGHT} in flight)', {'ADMISSION_CONTROL': True, 'ADMISSION_MAX_IN_FLIGHT': MAX_IN_FLIGHT}),
+]
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class PooledWSGIServer(WSGIServer):
+    """Hands each connection to a fixed thread pool; the rest queue up"""
+
+    request_queue_size = CONCURRENT_USERS * 2
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = ThreadPoolExecutor(max_workers=WORKERS)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.handle_connection, request, client_address)
+
+    def handle_connection(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def start_server():
+    server = PooledWSGIServer(('127.0.0.1', 0), QuietHandler, allow_reuse_address=True)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def create_order(data):
+    time.sleep(GATEWAY_DELAY)
+    return {'id': 'order_bench'}
+
+
+def session_cookies(count):
+    """Log in `count` students with a filled form and return their session cookies"""
+    from exam_app.models import CustomUser
+
+    cookies = []
+    for i in range(count):
+        student = CustomUser.objects.create_user(
+            f'bench_student{i}', f'bench_student{i}@kdkce.edu.in', 'benchpass', college_id=f'BENCH{i:04d}',
+        )
+        client = Client()
+        client.force_login(student)
+        session = client.session
+        session['exam_form_data'] = {'branch': 'cse', 'semester': '5', 'subjects': 'computer_networks', 'exam_type': 'winter'}
+        session.save()
+        cookies.append(session.session_key)
+    return cookies
+
+
+def simulate_user(url, session_key, deadline):
+    """Keep loading the page until the deadline; returns (latencies of 200s, held back, failed)"""
+    session = requests.Session()
+    # A kept-alive connection would pin a server thread between requests
+    session.headers['Connection'] = 'close'
+    session.cookies.set(settings.SESSION_COOKIE_NAME, session_key)
+    latencies, held, failed = [], 0, 0
+    while time.perf_counter() < deadline:
+        start_time = time.perf_counter()
+        try:
+            response = session.get(url, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            failed += 1
+            continue
+        elapsed = time.perf_counter() - start_time
+        if response.status_code == 200:
+            latencies.append(elapsed)
+        elif response.status_code == 503:
+            held += 1
+            time.sleep(min(float(response.headers.get('Retry-After', 1)), MAX_CLIENT_SLEEP))
+        else:
+            failed += 1
+    return latencies, held, failed
+
+
+def percentile(values, pct):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+def run_scenario(url, cookies, overrides):
+    cache.clear()
+    with override_settings(**overrides):
+        deadline = time.perf_counter() + TEST_DURATION
+        with ThreadPoolExecutor(max_workers=len(cookies)) as executor:
+            results = list(executor.map(lambda key: simulate_user(url, key, deadline), cookies))
+    latencies = [latency for user_latencies, _, _ in results for latency in user_latencies]
+    return {
+        'admitted': len(latencies),
+        'held': sum(held for _, held, _ in results),
+        'failed': sum(failed for _, _, failed in results),
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'max': max(latencies, default=0.0),
+    }
+
+
+def main():
+    print("Admission Control Load Test")
+    print(f"{CONCURRENT_USERS} students, {WORKERS} server threads, {GATEWAY_DELAY}s gateway call, "
+          f"{TEST_DURATION}s per scenario")
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    server = None
+    try:
+        with override_settings(
+            ALLOWED_HOSTS=['127.0.0.1'], SECURE_SSL_REDIRECT=False, DEBUG=False,
+            STORAGES={**settings.STORAGES, 'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}},
+        ), mock.patch('exam_app.views.razorpay.Client') as razorpay_client:
+            razorpay_client.return_value.order.create.side_effect = create_order
+            cookies = session_cookies(CONCURRENT_USERS)
+            server = start_server()
+            url = f'http://127.0.0.1:{server.server_port}{reverse("payment")}'
+
+            print(f"\n{'Scenario':<36}{'200s':>8}{'503s':>8}{'failed':>8}{'p50 (s)':>10}{'p99 (s)':>10}{'max (s)':>10}")
+            for name, overrides in SCENARIOS:
+                r = run_scenario(url, cookies, overrides)
+                print(f"{name:<36}{r['admitted']:>8}{r['held']:>8}{r['failed']:>8}"
+                      f"{r['p50']:>10.3f}{r['p99']:>10.3f}{r['max']:>10.3f}")
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Backup/restore benchmark for the backup_data and restore_data commands.
+
+Seeds a throwaway test database with BENCH_ROWS exam forms (plus one
+payment and one attendance row per form), then times a full backup, a
+restore into emptied tables and reports peak memory so it can be checked
+to stay flat as the row count grows.
+
+    BENCH_ROWS=1000000 python benchmarks/backup_restore.py
+"""
+import datetime
+import io
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exam_form_system.settings')
+
+import django
+
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+# Configuration
+ROWS = int(os.environ.get('BENCH_ROWS', 1_000_000))
+STUDENTS = max(ROWS // 20, 1)
+BATCH_SIZE = 5000
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed_data():
+    """Bulk insert STUDENTS users and ROWS forms/payments/attendance rows"""
+    from exam_app.models import Attendance, CustomUser, ExamForm, Payment
+
+    CustomUser.objects.bulk_create([
+        CustomUser(username=f'bench{i}', email=f'bench{i}@kdkce.edu.in', college_id=f'B{i:07d}', password='!')
+        for i in range(STUDENTS)
+    ], batch_size=BATCH_SIZE)
+    student_ids = list(CustomUser.objects.values_list('pk', flat=True))
+    now = timezone.now()
+    first_day = datetime.date(2026, 1, 1)
+
+    for offset in range(0, ROWS, BATCH_SIZE):
+        count = min(BATCH_SIZE, ROWS - offset)
+        forms = ExamForm.objects.bulk_create([
+            ExamForm(student_id=student_ids[(offset + i) % STUDENTS], branch='cse', semester='5',
+                     subjects='computer_networks,software_engineering', exam_type='winter', status='approved',
+                     approved_at=now)
+            for i in range(count)
+        ])
+        Payment.objects.bulk_create([
+            Payment(exam_form=form, amount=100, razorpay_order_id=f'order_{form.pk}',
+                    razorpay_payment_id=f'pay_{form.pk}', status='paid', paid_at=now)
+            for form in forms
+        ])
+        Attendance.objects.bulk_create([
+            Attendance(student_id=student_ids[(offset + i) % STUDENTS],
+                       date=first_day + datetime.timedelta(days=(offset + i) // STUDENTS), status=True)
+            for i in range(count)
+        ])
+
+
+def timed(label, func):
+    start_time = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start_time
+    print(f"{label:<12}{elapsed:>10.1f}s{ROWS / elapsed:>14,.0f} forms/s{peak_rss_mb():>12.0f} MB peak RSS")
+
+
+def main():
+    from exam_app.models import Attendance, CustomUser, ExamForm, Payment
+
+    print("Backup/Restore Benchmark")
+    print(f"Rows: {ROWS:,} forms, {ROWS:,} payments, {ROWS:,} attendance, {STUDENTS:,} students")
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        timed('seed', seed_data)
+        with tempfile.TemporaryDirectory() as backup_dir:
+            timed('backup', lambda: call_command('backup_data', backup_dir, stdout=io.StringIO()))
+            size = sum(os.path.getsize(os.path.join(backup_dir, name)) for name in os.listdir(backup_dir))
+            print(f"Backup size: {size / 1024 / 1024:.1f} MB")
+
+            for model in (Attendance, Payment, ExamForm, CustomUser):
+                model.objects.all()._raw_delete(model.objects.db)
+            timed('restore', lambda: call_command('restore_data', backup_dir, stdout=io.StringIO()))
+            print(f"Restored forms: {ExamForm.objects.count():,}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Bytes-on-wire benchmark for response compression and conditional GET.
+
+Renders the heavy pages in-process (Django test client against a throwaway
+test database) and reports the body size for an uncompressed response, a
+gzip response, a brotli response and a 304 revalidation.
+
+    python benchmarks/compression.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exam_form_system.settings')
+
+import django
+
+django.setup()
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+# Configuration
+FORM_COUNT = 500  # rows rendered in the admin dashboard table
+
+ENCODINGS = [
+    ('identity', ''),
+    ('gzip', 'gzip'),
+    ('brotli', 'br, gzip'),
+]
+
+
+def seed_data():
+    """Create an admin, a student and FORM_COUNT submitted forms"""
+    from exam_app.models import CustomUser, ExamForm, Payment
+
+    admin = CustomUser.objects.create_user('bench_admin', 'bench_admin@kdkce.edu.in', 'benchpass', role='admin')
+    student = CustomUser.objects.create_user('bench_student', 'bench_student@kdkce.edu.in', 'benchpass', college_id='BENCH001')
+    forms = ExamForm.objects.bulk_create([
+        ExamForm(
+            student=student,
+            branch='cse',
+            semester='5',
+            subjects='artificial_intelligence,software_engineering,computer_networks,pe_data_warehousing',
+            exam_type='winter',
+            status=('pending', 'approved', 'rejected')[i % 3],
+            approved_at=timezone.now() if i % 3 == 1 else None,
+        )
+        for i in range(FORM_COUNT)
+    ])
+    Payment.objects.bulk_create([
+        Payment(exam_form=form, amount=100, razorpay_order_id=f'order_bench_{form.pk}',
+                razorpay_payment_id=f'pay_bench_{form.pk}', status='paid', paid_at=timezone.now())
+        for form in forms
+    ])
+    approved = next(form for form in forms if form.status == 'approved')
+    return admin, student, approved
+
+
+def measure(client, url):
+    """Return body sizes for each encoding plus the revalidation response"""
+    sizes = {}
+    etag = None
+    for label, accept in ENCODINGS:
+        response = client.get(url, HTTP_ACCEPT_ENCODING=accept)
+        sizes[label] = len(response.content)
+        etag = response.get('ETag', etag)
+
+    if etag:
+        response = client.get(url, HTTP_ACCEPT_ENCODING='br, gzip', HTTP_IF_NONE_MATCH=etag)
+        sizes['revalidate'] = f"{len(response.content)} ({response.status_code})"
+    else:
+        sizes['revalidate'] = 'no ETag'
+    return sizes
+
+
+def main():
+    print("Response Size Benchmark")
+    print(f"Compression threshold: {settings.COMPRESSION_MIN_SIZE} bytes, "
+          f"brotli quality: {settings.COMPRESSION_BROTLI_QUALITY}")
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        admin, student, approved = seed_data()
+
+        admin_client = Client()
+        admin_client.force_login(admin)
+        student_client = Client()
+        student_client.force_login(student)
+
+        pages = [
+            ('admin_dashboard', admin_client, reverse('admin_dashboard')),
+            ('view_status', student_client, reverse('view_status', args=[approved.pk])),
+            ('download_receipt', student_client, reverse('download_receipt', args=[approved.pk])),
+            ('receipts', student_client, reverse('receipts')),
+            ('get_subjects', student_client, reverse('get_subjects') + '?branch=cse&semester=5'),
+        ]
+
+        print(f"\n{'Page':<20}{'identity':>12}{'gzip':>12}{'brotli':>12}{'304 body':>14}")
+        with override_settings(STORAGES={
+            **settings.STORAGES,
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        }):
+            for name, client, url in pages:
+                sizes = measure(client, url)
+                print(f"{name:<20}{sizes['identity']:>12}{sizes['gzip']:>12}{sizes['brotli']:>12}{sizes['revalidate']:>14}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
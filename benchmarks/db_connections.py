@@ -0,0 +1,82 @@
+"""
+Per-request database connection overhead benchmark.
+
+Replays the request lifecycle (request_started -> one query ->
+request_finished) against the configured database, once with a fresh
+connection per request (CONN_MAX_AGE=0, the old behaviour) and once with
+persistent, health-checked connections. Only runs ``SELECT 1``, so it is
+safe to point at a real MySQL server; use DB_ENGINE=sqlite for a local
+stand-in.
+
+    python benchmarks/db_connections.py
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exam_form_system.settings')
+
+import django
+
+django.setup()
+
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+# Configuration
+REQUESTS = 200  # simulated requests per mode
+
+MODES = [
+    ('new connection per request', 0, False),
+    ('persistent', 600, False),
+    ('persistent + health checks', 600, True),
+]
+
+
+def run_mode(conn_max_age, health_checks):
+    """Simulate REQUESTS requests and return (timings, connections opened)"""
+    connection.close()
+    connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+    connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+
+    opened = []
+    def on_connect(sender, connection, **kwargs):
+        opened.append(connection.alias)
+    connection_created.connect(on_connect)
+
+    timings = []
+    try:
+        for _ in range(REQUESTS):
+            start_time = time.perf_counter()
+            request_started.send(sender=None)
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            request_finished.send(sender=None)
+            timings.append(time.perf_counter() - start_time)
+    finally:
+        connection_created.disconnect(on_connect)
+        connection.close()
+    return timings, len(opened)
+
+
+def main():
+    settings_dict = connection.settings_dict
+    print("Database Connection Overhead Benchmark")
+    print(f"Engine: {settings_dict['ENGINE']}  Host: {settings_dict.get('HOST') or 'n/a'}")
+    print(f"Requests per mode: {REQUESTS}")
+
+    print(f"\n{'Mode':<30}{'connections':>12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for label, conn_max_age, health_checks in MODES:
+        timings, opened = run_mode(conn_max_age, health_checks)
+        timings_ms = sorted(t * 1000 for t in timings)
+        p95 = timings_ms[int(len(timings_ms) * 0.95) - 1]
+        print(f"{label:<30}{opened:>12}{statistics.mean(timings_ms):>10.3f}"
+              f"{statistics.median(timings_ms):>10.3f}{p95:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
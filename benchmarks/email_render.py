@@ -0,0 +1,79 @@
+"""
+Notification email rendering throughput.
+
+Renders BENCH_EMAILS approval emails three ways: render_to_string per email
+(the old per-view path, HTML only), the notification renderer in one
+process (text + HTML), and the renderer spread over a worker pool. Each
+is followed by send_batch() into the in-memory mail backend, which builds
+the multipart messages without any network.
+
+    BENCH_EMAILS=50000 python benchmarks/email_render.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exam_form_system.settings')
+
+import django
+
+django.setup()
+
+from django.core import mail
+from django.template.loader import render_to_string
+from django.test.utils import override_settings
+
+# Configuration
+EMAILS = int(os.environ.get('BENCH_EMAILS', 50_000))
+WORKERS = int(os.environ.get('BENCH_WORKERS', os.cpu_count() or 1))
+
+
+def contexts():
+    return [
+        {
+            'user_name': f'Student {i}',
+            'form_id': i,
+            'branch': 'cse',
+            'semester': '5',
+            'exam_type': 'winter',
+            'subjects': 'computer_networks,software_engineering,compiler_design',
+            'approved_at': '19 October 2026, 10:00 AM',
+            'dashboard_url': 'https://exams.example.edu/student/dashboard/',
+        }
+        for i in range(EMAILS)
+    ]
+
+
+def report(label, seconds):
+    print(f"{label:<36}{seconds:>8.2f}s{EMAILS / seconds:>12,.0f}/s")
+
+
+def main():
+    from exam_app.notifications import render_batch, send_batch
+
+    batch = contexts()
+    print("Notification Email Rendering Benchmark")
+    print(f"Emails: {EMAILS:,}, CPUs: {os.cpu_count()}")
+
+    start = time.perf_counter()
+    for context in batch:
+        render_to_string('exam_app/email_form_approved.html', context)
+    report("render_to_string (HTML only)", time.perf_counter() - start)
+
+    _, stats = render_batch('form_approved', batch, workers=1)
+    report("renderer, 1 process (text + HTML)", stats.render_seconds)
+
+    _, stats = render_batch('form_approved', batch, workers=WORKERS)
+    report(f"renderer, {stats.workers} processes (text + HTML)", stats.render_seconds)
+
+    with override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'):
+        mail.outbox = []
+        start = time.perf_counter()
+        stats = send_batch('form_approved', [(context, f"student{context['form_id']}@example.edu") for context in batch], WORKERS)
+        report("send_batch to locmem backend", time.perf_counter() - start)
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
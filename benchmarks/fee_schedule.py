@@ -0,0 +1,111 @@
+"""
+Fee schedule benchmark: pricing BENCH_FORMS exam forms in bulk, as a
+reconciliation report does.
+
+Seeds a throwaway test database with a realistic rule set (base fee,
+per-branch per-subject fees, a late-fee window) and BENCH_FORMS forms,
+then prices them with expected_fees() (one compiled FeeSchedule) and, for
+a sample, with a naive query of matching rules per form.
+
+    BENCH_FORMS=100000 python benchmarks/fee_schedule.py
+"""
+import datetime
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exam_form_system.settings')
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+# Configuration
+FORMS = int(os.environ.get('BENCH_FORMS', 100_000))
+NAIVE_SAMPLE = 2000
+BATCH_SIZE = 5000
+
+BRANCHES = ['cse', 'it', 'entc', 'mech', 'civil', 'ee']
+SUBJECTS = ['computer_networks', 'software_engineering', 'operating_systems', 'database_management_systems', 'compiler_design']
+
+
+def seed_data():
+    from exam_app.models import CustomUser, ExamForm, FeeRule
+
+    FeeRule.objects.bulk_create(
+        [FeeRule(name=f'{branch} lab fee', branch=branch, per_subject=Decimal('15.00'), min_subjects=2) for branch in BRANCHES]
+        + [FeeRule(name=f'Semester {sem} fee', semester=str(sem), amount=Decimal(10 * sem)) for sem in range(1, 9)]
+        + [FeeRule(name='Winter late fee', exam_type='winter', amount=Decimal('200.00'),
+                   starts_on=datetime.date(2026, 11, 1), ends_on=datetime.date(2026, 11, 30))]
+    )
+    rng = random.Random(7)
+    student = CustomUser.objects.create_user('bench', 'bench@kdkce.edu.in', 'x')
+    start_day = timezone.now() - datetime.timedelta(days=120)
+    for offset in range(0, FORMS, BATCH_SIZE):
+        forms = ExamForm.objects.bulk_create([
+            ExamForm(
+                student=student, branch=rng.choice(BRANCHES), semester=str(rng.randint(1, 8)),
+                exam_type=rng.choice(['winter', 'summer']), subjects=','.join(rng.sample(SUBJECTS, rng.randint(1, 5))),
+            )
+            for _ in range(offset, min(offset + BATCH_SIZE, FORMS))
+        ])
+        # auto_now_add ignores values passed to bulk_create; spread submissions over four months.
+        for form in forms:
+            form.submitted_at = start_day + datetime.timedelta(minutes=rng.randint(0, 120 * 24 * 60))
+        ExamForm.objects.bulk_update(forms, ['submitted_at'], batch_size=BATCH_SIZE)
+
+
+def naive_fee(form):
+    """A query of matching rules per form, summed in Python."""
+    from exam_app.fees import subject_count
+    from exam_app.models import FeeRule
+
+    subjects = subject_count(form.subjects)
+    day = timezone.localdate(form.submitted_at)
+    rules = FeeRule.objects.filter(
+        Q(branch=form.branch) | Q(branch=''), Q(semester=form.semester) | Q(semester=''),
+        Q(exam_type=form.exam_type) | Q(exam_type=''), Q(starts_on__isnull=True) | Q(starts_on__lte=day),
+        Q(ends_on__isnull=True) | Q(ends_on__gte=day), is_active=True, min_subjects__lte=subjects,
+    )
+    return sum((rule.amount + rule.per_subject * subjects for rule in rules), Decimal('0.00'))
+
+
+def main():
+    from exam_app.fees import expected_fees
+    from exam_app.models import ExamForm
+
+    print("Fee Schedule Benchmark")
+    print(f"Forms: {FORMS:,}")
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        seed_data()
+
+        start = time.perf_counter()
+        fees = expected_fees(ExamForm.objects.all())
+        compiled = time.perf_counter() - start
+        print(f"Compiled schedule: {len(fees):,} forms in {compiled:.2f}s ({len(fees) / compiled:,.0f} forms/s)")
+
+        sample = list(ExamForm.objects.order_by('pk')[:NAIVE_SAMPLE])
+        start = time.perf_counter()
+        naive = {form.pk: naive_fee(form) for form in sample}
+        elapsed = time.perf_counter() - start
+        print(f"Query per form:    {len(sample):,} forms in {elapsed:.2f}s ({len(sample) / elapsed:,.0f} forms/s, "
+              f"~{FORMS / (len(sample) / elapsed):.0f}s for all {FORMS:,})")
+        mismatches = sum(1 for pk, fee in naive.items() if fees[pk] != fee)
+        print(f"Mismatches in sample: {mismatches}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Payment reconciliation benchmark: memory and speed on a large settlement
+export.
+
+Seeds a throwaway test database with BENCH_PAYMENTS paid payments and
+writes a settlement CSV of BENCH_LINES lines to a temporary file. The CSV
+holds every payment once (a few with the wrong amount), a few
+gateway-only payments, and refund/adjustment lines to fill the rest. It
+then runs the same index build and streaming pass as `manage.py
+reconcile_payments`, reporting time and peak RSS after each phase.
+
+    BENCH_PAYMENTS=200000 BENCH_LINES=1000000 python benchmarks/reconciliation.py
+"""
+import csv
+import os
+import resource
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exam_form_system.settings')
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+# Configuration
+PAYMENTS = int(os.environ.get('BENCH_PAYMENTS', 200_000))
+LINES = int(os.environ.get('BENCH_LINES', 1_000_000))
+BATCH_SIZE = 5000
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed_data():
+    from exam_app.models import CustomUser, ExamForm, Payment
+
+    student = CustomUser.objects.create_user('bench', 'bench@kdkce.edu.in', 'x')
+    now = timezone.now()
+    for offset in range(0, PAYMENTS, BATCH_SIZE):
+        forms = ExamForm.objects.bulk_create([
+            ExamForm(student=student, branch='cse', semester='5', exam_type='winter', subjects='compiler_design')
+            for _ in range(offset, min(offset + BATCH_SIZE, PAYMENTS))
+        ])
+        Payment.objects.bulk_create([
+            Payment(exam_form=form, amount=Decimal('100.00'), razorpay_order_id=f'order_{offset + i}',
+                    razorpay_payment_id=f'pay_{offset + i}', status='paid', paid_at=now)
+            for i, form in enumerate(forms)
+        ])
+
+
+def write_settlement(path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['entity_id', 'type', 'amount', 'order_id'])
+        for i in range(PAYMENTS):
+            writer.writerow([f'pay_{i}', 'payment', '150.00' if i % 1000 == 0 else '100.00', f'order_{i}'])
+        for i in range(LINES - PAYMENTS):
+            if i % 100 == 0:
+                writer.writerow([f'pay_x{i}', 'payment', '100.00', f'order_x{i}'])
+            else:
+                writer.writerow([f'rfnd_{i}', 'refund' if i % 2 else 'adjustment', '100.00', ''])
+
+
+def main():
+    from exam_app.reconciliation import build_index, reconcile, settlement_rows
+
+    print("Payment Reconciliation Benchmark")
+    print(f"Payments: {PAYMENTS:,}, settlement lines: {LINES:,}")
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        seed_data()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'settlement.csv')
+            write_settlement(path)
+            print(f"Settlement file: {os.path.getsize(path) / 2**20:.1f} MB, peak RSS so far {peak_rss_mb():.0f} MB")
+
+            start = time.perf_counter()
+            index = build_index()
+            print(f"Index build:  {time.perf_counter() - start:6.2f}s, peak RSS {peak_rss_mb():.0f} MB")
+
+            start = time.perf_counter()
+            with open(path, newline='') as source, open(os.devnull, 'w', newline='') as sink:
+                writer = csv.DictWriter(sink, ['issue', 'payment_id', 'order_id', 'gateway_amount', 'recorded_amount',
+                                               'recorded_status', 'source', 'payment_pk', 'exam_form_id', 'detail'])
+                counts = reconcile(settlement_rows(source), index, writer.writerow)
+            elapsed = time.perf_counter() - start
+            print(f"Stream pass:  {elapsed:6.2f}s ({LINES / elapsed:,.0f} lines/s), peak RSS {peak_rss_mb():.0f} MB")
+            print(dict(counts))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Admin search benchmark: SearchToken prefix search vs the LIKE '%...%' scan
+the Django admin used to run.
+
+Seeds a throwaway test database with BENCH_STUDENTS students (one exam
+form each), builds the token index and times both approaches for a few
+typical search-box queries.
+
+    BENCH_STUDENTS=200000 python benchmarks/search_index.py
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exam_form_system.settings')
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import setup_test_environment
+
+# Configuration
+STUDENTS = int(os.environ.get('BENCH_STUDENTS', 200_000))
+REPEAT = 20
+BATCH_SIZE = 5000
+QUERIES = ['cs0012', 'priya', 'priya sha', 'networks', 'rahul@']
+
+FIRST_NAMES = ['Priya', 'Rahul', 'Amit', 'Sneha', 'Vikram', 'Anjali', 'Rohan', 'Kavya', 'Arjun', 'Neha']
+LAST_NAMES = ['Sharma', 'Patil', 'Deshmukh', 'Kulkarni', 'Joshi', 'Verma', 'Gupta', 'Nair', 'Rao', 'Iyer']
+SUBJECTS = ['computer_networks', 'software_engineering', 'operating_systems', 'database_management_systems', 'compiler_design']
+
+
+def seed_data():
+    """Bulk insert STUDENTS users with one exam form each, then index them"""
+    from exam_app.models import CustomUser, ExamForm
+    from exam_app.search import rebuild_index
+
+    rng = random.Random(42)
+    for offset in range(0, STUDENTS, BATCH_SIZE):
+        users = CustomUser.objects.bulk_create([
+            CustomUser(
+                username=f'student{i}', email=f'{first.lower()}.{last.lower()}{i}@kdkce.edu.in',
+                first_name=first, last_name=last, college_id=f'CS{i:06d}', password='!',
+            )
+            for i in range(offset, min(offset + BATCH_SIZE, STUDENTS))
+            for first, last in [(rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES))]
+        ])
+        ExamForm.objects.bulk_create([
+            ExamForm(student=user, branch='cse', semester='5', exam_type='winter', subjects=','.join(rng.sample(SUBJECTS, 3)))
+            for user in users
+        ])
+    start = time.perf_counter()
+    users, tokens = rebuild_index()
+    print(f"Indexed {users:,} users into {tokens:,} tokens in {time.perf_counter() - start:.1f}s")
+
+
+def like_scan(query, limit=10):
+    """What search_fields did: every word must appear somewhere, via LIKE '%word%'"""
+    from exam_app.models import CustomUser
+
+    users = CustomUser.objects.filter(role='student')
+    for word in query.split():
+        users = users.filter(
+            Q(username__icontains=word) | Q(email__icontains=word) | Q(college_id__icontains=word)
+            | Q(first_name__icontains=word) | Q(last_name__icontains=word) | Q(exam_forms__subjects__icontains=word)
+        )
+    return list(users.distinct().order_by('college_id')[:limit])
+
+
+def timed_ms(func, query):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    from exam_app.search import search_students
+
+    print("Admin Search Benchmark")
+    print(f"Students: {STUDENTS:,}, median of {REPEAT} runs per query")
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        seed_data()
+        print(f"{'Query':<14}{'Token index':>14}{'LIKE scan':>14}")
+        for query in QUERIES:
+            print(f"{query:<14}{timed_ms(search_students, query):>12.1f}ms{timed_ms(like_scan, query):>12.1f}ms")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
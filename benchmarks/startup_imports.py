@@ -0,0 +1,69 @@
+"""
+Startup import profile: how long a fresh web process spends importing.
+
+Runs `python -X importtime` in a new interpreter for each stage of startup
+and reports the best of BENCH_RUNS runs, plus the packages that cost the
+most (self time summed per top-level package). Stages are cumulative:
+the settings module, then django.setup() (all INSTALLED_APPS, allauth included), then
+the URLconf and views, then the ASGI application gunicorn loads.
+
+    BENCH_RUNS=5 python benchmarks/startup_imports.py
+"""
+import os
+import subprocess
+import sys
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Configuration
+RUNS = int(os.environ.get('BENCH_RUNS', 5))
+TOP = int(os.environ.get('BENCH_TOP', 12))
+
+STAGES = [
+    ('settings', "import importlib, os; importlib.import_module(os.environ['DJANGO_SETTINGS_MODULE'])"),
+    ('django.setup()', 'import django; django.setup()'),
+    ('exam_app.views', 'import django; django.setup(); import exam_app.urls'),
+    ('exam_form_system.asgi', 'import exam_form_system.asgi'),
+]
+WATCH = ['razorpay', 'allauth', 'decouple', 'PIL', 'whitenoise']
+
+
+def profile(code):
+    """(total microseconds, Counter of self microseconds per top-level package) for one interpreter run."""
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')]))}
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'exam_form_system.settings')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        sys.exit(f'{code!r} failed:\n{result.stderr[-2000:]}')
+    total, packages = 0, Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        packages[name.strip().split('.')[0]] += int(self_us)
+        if not name.startswith('  '):  # top level: its cumulative time includes everything below it
+            total += int(cumulative_us)
+    return total, packages
+
+
+def main():
+    print("Startup Import Profile")
+    print(f"Python {sys.version.split()[0]}, best of {RUNS} runs")
+    print(f"\n{'Stage':<28} {'Import time':>12}")
+    for label, code in STAGES:
+        total, packages = min((profile(code) for _ in range(RUNS)), key=lambda run: run[0])
+        print(f"{label:<28} {total / 1000:>10.1f}ms")
+    print(f"\nMost expensive packages ({STAGES[-1][0]}):")
+    for name, self_us in packages.most_common(TOP):
+        print(f"  {name:<26} {self_us / 1000:>8.1f}ms")
+    print("Watched packages:")
+    for name in WATCH:
+        loaded = name in packages
+        print(f"  {name:<26} {packages[name] / 1000:>8.1f}ms" if loaded else f"  {name:<26}   not imported")
+
+
+if __name__ == "__main__":
+    main()
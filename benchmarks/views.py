@@ -0,0 +1,199 @@
+"""
+View performance regression benchmark.
+
+Seeds a throwaway test database with exam_app.factories: BENCH_STUDENTS
+students with one form each (BENCH_PAID of them paid), a month of
+attendance for the first ATTENDANCE_STUDENTS, the search index and the
+report rollups. It then times the hot pages through the test client, as a
+logged-in student or admin: median and p95 of BENCH_REPEAT requests (fewer,
+but at least MIN_REPEAT, for views that use up BENCH_TIME_BUDGET seconds),
+plus the SQL queries each request runs.
+
+The results are compared with the baseline in BASELINE_PATH. A view fails if
+its query count went up, or if its median is more than BENCH_TOLERANCE
+slower (0.25 = 25%). The script exits nonzero on any failure, so CI can run
+it. Timings only compare on similar hardware and the same database, so the
+timing check is skipped when the baseline's student count or database
+vendor differ. Query counts are always compared.
+BENCH_SAVE_BASELINE=1 records this run as the new baseline instead.
+
+    BENCH_STUDENTS=20000 python benchmarks/views.py
+    BENCH_SAVE_BASELINE=1 python benchmarks/views.py
+"""
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exam_form_system.settings')
+
+import django
+
+django.setup()
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings, setup_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+# Configuration
+STUDENTS = int(os.environ.get('BENCH_STUDENTS', 20_000))
+PAID = float(os.environ.get('BENCH_PAID', 1.0))  # the app only creates a form once it is paid
+ATTENDANCE_STUDENTS = 2000  # students with a month of attendance rows
+REPEAT = int(os.environ.get('BENCH_REPEAT', 30))
+MIN_REPEAT = 5  # requests per view even when one takes longer than TIME_BUDGET
+TIME_BUDGET = float(os.environ.get('BENCH_TIME_BUDGET', 10))  # seconds per view before stopping short of REPEAT
+WARMUP = 2  # untimed requests per view (template and URL caches)
+TOLERANCE = float(os.environ.get('BENCH_TOLERANCE', 0.25))
+SAVE_BASELINE = os.environ.get('BENCH_SAVE_BASELINE') == '1'
+BASELINE_PATH = os.environ.get(
+    'BENCH_BASELINE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'views.json'),
+)
+SEED = 42
+
+
+def seed_data():
+    """Bulk insert the dataset; returns (admin, student, the student's form)"""
+    from exam_app import factories
+    from exam_app.attendance import rebuild_summaries
+    from exam_app.reports import refresh_reports
+    from exam_app.search import rebuild_index
+
+    rng = random.Random(SEED)
+    start = time.perf_counter()
+    ids = factories.bulk_students(STUDENTS, rng)
+    factories.bulk_exam_forms(
+        ((student_id, rng.choice(factories.BRANCHES), rng.choice(factories.SEMESTERS)) for student_id in ids),
+        rng, paid=PAID,
+    )
+    today = timezone.localdate()
+    factories.bulk_attendance(ids[:ATTENDANCE_STUDENTS], [today - datetime.timedelta(days=n) for n in range(30)], rng)
+    rebuild_summaries()
+    rebuild_index()
+    refresh_reports(full=True)
+    print(f"Seeded {STUDENTS:,} students and forms in {time.perf_counter() - start:.1f}s")
+
+    admin = factories.make_admin()
+    student = factories.make_student(first_name='Priya', last_name='Sharma')
+    form = factories.make_paid_form(student, status='approved', approved_at=timezone.now())
+    return admin, student, form
+
+
+def pages(admin, student, form):
+    """(name, user, url) for every view measured"""
+    return [
+        ('student_dashboard', student, reverse('student_dashboard')),
+        ('fill_exam_form', student, reverse('fill_exam_form')),
+        ('receipts', student, reverse('receipts')),
+        ('view_status', student, reverse('view_status', args=[form.pk])),
+        ('get_subjects', student, reverse('get_subjects') + '?branch=cse&semester=5'),
+        ('admin_dashboard', admin, reverse('admin_dashboard')),
+        ('admin_search', admin, reverse('admin_search') + '?q=priya sha'),
+        ('mark_attendance', admin, reverse('mark_attendance') + '?branch=cse&semester=5'),
+        ('reports_data', admin, reverse('reports_data')),
+    ]
+
+
+def measure(client, url):
+    """{'median_ms', 'p95_ms', 'queries', 'requests'} over up to REPEAT requests"""
+    for _ in range(WARMUP):
+        client.get(url)
+    samples = []
+    deadline = time.perf_counter() + TIME_BUDGET
+    while len(samples) < REPEAT and (len(samples) < MIN_REPEAT or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        response = client.get(url)
+        samples.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            sys.exit(f'{url} answered {response.status_code}')
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    return {
+        'median_ms': round(statistics.median(samples), 2),
+        'p95_ms': round(statistics.quantiles(samples, n=20)[-1], 2),
+        'queries': len(queries),
+        'requests': len(samples),
+    }
+
+
+def compare(results, baseline):
+    """Failure messages for results that regressed against `baseline`"""
+    meta = baseline['meta']
+    compare_times = meta['students'] == STUDENTS and meta['vendor'] == connection.vendor
+    if not compare_times:
+        print(f"Baseline was {meta['students']:,} students on {meta['vendor']}: comparing query counts only")
+    failures = []
+    for name, result in results.items():
+        before = baseline['views'].get(name)
+        if before is None:
+            continue
+        if result['queries'] > before['queries']:
+            failures.append(f"{name}: {result['queries']} queries, baseline {before['queries']}")
+        limit = before['median_ms'] * (1 + TOLERANCE)
+        if compare_times and result['median_ms'] > limit:
+            failures.append(f"{name}: median {result['median_ms']:.1f}ms, baseline {before['median_ms']:.1f}ms (+{TOLERANCE:.0%} allowed)")
+    return failures
+
+
+def main():
+    print("View Performance Benchmark")
+    print(f"Students: {STUDENTS:,}, up to {REPEAT} requests or {TIME_BUDGET:.0f}s per view, database: {connection.vendor}")
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        admin, student, form = seed_data()
+        clients = {}
+        for user in (admin, student):
+            clients[user.pk] = Client()
+            clients[user.pk].force_login(user)
+
+        results = {}
+        print(f"\n{'View':<20}{'median':>10}{'p95':>10}{'queries':>9}{'requests':>10}")
+        with override_settings(STORAGES={
+            **settings.STORAGES,
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        }, SECURE_SSL_REDIRECT=False):
+            for name, user, url in pages(admin, student, form):
+                results[name] = result = measure(clients[user.pk], url)
+                print(f"{name:<20}{result['median_ms']:>8.1f}ms{result['p95_ms']:>8.1f}ms{result['queries']:>9}{result['requests']:>10}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    if SAVE_BASELINE:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        baseline = {
+            'meta': {
+                'students': STUDENTS, 'vendor': connection.vendor,
+                'python': platform.python_version(), 'django': django.get_version(),
+                'recorded': timezone.now().date().isoformat(),
+            },
+            'views': results,
+        }
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(baseline, f, indent=2)
+            f.write('\n')
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+        return
+    if not os.path.exists(BASELINE_PATH):
+        print(f"\nNo baseline at {BASELINE_PATH}; run with BENCH_SAVE_BASELINE=1 to record one")
+        return
+    with open(BASELINE_PATH) as f:
+        failures = compare(results, json.load(f))
+    if failures:
+        print("\nRegressions:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"\nNo regressions against {BASELINE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
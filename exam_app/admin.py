@@ -1,9 +1,164 @@
-from django.contrib import admin
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import DateTimeField, Q, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser, ExamForm, Payment, Attendance
+from django.utils import timezone
+from django.utils.functional import cached_property
+from .exam_sessions import active_session, close_session
+from .models import CheckoutOrder, CustomUser, ExamForm, ExamFormDraft, ExamSession, ArchivedExamForm, ArchivedPayment, Payment, Attendance, AttendanceSummary, DailyReport, FeeRule
+from .notifications import send_form_status_emails
+from .photos import reset_thumbnails, schedule_thumbnails
+from .reports import session_registrations
+from .routers import is_pinned_to_primary, reporting_reads
+from .search import matching_users
+
+class ReportingReplicaMixin:
+    """
+    Serve changelist pages from the reporting replica; edits stay on the
+    primary. The page is rendered inside the replica block too, since the
+    date_hierarchy and list_filter template tags run their queries then.
+    """
+
+    def changelist_view(self, request, extra_context=None):
+        if is_pinned_to_primary(request):
+            return super().changelist_view(request, extra_context)
+        with reporting_reads():
+            response = super().changelist_view(request, extra_context)
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+
+class TokenSearchMixin:
+    """
+    Answer the changelist search box from the SearchToken index (prefix match
+    on every word) instead of LIKE '%...%' over `search_fields`, which then
+    only serve to show the box. `exact_search_fields` are also compared to
+    the whole search term, e.g. for order ids.
+    """
+    search_user_path = 'student'
+    exact_search_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        users = matching_users(search_term).values('pk')
+        match = Q(**{f'{self.search_user_path}__in': users})
+        for field in self.exact_search_fields:
+            match |= Q(**{field: search_term})
+        return queryset.filter(match), False
+
+def _estimated_row_count(model, using):
+    """The database's own row estimate for `model`'s table, or None if it keeps none."""
+    connection = connections[using]
+    table = model._meta.db_table
+    queries = {
+        'mysql': ('SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s', int),
+        'postgresql': ('SELECT reltuples FROM pg_class WHERE relname = %s', int),
+        # Written by ANALYZE; each index's stat string starts with the row count.
+        'sqlite': ('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', lambda stat: int(stat.split()[0])),
+    }
+    if connection.vendor not in queries:
+        return None
+    sql, parse = queries[connection.vendor]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    return parse(row[0]) if row and row[0] is not None else None
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Page a changelist by an estimate instead of an exact COUNT(*), once the
+    estimate reaches ADMIN_ESTIMATED_COUNT_THRESHOLD rows: the table's row
+    estimate when unfiltered, and the session's registrations from the
+    DailyReport rollups for the default view (`session_filter`, the
+    (field_path, session) the session filter applied on its own). Any other
+    filter or search still counts exactly; those counts are narrowed by an
+    index.
+    """
+
+    def __init__(self, *args, session_filter=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session_filter = session_filter
+
+    def _estimate(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            return _estimated_row_count(queryset.model, queryset.db)
+        if self.session_filter:
+            field_path, session = self.session_filter
+            default_view = queryset.model._default_manager.filter(**{f'{field_path}_id': session.pk})
+            if queryset.query.where == default_view.query.where:
+                return session_registrations(session)
+        return None
+
+    @cached_property
+    def count(self):
+        estimate = self._estimate()
+        if estimate is not None and estimate >= getattr(settings, 'ADMIN_ESTIMATED_COUNT_THRESHOLD', 50000):
+            return estimate
+        return super().count
+
+class LargeTableAdminMixin:
+    """Changelist settings for tables that grow with every exam session."""
+    paginator = EstimatedCountPaginator
+    # Skips the second whole-table COUNT(*) behind "N results (M total)".
+    show_full_result_count = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return self.paginator(
+            queryset, per_page, orphans, allow_empty_first_page,
+            session_filter=getattr(request, 'default_session_filter', None),
+        )
+
+class ExamSessionListFilter(admin.SimpleListFilter):
+    """Session filter that defaults to the active session instead of every row."""
+    title = 'exam session'
+    parameter_name = 'session'
+    field_path = 'session'
+
+    def lookups(self, request, model_admin):
+        return [(str(session.pk), str(session)) for session in ExamSession.objects.all()] + [('all', 'All sessions')]
+
+    @cached_property
+    def default_session(self):
+        # value() runs for every choice; look the active session up once.
+        return active_session()
+
+    def value(self):
+        value = super().value()
+        if value is None:
+            return str(self.default_session.pk) if self.default_session else 'all'
+        return value
+
+    def queryset(self, request, queryset):
+        if self.value() == 'all':
+            return queryset
+        if super().value() is None:
+            # Lets LargeTableAdminMixin estimate the count of the default view.
+            request.default_session_filter = (self.field_path, self.default_session)
+        return queryset.filter(**{f'{self.field_path}_id': self.value()})
+
+    def choices(self, changelist):
+        for lookup, title in self.lookup_choices:
+            yield {
+                'selected': self.value() == lookup,
+                'query_string': changelist.get_query_string({self.parameter_name: lookup}),
+                'display': title,
+            }
+
+class PaymentSessionListFilter(ExamSessionListFilter):
+    field_path = 'exam_form__session'
 
 @admin.register(CustomUser)
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(TokenSearchMixin, UserAdmin):
+    search_user_path = 'pk'
     list_display = ('username', 'email', 'first_name', 'last_name', 'role', 'college_id', 'is_staff', 'is_superuser', 'is_active')
     list_filter = ('role', 'is_staff', 'is_superuser', 'is_active', 'date_joined')
     search_fields = ('username', 'email', 'first_name', 'last_name', 'college_id')
@@ -13,6 +168,14 @@ class CustomUserAdmin(UserAdmin):
     def has_delete_permission(self, request, obj=None):
         return True
 
+    def save_model(self, request, obj, form, change):
+        photo_changed = 'profile_photo' in form.changed_data
+        if photo_changed:
+            reset_thumbnails(obj)
+        super().save_model(request, obj, form, change)
+        if photo_changed:
+            schedule_thumbnails(obj)
+
     fieldsets = UserAdmin.fieldsets + (
         ('Additional Info', {
             'fields': ('role', 'college_id', 'middle_name', 'mobile_no', 'aadhar_no', 'date_of_birth', 'address', 'profile_photo')
@@ -25,10 +188,14 @@ class CustomUserAdmin(UserAdmin):
     )
 
 @admin.register(ExamForm)
-class ExamFormAdmin(admin.ModelAdmin):
-    list_display = ('id', 'student', 'branch', 'semester', 'exam_type', 'status', 'submitted_at', 'approved_at')
-    list_filter = ('status', 'exam_type', 'branch', 'semester', 'submitted_at', 'approved_at')
+class ExamFormAdmin(TokenSearchMixin, ReportingReplicaMixin, LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ('id', 'student', 'session', 'branch', 'semester', 'exam_type', 'status', 'submitted_at', 'approved_at')
+    list_select_related = ('student', 'session')
+    date_hierarchy = 'submitted_at'
+    actions = ['approve_forms', 'reject_forms']
+    list_filter = (ExamSessionListFilter, 'status', 'exam_type', 'branch', 'semester', 'submitted_at', 'approved_at')
     search_fields = ('student__username', 'student__email', 'student__college_id', 'branch', 'semester')
+    exact_search_fields = ('branch', 'semester')
     ordering = ('-submitted_at',)
     readonly_fields = ('submitted_at', 'approved_at')
 
@@ -37,18 +204,58 @@ class ExamFormAdmin(admin.ModelAdmin):
             'fields': ('student',)
         }),
         ('Exam Details', {
-            'fields': ('branch', 'semester', 'subjects', 'exam_type')
+            'fields': ('session', 'branch', 'semester', 'subjects', 'exam_type')
         }),
         ('Status', {
             'fields': ('status', 'submitted_at', 'approved_at')
         }),
     )
 
+    def _set_status(self, request, queryset, status):
+        # One UPDATE for the batch. It bypasses save(), so updated_at (the
+        # live status feed) is stamped by hand.
+        now = timezone.now()
+        forms = list(queryset.exclude(status=status).select_related('student'))
+        changes = {'status': status, 'updated_at': now}
+        if status == 'approved':
+            changes['approved_at'] = now
+        ExamForm.objects.filter(pk__in=[form.pk for form in forms]).update(**changes)
+        for form in forms:
+            for field, value in changes.items():
+                setattr(form, field, value)
+        if len(forms) <= getattr(settings, 'ADMIN_STATUS_EMAIL_LIMIT', 200):
+            # Rendered in this process: a web worker never starts a render pool.
+            send_form_status_emails(forms, request.build_absolute_uri('/student/dashboard/'), workers=1)
+            self.message_user(request, f'{len(forms)} form(s) {status}.')
+            return
+        sessions = sorted({form.session_id for form in forms if form.session_id})
+        commands = '; '.join(
+            f'python manage.py send_status_emails --session {session_id} --status {status} --since {now.isoformat()}'
+            for session_id in sessions
+        )
+        self.message_user(
+            request, f'{len(forms)} form(s) {status}. Too many to email from here; notify the students with: {commands}',
+            messages.WARNING,
+        )
+
+    @admin.action(description='Approve selected forms and notify students', permissions=['change'])
+    def approve_forms(self, request, queryset):
+        self._set_status(request, queryset, 'approved')
+
+    @admin.action(description='Reject selected forms and notify students', permissions=['change'])
+    def reject_forms(self, request, queryset):
+        self._set_status(request, queryset, 'rejected')
+
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(TokenSearchMixin, ReportingReplicaMixin, LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('id', 'exam_form', 'amount', 'status', 'razorpay_order_id', 'paid_at')
-    list_filter = ('status', 'created_at', 'paid_at')
+    list_select_related = ('exam_form__student',)
+    date_hierarchy = 'paid_at'
+    actions = ['mark_paid']
+    list_filter = (PaymentSessionListFilter, 'status', 'created_at', 'paid_at')
     search_fields = ('exam_form__student__username', 'exam_form__student__email', 'razorpay_order_id', 'razorpay_payment_id')
+    search_user_path = 'exam_form__student'
+    exact_search_fields = ('razorpay_order_id', 'razorpay_payment_id')
     ordering = ('-created_at',)
     readonly_fields = ('created_at', 'paid_at')
 
@@ -61,9 +268,83 @@ class PaymentAdmin(admin.ModelAdmin):
         }),
     )
 
+    @admin.action(description='Mark selected payments as paid', permissions=['change'])
+    def mark_paid(self, request, queryset):
+        # Keeps an existing paid_at; refresh_reports picks the new ones up by paid_at.
+        updated = queryset.exclude(status='paid').update(
+            status='paid', paid_at=Coalesce('paid_at', Value(timezone.now(), output_field=DateTimeField())),
+        )
+        self.message_user(request, f'{updated} payment(s) marked as paid.')
+
+@admin.register(ExamFormDraft)
+class ExamFormDraftAdmin(TokenSearchMixin, admin.ModelAdmin):
+    # Forms students are still filling in or haven't paid for yet.
+    list_display = ('student', 'branch', 'semester', 'exam_type', 'submitted', 'fee', 'updated_at')
+    list_filter = ('submitted', 'exam_type', 'branch')
+    list_select_related = ('student',)
+    search_fields = ('student__username',)
+    date_hierarchy = 'updated_at'
+    readonly_fields = ('razorpay_order_id', 'fee', 'created_at', 'updated_at')
+
+@admin.register(CheckoutOrder)
+class CheckoutOrderAdmin(TokenSearchMixin, admin.ModelAdmin):
+    # Every Razorpay order opened, with what it pays for; paid ones have a Payment of the same order id.
+    list_display = ('razorpay_order_id', 'student', 'branch', 'semester', 'exam_type', 'fee', 'created_at')
+    list_filter = ('exam_type', 'branch')
+    list_select_related = ('student',)
+    search_fields = ('student__username',)
+    exact_search_fields = ('razorpay_order_id',)
+    date_hierarchy = 'created_at'
+    readonly_fields = [field.name for field in CheckoutOrder._meta.fields]
+
+@admin.register(FeeRule)
+class FeeRuleAdmin(admin.ModelAdmin):
+    # A form pays the sum of every active rule matching it; see exam_app.fees.
+    list_display = ('name', 'branch', 'semester', 'exam_type', 'min_subjects', 'starts_on', 'ends_on', 'amount', 'per_subject', 'is_active')
+    list_filter = ('is_active', 'exam_type', 'branch', 'semester')
+    list_editable = ('amount', 'per_subject', 'is_active')
+    search_fields = ('name',)
+
+@admin.register(ExamSession)
+class ExamSessionAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'year', 'exam_type', 'is_active', 'closed_at', 'archived_at')
+    list_filter = ('exam_type', 'is_active')
+    readonly_fields = ('created_at', 'closed_at', 'archived_at')
+    actions = ['close_sessions']
+
+    @admin.action(description='Close selected sessions (archive them with manage.py archive_sessions)')
+    def close_sessions(self, request, queryset):
+        for session in queryset:
+            close_session(session)
+        self.message_user(request, f'Closed {queryset.count()} session(s).')
+
+class ArchiveAdmin(admin.ModelAdmin):
+    """Archived rows are history: viewable, never edited."""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(ArchivedExamForm)
+class ArchivedExamFormAdmin(TokenSearchMixin, LargeTableAdminMixin, ArchiveAdmin):
+    list_display = ('id', 'student', 'session', 'branch', 'semester', 'status', 'submitted_at', 'archived_at')
+    list_select_related = ('student', 'session')
+    list_filter = ('session', 'status')
+    search_fields = ('student__username', 'student__email', 'student__college_id')
+
+@admin.register(ArchivedPayment)
+class ArchivedPaymentAdmin(LargeTableAdminMixin, ArchiveAdmin):
+    list_display = ('id', 'exam_form', 'amount', 'status', 'razorpay_order_id', 'paid_at')
+    list_select_related = ('exam_form__student',)
+    list_filter = ('exam_form__session', 'status')
+    search_fields = ('razorpay_order_id', 'razorpay_payment_id', 'exam_form__student__username')
+
 @admin.register(Attendance)
 class AttendanceAdmin(admin.ModelAdmin):
     list_display = ('id', 'student', 'date', 'status')
+    list_select_related = ('student',)
     list_filter = ('status', 'date')
     search_fields = ('student__username', 'student__email', 'student__college_id')
     ordering = ('-date',)
@@ -73,3 +354,28 @@ class AttendanceAdmin(admin.ModelAdmin):
             'fields': ('student', 'date', 'status')
         }),
     )
+
+@admin.register(AttendanceSummary)
+class AttendanceSummaryAdmin(admin.ModelAdmin):
+    # Maintained from Attendance writes; rebuild with `manage.py rebuild_attendance_summaries`.
+    list_display = ('student', 'year', 'exam_type', 'present_days', 'total_days', 'percentage', 'updated_at')
+    list_select_related = ('student',)
+    list_filter = ('year', 'exam_type')
+    search_fields = ('student__username', 'student__email', 'student__college_id')
+    ordering = ('-year', 'exam_type', 'student__college_id')
+    readonly_fields = ('student', 'year', 'exam_type', 'present_days', 'total_days', 'updated_at')
+
+    def has_add_permission(self, request):
+        return False
+
+@admin.register(DailyReport)
+class DailyReportAdmin(admin.ModelAdmin):
+    # Derived from forms and payments; refresh with `manage.py refresh_reports`.
+    list_display = ('day', 'branch', 'semester', 'exam_type', 'registrations', 'payments', 'fee_total', 'updated_at')
+    list_filter = ('exam_type', 'branch', 'semester')
+    date_hierarchy = 'day'
+    ordering = ('-day', 'branch', 'semester', 'exam_type')
+    readonly_fields = ('day', 'branch', 'semester', 'exam_type', 'registrations', 'payments', 'fee_total', 'updated_at')
+
+    def has_add_permission(self, request):
+        return False
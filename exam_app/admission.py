@@ -0,0 +1,96 @@
+"""
+Admission control for the deadline-day student journey (filling the exam
+form and paying). At most ADMISSION_MAX_IN_FLIGHT of these requests run at
+once: each one holds a slot key in the cache while it runs. Slot keys expire
+after ADMISSION_SLOT_TIMEOUT so a killed worker cannot leak capacity. Use a
+shared cache (REDIS_URL) for the cap to span gunicorn workers; with the
+default local-memory cache it applies per process.
+
+Requests that find every slot busy get a signed queue ticket and an
+estimated wait, so retries arrive roughly in ticket order.
+"""
+import math
+import random
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+
+SLOT_KEY = 'admission:slot:{}'
+TICKETS_KEY = 'admission:tickets'
+SERVED_KEY = 'admission:served'
+TICKET_COOKIE = 'admission_ticket'
+TICKET_SALT = 'exam_app.admission'
+
+# A few add() attempts on free-looking slots before giving up on a race.
+ACQUIRE_ATTEMPTS = 3
+
+
+def _cache():
+    return caches[getattr(settings, 'ADMISSION_CACHE_ALIAS', 'default')]
+
+
+def max_in_flight():
+    return getattr(settings, 'ADMISSION_MAX_IN_FLIGHT', 20)
+
+
+def acquire_slot():
+    """Claim a free slot: one get_many plus an add(). Returns (key, token), or None when all are busy."""
+    cache = _cache()
+    keys = [SLOT_KEY.format(i) for i in range(max_in_flight())]
+    busy = cache.get_many(keys)
+    free = [key for key in keys if key not in busy]
+    random.shuffle(free)
+    token = uuid.uuid4().hex
+    for key in free[:ACQUIRE_ATTEMPTS]:
+        if cache.add(key, token, timeout=getattr(settings, 'ADMISSION_SLOT_TIMEOUT', 30)):
+            return key, token
+    return None
+
+
+def release_slot(slot):
+    key, token = slot
+    cache = _cache()
+    # The slot may have expired and been taken by another request meanwhile.
+    if cache.get(key) == token:
+        cache.delete(key)
+
+
+def read_ticket(value):
+    """Ticket number from a queue cookie, or None if missing, forged or stale."""
+    if not value:
+        return None
+    try:
+        return int(signing.TimestampSigner(salt=TICKET_SALT).unsign(
+            value, max_age=getattr(settings, 'ADMISSION_TICKET_MAX_AGE', 1800),
+        ))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def sign_ticket(ticket):
+    return signing.TimestampSigner(salt=TICKET_SALT).sign(str(ticket))
+
+
+def issue_ticket():
+    cache = _cache()
+    cache.add(TICKETS_KEY, 0, timeout=None)
+    return cache.incr(TICKETS_KEY)
+
+
+def mark_served(ticket):
+    """Advance the 'now serving' number used for position estimates."""
+    cache = _cache()
+    if ticket > cache.get(SERVED_KEY, 0):
+        cache.set(SERVED_KEY, ticket, timeout=None)
+
+
+def queue_position(ticket):
+    return max(ticket - _cache().get(SERVED_KEY, 0), 1)
+
+
+def estimated_wait(position, avg_seconds):
+    """Seconds until `position` is likely to be admitted, clamped to a sensible retry interval."""
+    wait = math.ceil(position * avg_seconds / max_in_flight())
+    return min(max(wait, getattr(settings, 'ADMISSION_MIN_RETRY', 3)), 60)
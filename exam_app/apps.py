@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ExamAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'exam_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,293 @@
+// Enhanced Mobile menu toggle with animations
+const mobileMenuButton = document.getElementById('mobile-menu-button');
+const mobileMenu = document.getElementById('mobile-menu');
+const hamburgerLines = [
+    document.getElementById('hamburger-line-1'),
+    document.getElementById('hamburger-line-2'),
+    document.getElementById('hamburger-line-3')
+];
+
+let isMenuOpen = false;
+
+mobileMenuButton.addEventListener('click', function() {
+    isMenuOpen = !isMenuOpen;
+
+    if (isMenuOpen) {
+        mobileMenu.classList.remove('hidden');
+        setTimeout(() => {
+            mobileMenu.classList.remove('max-h-0', 'opacity-0');
+            mobileMenu.classList.add('max-h-96', 'opacity-100');
+        }, 10);
+
+        // Animate hamburger to X
+        hamburgerLines[0].classList.add('rotate-45', 'translate-y-1.5');
+        hamburgerLines[1].classList.add('opacity-0');
+        hamburgerLines[2].classList.add('-rotate-45', '-translate-y-1.5');
+    } else {
+        mobileMenu.classList.remove('max-h-96', 'opacity-100');
+        mobileMenu.classList.add('max-h-0', 'opacity-0');
+        setTimeout(() => {
+            mobileMenu.classList.add('hidden');
+        }, 300);
+
+        // Animate X back to hamburger
+        hamburgerLines[0].classList.remove('rotate-45', 'translate-y-1.5');
+        hamburgerLines[1].classList.remove('opacity-0');
+        hamburgerLines[2].classList.remove('-rotate-45', '-translate-y-1.5');
+    }
+});
+
+// Close mobile menu when clicking outside
+document.addEventListener('click', function(event) {
+    if (!mobileMenu.contains(event.target) && !mobileMenuButton.contains(event.target) && isMenuOpen) {
+        mobileMenuButton.click();
+    }
+});
+
+// Scroll progress bar
+window.addEventListener('scroll', function() {
+    const scrollTop = window.pageYOffset;
+    const docHeight = document.body.offsetHeight - window.innerHeight;
+    const scrollPercent = (scrollTop / docHeight) * 100;
+    document.getElementById('scroll-progress').style.transform = `scaleX(${scrollPercent / 100})`;
+});
+
+// Navbar scroll effect
+let lastScrollTop = 0;
+const navbar = document.querySelector('nav');
+
+window.addEventListener('scroll', function() {
+    const scrollTop = window.pageYOffset || document.documentElement.scrollTop;
+
+    if (scrollTop > lastScrollTop && scrollTop > 100) {
+        // Scrolling down
+        navbar.style.transform = 'translateY(-100%)';
+    } else {
+        // Scrolling up
+        navbar.style.transform = 'translateY(0)';
+    }
+
+    lastScrollTop = scrollTop <= 0 ? 0 : scrollTop;
+});
+
+// Form validation and interactivity for login page
+if (document.getElementById('login-form')) {
+    const loginForm = document.getElementById('login-form');
+    const usernameInput = document.getElementById('username');
+    const passwordInput = document.getElementById('password');
+    const loginBtn = document.getElementById('login-btn');
+    const loginText = document.getElementById('login-text');
+    const loginSpinner = document.getElementById('login-spinner');
+    const usernameError = document.getElementById('username-error');
+    const passwordError = document.getElementById('password-error');
+
+    // Real-time validation
+    usernameInput.addEventListener('input', function() {
+        if (this.value.length < 3) {
+            usernameError.classList.remove('hidden');
+            this.classList.add('border-red-500');
+        } else {
+            usernameError.classList.add('hidden');
+            this.classList.remove('border-red-500');
+        }
+    });
+
+    passwordInput.addEventListener('input', function() {
+        if (this.value.length < 6) {
+            passwordError.classList.remove('hidden');
+            this.classList.add('border-red-500');
+        } else {
+            passwordError.classList.add('hidden');
+            this.classList.remove('border-red-500');
+        }
+    });
+
+    // Form submission with loading state
+    loginForm.addEventListener('submit', function(e) {
+        const isValid = usernameInput.value.length >= 3 && passwordInput.value.length >= 6;
+        if (!isValid) {
+            e.preventDefault();
+            if (usernameInput.value.length < 3) usernameError.classList.remove('hidden');
+            if (passwordInput.value.length < 6) passwordError.classList.remove('hidden');
+            return;
+        }
+
+        loginBtn.disabled = true;
+        loginText.textContent = 'Signing In...';
+        loginSpinner.classList.remove('hidden');
+    });
+}
+
+// Form validation and interactivity for register page
+if (document.getElementById('register-form')) {
+    const registerForm = document.getElementById('register-form');
+    const registerBtn = document.getElementById('register-btn');
+    const registerText = document.getElementById('register-text');
+    const registerSpinner = document.getElementById('register-spinner');
+
+    // Password requirements validation
+    const passwordInput = document.getElementById('id_password1');
+    if (passwordInput) {
+        passwordInput.addEventListener('input', function() {
+            const password = this.value;
+
+            // Length check
+            const lengthReq = document.getElementById('req-length');
+            const lengthSpan = lengthReq.querySelector('span');
+            if (password.length >= 8) {
+                lengthSpan.classList.remove('border-gray-300');
+                lengthSpan.classList.add('bg-green-500', 'border-green-500');
+            } else {
+                lengthSpan.classList.remove('bg-green-500', 'border-green-500');
+                lengthSpan.classList.add('border-gray-300');
+            }
+
+            // Uppercase check
+            const upperReq = document.getElementById('req-uppercase');
+            const upperSpan = upperReq.querySelector('span');
+            if (/[A-Z]/.test(password)) {
+                upperSpan.classList.remove('border-gray-300');
+                upperSpan.classList.add('bg-green-500', 'border-green-500');
+            } else {
+                upperSpan.classList.remove('bg-green-500', 'border-green-500');
+                upperSpan.classList.add('border-gray-300');
+            }
+
+            // Lowercase check
+            const lowerReq = document.getElementById('req-lowercase');
+            const lowerSpan = lowerReq.querySelector('span');
+            if (/[a-z]/.test(password)) {
+                lowerSpan.classList.remove('border-gray-300');
+                lowerSpan.classList.add('bg-green-500', 'border-green-500');
+            } else {
+                lowerSpan.classList.remove('bg-green-500', 'border-green-500');
+                lowerSpan.classList.add('border-gray-300');
+            }
+
+            // Number check
+            const numberReq = document.getElementById('req-number');
+            const numberSpan = numberReq.querySelector('span');
+            if (/\d/.test(password)) {
+                numberSpan.classList.remove('border-gray-300');
+                numberSpan.classList.add('bg-green-500', 'border-green-500');
+            } else {
+                numberSpan.classList.remove('bg-green-500', 'border-green-500');
+                numberSpan.classList.add('border-gray-300');
+            }
+
+            // Special character check
+            const specialReq = document.getElementById('req-special');
+            const specialSpan = specialReq.querySelector('span');
+            if (/[!@#$%^&*]/.test(password)) {
+                specialSpan.classList.remove('border-gray-300');
+                specialSpan.classList.add('bg-green-500', 'border-green-500');
+            } else {
+                specialSpan.classList.remove('bg-green-500', 'border-green-500');
+                specialSpan.classList.add('border-gray-300');
+            }
+        });
+    }
+
+    // Form submission with loading state
+    registerForm.addEventListener('submit', function(e) {
+        registerBtn.disabled = true;
+        registerText.textContent = 'Creating Account...';
+        registerSpinner.classList.remove('hidden');
+    });
+}
+
+// Typing animation for home page
+if (document.getElementById('typing-text')) {
+    const typingText = document.getElementById('typing-text');
+    const originalText = typingText.textContent;
+    let i = 0;
+    let isDeleting = false;
+
+    function typeWriter() {
+        const currentText = isDeleting
+            ? originalText.substring(0, i--)
+            : originalText.substring(0, i++);
+
+        typingText.textContent = currentText;
+
+        if (!isDeleting && i === originalText.length) {
+            setTimeout(() => isDeleting = true, 2000);
+        } else if (isDeleting && i === 0) {
+            isDeleting = false;
+        }
+
+        const speed = isDeleting ? 50 : 100;
+        setTimeout(typeWriter, speed);
+    }
+
+    // Start typing animation after a delay
+    setTimeout(typeWriter, 1000);
+}
+
+// Counter animation for stats
+function animateCounters() {
+    const counters = document.querySelectorAll('[data-target]');
+    counters.forEach(counter => {
+        const target = +counter.getAttribute('data-target');
+        const count = +counter.innerText;
+        const increment = target / 200;
+
+        if (count < target) {
+            counter.innerText = Math.ceil(count + increment);
+            setTimeout(animateCounters, 10);
+        } else {
+            counter.innerText = target;
+        }
+    });
+}
+
+// Trigger counter animation when stats section is visible
+const statsSection = document.querySelector('.bg-gradient-to-r.from-indigo-600.to-purple-600');
+if (statsSection) {
+    const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                animateCounters();
+                observer.unobserve(entry.target);
+            }
+        });
+    });
+    observer.observe(statsSection);
+}
+
+// Smooth scrolling for anchor links
+document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+    anchor.addEventListener('click', function (e) {
+        e.preventDefault();
+        const target = document.querySelector(this.getAttribute('href'));
+        if (target) {
+            target.scrollIntoView({
+                behavior: 'smooth',
+                block: 'start'
+            });
+        }
+    });
+});
+
+// Demo functions for home page
+function demoForm() {
+    // Navigate to login page
+    window.location.href = document.body.dataset.loginUrl;
+}
+
+function scrollToStats() {
+    const statsSection = document.querySelector('.bg-gradient-to-r.from-indigo-600.to-purple-600');
+    if (statsSection) {
+        statsSection.scrollIntoView({ behavior: 'smooth' });
+    }
+}
+
+// Enhanced navbar hover effects
+document.querySelectorAll('.nav-link').forEach(link => {
+    link.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-2px)';
+    });
+    link.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0)';
+    });
+});
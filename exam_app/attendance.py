@@ -0,0 +1,209 @@
+"""
+Bulk attendance writes shared by the marking page, the JSON API and the
+import_attendance command. Rows are upserted on the (student, date) unique
+key in batches, so re-marking a day or re-importing a file just updates the
+existing rows.
+
+Every write also refreshes the matching AttendanceSummary rows, so exam
+eligibility is a lookup on the (student, year, exam_type) unique key rather
+than an aggregate over raw attendance. Terms follow the exam sessions: the
+winter term runs July-December and the summer term January-June.
+"""
+import datetime
+from collections import defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Attendance, AttendanceSummary, CustomUser
+
+ATTENDANCE_BATCH_SIZE = 5000
+
+PRESENT_VALUES = {'1', 'true', 'yes', 'y', 'p', 'present'}
+ABSENT_VALUES = {'0', 'false', 'no', 'n', 'a', 'absent'}
+
+
+def parse_status(value):
+    """Turn 'P'/'A', 'present'/'absent', 1/0, true/false into a bool."""
+    if isinstance(value, bool):
+        return value
+    normalized = str(value).strip().lower()
+    if normalized in PRESENT_VALUES:
+        return True
+    if normalized in ABSENT_VALUES:
+        return False
+    raise ValueError(f'Unrecognised attendance status: {value!r}')
+
+
+def student_ids_by_college_id(college_ids=None):
+    """Map college IDs to student primary keys with a single query."""
+    students = CustomUser.objects.filter(role='student', college_id__isnull=False)
+    if college_ids is not None:
+        students = students.filter(college_id__in=college_ids)
+    return dict(students.values_list('college_id', 'pk'))
+
+
+def _conflict_target(model, fields):
+    """
+    unique_fields for an upsert of `model`. MySQL's ON DUPLICATE KEY UPDATE
+    takes no conflict target (Django raises NotSupportedError if given one)
+    and uses whichever unique key the row collides with.
+    """
+    features = connections[router.db_for_write(model)].features
+    return fields if features.supports_update_conflicts_with_target else None
+
+
+def upsert_attendance(records, batch_size=ATTENDANCE_BATCH_SIZE, refresh=True):
+    """
+    Insert or update (student_id, date, status) tuples, one INSERT ... ON
+    CONFLICT/ON DUPLICATE KEY statement per batch. Consumes `records` lazily,
+    so a generator over a large file is never held in memory. Returns the
+    number of rows written.
+
+    bulk_create sends no signals, so the summaries touched by each batch are
+    refreshed here. Pass refresh=False for large imports and call
+    rebuild_summaries() for the affected terms afterwards instead.
+    """
+    records = iter(records)
+    written = 0
+    while True:
+        batch = [
+            Attendance(student_id=student_id, date=date, status=status)
+            for student_id, date, status in islice(records, batch_size)
+        ]
+        if not batch:
+            return written
+        Attendance.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=_conflict_target(Attendance, ['student', 'date']),
+            update_fields=['status', 'updated_at'],
+        )
+        written += len(batch)
+        if refresh:
+            refresh_summaries({(row.student_id, term_for_date(row.date)) for row in batch})
+
+
+def term_for_date(date):
+    """The (year, exam_type) term an attendance date counts towards."""
+    return date.year, 'winter' if date.month >= 7 else 'summer'
+
+
+def term_for_exam(exam_type, today=None):
+    """The term whose attendance decides eligibility for an exam of `exam_type` filled in on `today`."""
+    today = today or datetime.date.today()
+    if exam_type == 'winter' and today.month < 7:
+        # Late winter forms filed in January-June belong to last year's winter term.
+        return today.year - 1, 'winter'
+    return today.year, exam_type
+
+
+def term_bounds(year, exam_type):
+    if exam_type == 'winter':
+        return datetime.date(year, 7, 1), datetime.date(year, 12, 31)
+    return datetime.date(year, 1, 1), datetime.date(year, 6, 30)
+
+
+def refresh_summaries(pairs):
+    """
+    Recompute the summaries for an iterable of (student_id, (year, exam_type))
+    pairs: one grouped COUNT over the (student, date) index and one upsert per
+    term. Summaries whose attendance rows have all been deleted are removed.
+    """
+    students_by_term = defaultdict(set)
+    for student_id, term in pairs:
+        students_by_term[term].add(student_id)
+
+    for (year, exam_type), student_ids in students_by_term.items():
+        counts = (
+            Attendance.objects
+            .filter(student_id__in=student_ids, date__range=term_bounds(year, exam_type))
+            .values('student_id')
+            .annotate(total=Count('id'), present=Count('id', filter=Q(status=True)))
+            .order_by()
+        )
+        summaries = [
+            AttendanceSummary(
+                student_id=row['student_id'], year=year, exam_type=exam_type,
+                present_days=row['present'], total_days=row['total'],
+            )
+            for row in counts
+        ]
+        if summaries:
+            AttendanceSummary.objects.bulk_create(
+                summaries,
+                update_conflicts=True,
+                unique_fields=_conflict_target(AttendanceSummary, ['student', 'year', 'exam_type']),
+                update_fields=['present_days', 'total_days', 'updated_at'],
+            )
+        emptied = student_ids - {summary.student_id for summary in summaries}
+        if emptied:
+            AttendanceSummary.objects.filter(student_id__in=emptied, year=year, exam_type=exam_type).delete()
+
+
+def rebuild_summaries(terms=None, batch_size=ATTENDANCE_BATCH_SIZE):
+    """
+    Recompute summaries from scratch for the given (year, exam_type) terms,
+    or for every term that has attendance, in one transaction so readers
+    never see a half-built term. Returns the number of summaries written.
+    """
+    written = 0
+    with transaction.atomic():
+        if terms is None:
+            terms = sorted({term_for_date(month) for month in Attendance.objects.dates('date', 'month')})
+            AttendanceSummary.objects.all().delete()
+        for year, exam_type in terms:
+            AttendanceSummary.objects.filter(year=year, exam_type=exam_type).delete()
+            student_ids = list(
+                Attendance.objects
+                .filter(date__range=term_bounds(year, exam_type))
+                .values_list('student_id', flat=True)
+                .distinct()
+                .order_by('student_id')
+            )
+            for start in range(0, len(student_ids), batch_size):
+                refresh_summaries((student_id, (year, exam_type)) for student_id in student_ids[start:start + batch_size])
+            written += len(student_ids)
+    return written
+
+
+def minimum_attendance():
+    return getattr(settings, 'MIN_ATTENDANCE_PERCENT', 75)
+
+
+def is_eligible(summary):
+    """
+    A student with no attendance recorded for the term is not blocked:
+    colleges that don't track attendance here keep working as before.
+    """
+    return summary is None or summary.percentage >= minimum_attendance()
+
+
+def summary_for_exam(student, exam_type, today=None):
+    year, exam_type = term_for_exam(exam_type, today)
+    return AttendanceSummary.objects.filter(student=student, year=year, exam_type=exam_type).first()
+
+
+def attach_eligibility(exam_forms):
+    """
+    Set `attendance_summary` and `attendance_eligible` on each form, reading
+    the summaries of these forms' students for every term involved in one
+    query.
+    """
+    exam_forms = list(exam_forms)
+    terms = {}
+    for form in exam_forms:
+        terms[form.pk] = term_for_exam(form.exam_type, timezone.localdate(form.submitted_at))
+    summaries = {}
+    if terms:
+        by_term = Q(*[Q(year=year, exam_type=exam_type) for year, exam_type in set(terms.values())], _connector=Q.OR)
+        student_ids = {form.student_id for form in exam_forms}
+        for summary in AttendanceSummary.objects.filter(by_term, student_id__in=student_ids):
+            summaries[summary.student_id, summary.year, summary.exam_type] = summary
+    for form in exam_forms:
+        form.attendance_summary = summaries.get((form.student_id, *terms[form.pk]))
+        form.attendance_eligible = is_eligible(form.attendance_summary)
+    return exam_forms
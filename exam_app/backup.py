@@ -0,0 +1,105 @@
+"""
+Shared pieces of the backup_data / restore_data management commands.
+
+A backup is a directory with one gzip-compressed NDJSON file per model (one
+JSON object per row) and a manifest.json recording row counts and the
+watermark to pass to the next incremental backup. Only concrete columns are
+saved, so group/permission assignments are not included. Incremental backups
+only see new and changed rows, not deletions such as forms moved out by
+archive_sessions, so take a full backup after archiving.
+"""
+import datetime
+import gzip
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from .models import ArchivedExamForm, ArchivedPayment, Attendance, CustomUser, ExamForm, ExamSession, Payment
+
+MANIFEST_NAME = 'manifest.json'
+
+# Dependency order: every model only references models listed before it.
+BACKUP_MODELS = [CustomUser, ExamSession, ExamForm, Payment, Attendance, ArchivedExamForm, ArchivedPayment]
+
+
+class BackupJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder rounds times to milliseconds; a backup must keep every microsecond."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def changed_since(model, since):
+    """Filter selecting the rows of `model` created or updated after `since`."""
+    if model is ExamSession:
+        return Q(created_at__gt=since) | Q(closed_at__gt=since) | Q(archived_at__gt=since)
+    if model in (ArchivedExamForm, ArchivedPayment):
+        return Q(archived_at__gt=since)
+    if model is CustomUser:
+        # Logins save only last_login, which leaves updated_at alone.
+        return Q(updated_at__gt=since) | Q(last_login__gt=since)
+    if model is ExamForm:
+        return Q(updated_at__gt=since)
+    if model is Payment:
+        return Q(created_at__gt=since) | Q(paid_at__gt=since)
+    if model is Attendance:
+        return Q(updated_at__gt=since)
+    raise ValueError(f'No watermark defined for {model._meta.label}')
+
+
+def backup_filename(model):
+    return f'{model._meta.label_lower}.ndjson.gz'
+
+
+def concrete_fields(model):
+    return list(model._meta.concrete_fields)
+
+
+def iter_rows(queryset, attnames, chunk_size):
+    """
+    Yield row dicts in primary-key order, one keyset-paginated query per
+    chunk. Unlike QuerySet.iterator() this keeps memory flat on MySQL too,
+    where mysqlclient buffers a whole result set client-side.
+    """
+    last_pk = None
+    while True:
+        page = queryset.order_by('pk')
+        if last_pk is not None:
+            page = page.filter(pk__gt=last_pk)
+        rows = list(page.values(*attnames)[:chunk_size])
+        if not rows:
+            return
+        yield from rows
+        last_pk = rows[-1]['id']
+
+
+def write_rows(path, rows):
+    """Stream dicts to a gzip NDJSON file; returns the number of rows written."""
+    encoder = BackupJSONEncoder(separators=(',', ':'))
+    count = 0
+    with gzip.open(path, 'wt', encoding='utf-8', compresslevel=6) as fh:
+        for row in rows:
+            fh.write(encoder.encode(row))
+            fh.write('\n')
+            count += 1
+    return count
+
+
+def read_rows(path):
+    """Yield dicts from a gzip NDJSON file one line at a time."""
+    with gzip.open(path, 'rt', encoding='utf-8') as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def row_to_instance(model, fields, row):
+    """Build an unsaved model instance from a decoded row, converting ISO strings back to Python values."""
+    values = {}
+    for field in fields:
+        value = row.get(field.attname)
+        values[field.attname] = None if value is None else field.to_python(value)
+    return model(**values)
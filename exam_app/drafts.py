@@ -0,0 +1,103 @@
+"""
+Exam form drafts, autosaved while a student fills in the form.
+
+The fill form page posts only the fields that changed (debounced in the
+browser) to the draft endpoint. apply_changes() validates them against the
+same choices as ExamFormForm and writes them to the student's single
+ExamFormDraft row. Any change withdraws the submission and drops the
+Razorpay order opened for the old contents, so the payment step always
+charges for what the draft says now. A checkout already open for the old
+order still completes: payment_success records what its CheckoutOrder
+snapshot says was paid for.
+"""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .forms import ExamFormForm, get_subjects_by_branch_and_semester
+from .models import ExamForm, ExamFormDraft
+
+DRAFT_FIELDS = ('branch', 'semester', 'subjects', 'exam_type')
+_CHOICES = {
+    'branch': {value for value, _ in ExamFormForm.BRANCH_CHOICES},
+    'semester': {value for value, _ in ExamFormForm.SEMESTER_CHOICES},
+    'exam_type': {value for value, _ in ExamForm.EXAM_TYPE_CHOICES},
+}
+
+
+def draft_for(student):
+    """The student's draft, or None."""
+    return ExamFormDraft.objects.filter(student=student).first()
+
+
+def as_json(draft):
+    if draft is None:
+        return {'draft': None}
+    return {
+        'draft': {
+            'branch': draft.branch,
+            'semester': draft.semester,
+            'subjects': [subject for subject in draft.subjects.split(',') if subject],
+            'exam_type': draft.exam_type,
+            'submitted': draft.submitted,
+        },
+        'updated_at': draft.updated_at.isoformat(),
+    }
+
+
+def _clean(draft, changes):
+    unknown = set(changes) - set(DRAFT_FIELDS)
+    if unknown:
+        raise ValidationError(f"Unknown field: {', '.join(sorted(unknown))}")
+    cleaned = {}
+    for field, allowed in _CHOICES.items():
+        if field in changes:
+            value = changes[field] or ''
+            if value and value not in allowed:
+                raise ValidationError(f'Invalid {field}: {value}')
+            cleaned[field] = value
+
+    branch = cleaned.get('branch', draft.branch)
+    semester = cleaned.get('semester', draft.semester)
+    offered = {value for value, _ in get_subjects_by_branch_and_semester(branch, semester)} if branch and semester else set()
+    if 'subjects' in changes:
+        subjects = changes['subjects'] or []
+        if not isinstance(subjects, list) or not all(isinstance(subject, str) for subject in subjects):
+            raise ValidationError('subjects must be a list of subject codes')
+        invalid = [subject for subject in subjects if subject not in offered]
+        if invalid:
+            raise ValidationError(f"Not offered for this branch and semester: {', '.join(invalid)}")
+        cleaned['subjects'] = ','.join(dict.fromkeys(subjects))
+    elif 'branch' in cleaned or 'semester' in cleaned:
+        # Keep only the selected subjects the new branch/semester still offers.
+        cleaned['subjects'] = ','.join(subject for subject in draft.subjects.split(',') if subject in offered)
+    return cleaned
+
+
+def apply_changes(student, changes):
+    """
+    Validate the partial update `changes` and save it to the student's draft,
+    creating it on first save. Raises ValidationError on a bad field.
+    """
+    with transaction.atomic():
+        # get_or_create survives two tabs' first autosaves racing on the
+        # one-to-one student; the lock then serialises their updates.
+        ExamFormDraft.objects.get_or_create(student=student)
+        draft = ExamFormDraft.objects.select_for_update().get(student=student)
+        cleaned = _clean(draft, changes)
+        if all(getattr(draft, field) == value for field, value in cleaned.items()):
+            return draft
+        for field, value in cleaned.items():
+            setattr(draft, field, value)
+        draft.submitted = False
+        draft.razorpay_order_id = ''
+        draft.fee = None
+        draft.save()
+    return draft
+
+
+def submit(student, form_data):
+    """Save the validated exam form as the student's submitted draft."""
+    draft, _ = ExamFormDraft.objects.update_or_create(student=student, defaults={
+        **form_data, 'submitted': True, 'razorpay_order_id': '', 'fee': None,
+    })
+    return draft
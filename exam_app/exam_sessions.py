@@ -0,0 +1,72 @@
+"""
+Exam sessions partition ExamForm. Admin pages default to the active session,
+served by the (session, submitted_at) and (session, status) indexes, and
+closed sessions are moved into the archive tables a chunk at a time so the
+hot tables only hold live sessions.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .attendance import term_for_exam
+from .models import ArchivedExamForm, ArchivedPayment, ExamForm, ExamSession, Payment
+
+ARCHIVE_CHUNK_SIZE = 1000
+
+
+def active_session():
+    """The session flagged active, else the most recent one; None before any exist."""
+    return ExamSession.objects.filter(is_active=True).first() or ExamSession.objects.first()
+
+
+def session_for_exam(exam_type, today=None):
+    """
+    The session a form of `exam_type` filed `today` belongs to, created on
+    first use. A new session later than the active one takes over the active
+    flag, so the first forms of a term show on the default admin pages.
+    """
+    year, exam_type = term_for_exam(exam_type, today)
+    with transaction.atomic():
+        session, created = ExamSession.objects.get_or_create(year=year, exam_type=exam_type)
+        if created:
+            current = ExamSession.objects.select_for_update().filter(is_active=True).exclude(pk=session.pk).first()
+            # Newer by the model's ordering: a year's winter session follows its summer one.
+            if current is None or (year, exam_type) > (current.year, current.exam_type):
+                session.is_active = True
+                session.save(update_fields=['is_active'])  # clears the old session's flag
+    return session
+
+
+def close_session(session):
+    session.is_active = False
+    session.closed_at = session.closed_at or timezone.now()
+    session.save(update_fields=['is_active', 'closed_at'])
+
+
+def archive_session(session, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    Move a closed session's forms and payments into the archive tables,
+    yielding the number of forms moved per chunk. Each chunk is copied and
+    deleted in its own transaction, so an interrupted run leaves every form
+    in exactly one table and can simply be restarted.
+    """
+    if session.is_active or session.closed_at is None:
+        raise ValueError(f'{session} must be closed before it can be archived')
+
+    form_fields = [field.attname for field in ExamForm._meta.concrete_fields]
+    payment_fields = [field.attname for field in Payment._meta.concrete_fields]
+    while True:
+        with transaction.atomic():
+            forms = list(ExamForm.objects.filter(session=session).order_by('pk').values(*form_fields)[:chunk_size])
+            if not forms:
+                break
+            form_ids = [form['id'] for form in forms]
+            payments = list(Payment.objects.filter(exam_form_id__in=form_ids).values(*payment_fields))
+
+            ArchivedExamForm.objects.bulk_create([ArchivedExamForm(**form) for form in forms])
+            ArchivedPayment.objects.bulk_create([ArchivedPayment(**payment) for payment in payments])
+            # Payments go with their forms (on_delete=CASCADE), in one extra DELETE.
+            ExamForm.objects.filter(pk__in=form_ids).delete()
+        yield len(forms)
+
+    session.archived_at = timezone.now()
+    session.save(update_fields=['archived_at'])
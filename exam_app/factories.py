@@ -0,0 +1,215 @@
+"""
+Realistic students, exam forms, payments and attendance for tests and
+benchmarks.
+
+make_student(), make_admin(), make_exam_form() and make_paid_form() create one object through
+the ORM, signals included. Tests use them.
+
+The bulk_* helpers are for data at scale:
+- They insert in batches with bulk_create.
+- They assign primary keys themselves, so it works on MySQL too, where
+  bulk_create doesn't return the new ids.
+- Every user shares one pre-hashed password (PASSWORD).
+- Random choices come from the `rng` passed in, so a seed reproduces the data.
+
+100k forms with their payments take seconds. bulk_create sends no signals,
+so call search.rebuild_index() and attendance.rebuild_summaries() afterwards
+if the data needs them.
+"""
+import datetime
+import functools
+import itertools
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+
+from .attendance import upsert_attendance
+from .fees import FeeSchedule, subject_count
+from .forms import ExamFormForm, get_subjects_by_branch_and_semester
+from .models import CustomUser, ExamForm, Payment
+
+PASSWORD = 'exam-pass-123'
+BATCH_SIZE = 5000
+
+FIRST_NAMES = [
+    'Aarav', 'Aditi', 'Akash', 'Ananya', 'Arjun', 'Diya', 'Harsh', 'Isha', 'Kavya', 'Manish',
+    'Neha', 'Pooja', 'Pranav', 'Priya', 'Rahul', 'Riya', 'Rohan', 'Sakshi', 'Sneha', 'Vikram',
+]
+LAST_NAMES = [
+    'Bhoyar', 'Chavan', 'Deshmukh', 'Gupta', 'Joshi', 'Kale', 'Kulkarni', 'Meshram', 'Nair', 'Patil',
+    'Rao', 'Sharma', 'Shinde', 'Thakre', 'Verma', 'Wankhede',
+]
+BRANCHES = [value for value, _ in ExamFormForm.BRANCH_CHOICES]
+SEMESTERS = [value for value, _ in ExamFormForm.SEMESTER_CHOICES]
+# How forms end up: mostly approved, some still pending, a few rejected.
+STATUS_WEIGHTS = {'approved': 70, 'pending': 25, 'rejected': 5}
+
+_sequence = itertools.count(1)
+
+
+@functools.cache
+def password_hash():
+    """PASSWORD hashed once; hashing it per user would dominate bulk inserts."""
+    return make_password(PASSWORD)
+
+
+def subjects_for(branch, semester, rng=None):
+    """Subject codes a student of `branch`/`semester` would pick: all of them, or with rng most of them."""
+    codes = [value for value, _ in get_subjects_by_branch_and_semester(branch, semester)]
+    if rng is None or len(codes) < 2:
+        return codes
+    return rng.sample(codes, rng.randint(len(codes) - 1, len(codes)))
+
+
+def make_student(**fields):
+    n = next(_sequence)
+    first, last = FIRST_NAMES[n % len(FIRST_NAMES)], LAST_NAMES[n % len(LAST_NAMES)]
+    defaults = {
+        'username': f'student{n}', 'email': f'{first.lower()}.{last.lower()}{n}@kdkce.edu.in',
+        'first_name': first, 'last_name': last, 'college_id': f'S{n:06d}', 'role': 'student',
+        'password': password_hash(),
+    }
+    return CustomUser.objects.create(**{**defaults, **fields})
+
+
+def make_admin(**fields):
+    n = next(_sequence)
+    defaults = {'username': f'admin{n}', 'email': f'admin{n}@kdkce.edu.in', 'role': 'admin', 'is_staff': True, 'password': password_hash()}
+    return CustomUser.objects.create(**{**defaults, **fields})
+
+
+def make_exam_form(student=None, **fields):
+    branch, semester = fields.get('branch', 'cse'), fields.get('semester', '5')
+    defaults = {
+        'student': student or make_student(), 'branch': branch, 'semester': semester,
+        'subjects': ','.join(subjects_for(branch, semester)), 'exam_type': 'winter', 'status': 'pending',
+    }
+    return ExamForm.objects.create(**{**defaults, **fields})
+
+
+def make_paid_form(student=None, amount=Decimal('100.00'), **fields):
+    """An exam form with its paid Payment, as payment_success records them."""
+    form = make_exam_form(student, **fields)
+    Payment.objects.create(
+        exam_form=form, amount=amount, razorpay_order_id=f'order_F{form.pk}', razorpay_payment_id=f'pay_F{form.pk}',
+        status='paid', paid_at=timezone.now(),
+    )
+    return form
+
+
+def _next_id(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def _reset_sequences(*models):
+    """Move PostgreSQL sequences past explicitly inserted ids; MySQL and SQLite do this themselves."""
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+@contextmanager
+def _timestamps_as_given(model, *names):
+    """Let bulk_create keep the auto_now/auto_now_add values set on the objects."""
+    fields = [model._meta.get_field(name) for name in names]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def bulk_students(count, rng, prefix='gen', batch_size=BATCH_SIZE):
+    """Insert `count` students and return their ids. `prefix` keeps usernames, emails and college ids unique between calls."""
+    password = password_hash()
+    first_id = _next_id(CustomUser)
+    joined = timezone.now()
+    for offset in range(0, count, batch_size):
+        users = []
+        for n in range(offset, min(offset + batch_size, count)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            users.append(CustomUser(
+                id=first_id + n, username=f'{prefix}{n}', email=f'{first.lower()}.{last.lower()}.{prefix}{n}@kdkce.edu.in',
+                first_name=first, last_name=last, college_id=f'{prefix[:4].upper()}{n:07d}', role='student',
+                password=password, date_joined=joined, mobile_no=f'9{rng.randrange(10**9):09d}',
+            ))
+        CustomUser.objects.bulk_create(users)
+    _reset_sequences(CustomUser)
+    return list(range(first_id, first_id + count))
+
+
+def bulk_exam_forms(students, rng, exam_type=None, session=None, submitted_between=None, paid=1.0,
+                    schedule=None, status_weights=STATUS_WEIGHTS, batch_size=BATCH_SIZE):
+    """
+    Insert one exam form per (student_id, branch, semester) in `students`,
+    with subjects from the branch's syllabus and a status drawn from
+    `status_weights`, submitted at a random moment in `submitted_between`
+    (default: the last 30 days). A `paid` fraction (default all, as the app
+    only creates a form once its payment succeeds) gets a Payment of the fee
+    `schedule` charges; the rest are orphan forms for reconciliation tests.
+    Returns (forms, payments) created.
+    """
+    start, end = submitted_between or (timezone.now() - datetime.timedelta(days=30), timezone.now())
+    span = (end - start).total_seconds()
+    schedule = schedule or FeeSchedule.load()
+    statuses, weights = zip(*status_weights.items())
+    form_id, payment_id = _next_id(ExamForm), _next_id(Payment)
+    students = iter(students)
+    forms_made = payments_made = 0
+    with _timestamps_as_given(ExamForm, 'submitted_at', 'updated_at'), _timestamps_as_given(Payment, 'created_at'):
+        while batch := list(itertools.islice(students, batch_size)):
+            forms, payments = [], []
+            for student_id, branch, semester in batch:
+                kind = exam_type or (session.exam_type if session else rng.choice(['winter', 'summer']))
+                subjects = ','.join(subjects_for(branch, semester, rng))
+                submitted = start + datetime.timedelta(seconds=rng.random() * span)
+                status = rng.choices(statuses, weights)[0]
+                form = ExamForm(
+                    id=form_id, student_id=student_id, branch=branch, semester=semester, subjects=subjects, exam_type=kind,
+                    status=status, session=session, submitted_at=submitted, updated_at=submitted,
+                    approved_at=submitted + datetime.timedelta(days=rng.randint(1, 5)) if status == 'approved' else None,
+                )
+                forms.append(form)
+                if rng.random() < paid:
+                    paid_at = submitted - datetime.timedelta(seconds=rng.randint(30, 600))
+                    payments.append(Payment(
+                        id=payment_id, exam_form_id=form_id, razorpay_order_id=f'order_G{form_id}',
+                        razorpay_payment_id=f'pay_G{form_id}', status='paid', paid_at=paid_at, created_at=paid_at,
+                        amount=schedule.fee(branch, semester, kind, subject_count(subjects), timezone.localdate(submitted)),
+                    ))
+                    payment_id += 1
+                form_id += 1
+            ExamForm.objects.bulk_create(forms)
+            Payment.objects.bulk_create(payments)
+            forms_made += len(forms)
+            payments_made += len(payments)
+    _reset_sequences(ExamForm, Payment)
+    return forms_made, payments_made
+
+
+def bulk_attendance(student_ids, days, rng, present=0.85):
+    """
+    Mark each student present (with probability `present`, varying per
+    student) or absent on each weekday of `days`. Summaries are not
+    refreshed: call attendance.rebuild_summaries(). Returns the rows written.
+    """
+    weekdays = [day for day in days if day.weekday() < 5]
+    return upsert_attendance(
+        (
+            (student_id, day, rng.random() < rate)
+            for student_id in student_ids
+            for rate in [min(1.0, max(0.0, rng.gauss(present, 0.1)))]
+            for day in weekdays
+        ),
+        refresh=False,
+    )
@@ -0,0 +1,97 @@
+"""
+Exam fees from the FeeRule schedule.
+
+FeeSchedule compiles the active rules once, bucketing them by their
+(branch, semester, exam type) key with blank meaning "any". Pricing a form
+then only reads the buckets that can match it, at most eight, instead of
+every rule. Results are memoised per (branch, semester, exam type, subject
+count, day), a key that whole batches of forms share.
+
+current_schedule() keeps one compiled schedule per process and recompiles
+it when the rules change. That check costs one aggregate query on the small
+rule table per checkout. Bulk jobs such as reconciliation compile a
+schedule once and price every form with it (expected_fees()).
+"""
+import functools
+import itertools
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import FeeRule
+
+ZERO = Decimal('0.00')
+FEE_CACHE_SIZE = 4096
+
+_schedule = None
+
+
+def subject_count(subjects):
+    """Subjects are stored comma-separated."""
+    return sum(1 for subject in (subjects or '').split(',') if subject.strip())
+
+
+def rules_version():
+    """Changes whenever a rule is added, edited or deleted."""
+    return tuple(FeeRule.objects.aggregate(last=Max('updated_at'), count=Count('id')).values())
+
+
+class FeeSchedule:
+    def __init__(self, rules, version=None):
+        self.version = version
+        self.buckets = defaultdict(list)
+        for rule in rules:
+            self.buckets[(rule.branch, rule.semester, rule.exam_type)].append(
+                (rule.min_subjects, rule.starts_on, rule.ends_on, rule.amount, rule.per_subject)
+            )
+        self.fee = functools.lru_cache(maxsize=FEE_CACHE_SIZE)(self._fee)
+
+    @classmethod
+    def load(cls):
+        version = rules_version()
+        return cls(FeeRule.objects.filter(is_active=True), version)
+
+    def _fee(self, branch, semester, exam_type, subjects, day):
+        """Fee for a form with `subjects` subjects, checked out on `day`."""
+        total = ZERO
+        keys = set(itertools.product((branch or '', ''), (semester or '', ''), (exam_type or '', '')))
+        for key in keys:
+            for min_subjects, starts_on, ends_on, amount, per_subject in self.buckets.get(key, ()):
+                if subjects < min_subjects:
+                    continue
+                if (starts_on and day < starts_on) or (ends_on and day > ends_on):
+                    continue
+                total += amount + per_subject * subjects
+        return total
+
+
+def current_schedule():
+    """This process's compiled schedule, recompiled if the rules changed since."""
+    global _schedule
+    version = rules_version()
+    if _schedule is None or _schedule.version != version:
+        _schedule = FeeSchedule(FeeRule.objects.filter(is_active=True), version)
+    return _schedule
+
+
+def checkout_fee(form_data, day=None):
+    """Fee for the exam form a student is checking out (the session's form data)."""
+    return current_schedule().fee(
+        form_data.get('branch'), form_data.get('semester'), form_data.get('exam_type'),
+        subject_count(form_data.get('subjects')), day or timezone.localdate(),
+    )
+
+
+def expected_fees(forms, schedule=None):
+    """
+    Map each ExamForm (or ArchivedExamForm) in the `forms` queryset to the fee
+    the schedule charges for it, priced as of the day it was submitted.
+    """
+    schedule = schedule or FeeSchedule.load()
+    rows = forms.values_list('pk', 'branch', 'semester', 'exam_type', 'subjects', 'submitted_at')
+    return {
+        pk: schedule.fee(branch, semester, exam_type, subject_count(subjects), timezone.localdate(submitted_at))
+        for pk, branch, semester, exam_type, subjects, submitted_at in rows.iterator(chunk_size=5000)
+    }
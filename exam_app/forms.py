@@ -1,6 +1,10 @@
 from django import forms
+from django.conf import settings
 from django.contrib.auth.forms import UserCreationForm
+from django.template.defaultfilters import filesizeformat
+from .attendance import is_eligible, minimum_attendance, summary_for_exam
 from .models import CustomUser, ExamForm
+from .photos import reset_thumbnails
 
 class CustomUserCreationForm(UserCreationForm):
     email = forms.EmailField(required=True, help_text="Enter your college email ending with @kdkce.edu.in")
@@ -20,8 +24,22 @@ class CustomUserCreationForm(UserCreationForm):
             raise forms.ValidationError("Email must end with @kdkce.edu.in")
         return email
 
+class ProfilePhotoField(forms.ImageField):
+    """ImageField that rejects oversized files before Pillow ever opens them."""
+
+    def to_python(self, data):
+        max_size = getattr(settings, 'PROFILE_PHOTO_MAX_SIZE', 5 * 1024 * 1024)
+        if data is not None and data.size > max_size:
+            raise forms.ValidationError(f"Photo must be smaller than {filesizeformat(max_size)}.")
+        f = super().to_python(data)
+        if f is not None:
+            width, height = f.image.size
+            if width * height > getattr(settings, 'PROFILE_PHOTO_MAX_PIXELS', 25_000_000):
+                raise forms.ValidationError(f"Photo is too large ({width}x{height} pixels).")
+        return f
+
 class CustomUserEditForm(forms.ModelForm):
-    profile_photo = forms.ImageField(required=False, help_text="Upload your profile photo")
+    profile_photo = ProfilePhotoField(required=False, help_text="Upload your profile photo")
 
     class Meta:
         model = CustomUser
@@ -33,6 +51,11 @@ class CustomUserEditForm(forms.ModelForm):
             raise forms.ValidationError("Email must end with @kdkce.edu.in")
         return email
 
+    def save(self, commit=True):
+        if 'profile_photo' in self.changed_data:
+            reset_thumbnails(self.instance)
+        return super().save(commit)
+
 def get_subjects_by_branch_and_semester(branch, semester):
     """
     Returns a list of subject choices for the given branch and semester.
@@ -436,8 +459,10 @@ class ExamFormForm(forms.ModelForm):
         widget=forms.RadioSelect(attrs={'class': 'form-check-input'})
     )
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, student=None, **kwargs):
         super().__init__(*args, **kwargs)
+        # When given, the student's attendance for the exam term is checked
+        self.student = student
         # Set subjects choices based on POST data or initial data
         if self.data:
             # If form has POST data, use that
@@ -449,6 +474,17 @@ class ExamFormForm(forms.ModelForm):
             semester = self.initial.get('semester', '1')
         self.fields['subjects'].choices = get_subjects_by_branch_and_semester(branch, semester)
 
+    def clean_exam_type(self):
+        exam_type = self.cleaned_data['exam_type']
+        if self.student is not None:
+            summary = summary_for_exam(self.student, exam_type)
+            if not is_eligible(summary):
+                raise forms.ValidationError(
+                    f"Your attendance for this term is {summary.percentage}%, below the required "
+                    f"{minimum_attendance():g}%. Please contact the exam cell."
+                )
+        return exam_type
+
     class Meta:
         model = ExamForm
         fields = ['branch', 'semester', 'subjects', 'exam_type']
@@ -0,0 +1,15 @@
+"""
+The Razorpay client, imported on first use.
+
+razorpay pulls in requests and its dependencies, most of exam_app.views'
+import time, yet only checkout and reconciliation talk to the gateway.
+Importing it here, when a client is first needed, keeps it off every web
+process's startup (see benchmarks/startup_imports.py).
+"""
+from django.conf import settings
+
+
+def razorpay_client():
+    import razorpay
+
+    return razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
@@ -0,0 +1,88 @@
+"""
+Liveness and readiness checks for the platform's health probes.
+
+HealthCheckMiddleware answers HEALTH_LIVENESS_PATH and HEALTH_READINESS_PATH
+ahead of every other middleware: no HTTPS redirect, host check, session,
+user or template. Liveness only proves the worker is answering. Readiness
+also checks the default database. The result is kept in this process for
+HEALTH_DB_CHECK_TTL seconds, so frequent probes cost at most one SELECT 1
+per interval. Both report how busy the worker is: requests in flight in
+this process and admission slots held across workers.
+"""
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+from .admission import SLOT_KEY, _cache, max_in_flight
+
+STARTED = time.monotonic()
+
+_lock = threading.Lock()
+_in_flight = 0
+_db_check = None  # (checked_at, error or None)
+
+
+def request_started():
+    global _in_flight
+    with _lock:
+        _in_flight += 1
+
+
+def request_finished():
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+
+
+def in_flight():
+    """Requests this process is handling (an open event stream counts until its response is returned)."""
+    return _in_flight
+
+
+def database_error():
+    """None if the default database answered within the last HEALTH_DB_CHECK_TTL seconds, else the error."""
+    global _db_check
+    now = time.monotonic()
+    checked = _db_check
+    if checked is not None and now - checked[0] < getattr(settings, 'HEALTH_DB_CHECK_TTL', 5):
+        return checked[1]
+    try:
+        with connections['default'].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        error = None
+    except DatabaseError as e:
+        error = str(e) or e.__class__.__name__
+    _db_check = (now, error)
+    return error
+
+
+def admission_in_flight():
+    """Admission slots held right now, across every worker sharing the cache; None if it can't be read."""
+    try:
+        return len(_cache().get_many([SLOT_KEY.format(i) for i in range(max_in_flight())]))
+    except Exception:  # a cache outage shouldn't fail the probe
+        return None
+
+
+def status(ready=False):
+    """The probe's JSON body and HTTP status."""
+    body = {
+        'status': 'ok',
+        'pid': os.getpid(),
+        'uptime': round(time.monotonic() - STARTED),
+        'in_flight': in_flight(),
+    }
+    code = 200
+    if ready:
+        error = database_error()
+        body['database'] = 'ok' if error is None else error
+        if error is not None:
+            body['status'] = 'unavailable'
+            code = 503
+        if getattr(settings, 'ADMISSION_CONTROL', True):
+            body['admission'] = {'in_flight': admission_in_flight(), 'max': max_in_flight()}
+    return body, code
@@ -0,0 +1,49 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+
+from exam_app.exam_sessions import ARCHIVE_CHUNK_SIZE, archive_session, close_session
+from exam_app.models import ExamSession
+
+SESSION_RE = re.compile(r'^(\d{4})-(winter|summer)$')
+
+
+class Command(BaseCommand):
+    help = 'Move the forms and payments of closed exam sessions into the archive tables, in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('sessions', nargs='*', help='Sessions to archive, e.g. 2025-winter (default: every closed session)')
+        parser.add_argument('--close', action='store_true', help='Close the named sessions first')
+        parser.add_argument('--chunk-size', type=int, default=ARCHIVE_CHUNK_SIZE, help='Forms moved per transaction')
+
+    def handle(self, *args, **options):
+        if options['sessions']:
+            sessions = [self.get_session(value) for value in options['sessions']]
+        elif options['close']:
+            raise CommandError('--close needs the sessions to close.')
+        else:
+            sessions = list(ExamSession.objects.filter(is_active=False, closed_at__isnull=False, exam_forms__isnull=False).distinct())
+            if not sessions:
+                self.stdout.write('No closed sessions with forms to archive')
+                return
+
+        for session in sessions:
+            if options['close']:
+                close_session(session)
+            try:
+                moved = 0
+                for count in archive_session(session, options['chunk_size']):
+                    moved += count
+                    self.stdout.write(f'{session}: {moved} forms archived')
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f'{session}: archived {moved} forms'))
+
+    def get_session(self, value):
+        match = SESSION_RE.match(value.strip().lower())
+        if not match:
+            raise CommandError(f'Invalid session {value!r}; expected YEAR-winter or YEAR-summer')
+        try:
+            return ExamSession.objects.get(year=int(match.group(1)), exam_type=match.group(2))
+        except ExamSession.DoesNotExist:
+            raise CommandError(f'No exam session {value}')
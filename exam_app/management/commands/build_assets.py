@@ -0,0 +1,31 @@
+import shutil
+import subprocess
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from exam_app.release import record_sources, static_sources
+
+
+class Command(BaseCommand):
+    help = 'Build the purged/minified CSS and JS bundle with npm, then run collectstatic'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-npm', action='store_true', help='Reuse the existing bundle in exam_app/static/exam_app/dist/')
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive', help='Do not prompt during collectstatic')
+
+    def handle(self, *args, **options):
+        if not options['skip_npm']:
+            npm = shutil.which('npm')
+            if npm is None:
+                raise CommandError('npm was not found on PATH. Install Node.js or pass --skip-npm.')
+            self.stdout.write('Building CSS/JS bundle...')
+            result = subprocess.run([npm, 'run', 'build'], cwd=settings.BASE_DIR)
+            if result.returncode != 0:
+                raise CommandError(f'npm run build failed with exit code {result.returncode}')
+
+        # The manifest storage hashes and compresses the fresh bundle here.
+        call_command('collectstatic', interactive=options['interactive'], verbosity=options['verbosity'])
+        # Lets `manage.py release` skip collectstatic when nothing changed since this build.
+        record_sources(static_sources())
@@ -0,0 +1,116 @@
+import datetime
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from exam_app import factories
+from exam_app.attendance import rebuild_summaries, term_bounds, term_for_date
+from exam_app.models import ExamSession
+from exam_app.reports import refresh_reports
+from exam_app.search import rebuild_index
+
+# Forms of a term are submitted in this window before the term ends.
+FORM_WINDOW = (datetime.timedelta(days=90), datetime.timedelta(days=60))
+# Closed sessions have been reviewed: nothing is left pending.
+CLOSED_STATUS_WEIGHTS = {'approved': 93, 'rejected': 7}
+
+
+def recent_terms(count, today):
+    """The `count` (year, exam_type) terms up to the one `today` falls in, oldest first."""
+    year, exam_type = term_for_date(today)
+    terms = [(year, exam_type)]
+    while len(terms) < count:
+        year, exam_type = (year, 'summer') if exam_type == 'winter' else (year - 1, 'winter')
+        terms.append((year, exam_type))
+    return terms[::-1]
+
+
+def weekdays_before(day, count):
+    """The `count` weekdays before `day`."""
+    days = []
+    while len(days) < count:
+        day -= datetime.timedelta(days=1)
+        if day.weekday() < 5:
+            days.append(day)
+    return days
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a synthetic college for capacity planning: students across every branch and semester, '
+        'exam forms with payments over several sessions, and attendance, reproducibly from a seed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=10000, help='Students enrolled in the newest session (default: 10000)')
+        parser.add_argument('--sessions', type=int, default=4, help='Exam sessions, ending with the current term (default: 4)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed generates the same data')
+        parser.add_argument('--paid', type=float, default=1.0, help='Fraction of forms with a payment (default: 1; the app never creates unpaid forms)')
+        parser.add_argument('--attendance-days', type=int, default=10, help='Weekdays of attendance per session before its forms open (0: none)')
+        parser.add_argument('--prefix', default='gen', help='Username and college id prefix; use a new one to add to generated data')
+        parser.add_argument('--batch-size', type=int, default=factories.BATCH_SIZE, help='Rows per INSERT statement')
+        parser.add_argument('--skip-index', action='store_true', help='Do not rebuild the admin search index')
+        parser.add_argument('--force', action='store_true', help='Run even with DEBUG off')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError(
+                f'Refusing to generate data with DEBUG off: every student gets the password {factories.PASSWORD!r}. '
+                'Use --force on a database meant for load testing.'
+            )
+        if options['students'] < 1 or options['sessions'] < 1:
+            raise CommandError('--students and --sessions must be at least 1')
+        rng = random.Random(options['seed'])
+        started = time.monotonic()
+        now = timezone.now()
+        batch_size = options['batch_size']
+
+        ids = factories.bulk_students(options['students'], rng, prefix=options['prefix'], batch_size=batch_size)
+        # Branch and semester in the newest session; a student is one semester
+        # behind in each earlier session and had not joined before semester 1.
+        enrolment = [(student_id, rng.choice(factories.BRANCHES), rng.randint(1, 8)) for student_id in ids]
+        self.stdout.write(f'{len(ids)} students in {time.monotonic() - started:.1f}s')
+
+        terms = recent_terms(options['sessions'], timezone.localdate(now))
+        total_forms = 0
+        for age, (year, exam_type) in zip(range(len(terms) - 1, -1, -1), terms):
+            step = time.monotonic()
+            current = age == 0
+            term_end = timezone.make_aware(datetime.datetime.combine(term_bounds(year, exam_type)[1], datetime.time()))
+            session, _ = ExamSession.objects.get_or_create(year=year, exam_type=exam_type)
+            if not current and session.closed_at is None:
+                session.closed_at = term_end
+                session.save(update_fields=['closed_at'])
+
+            opens, closes = term_end - FORM_WINDOW[0], term_end - FORM_WINDOW[1]
+            if closes > now:  # the current term: forms are still coming in
+                opens, closes = min(opens, now - (closes - opens)), now
+            students = [(student_id, branch, str(semester - age)) for student_id, branch, semester in enrolment if semester > age]
+            forms, payments = factories.bulk_exam_forms(
+                students, rng, session=session, submitted_between=(opens, closes), paid=options['paid'],
+                status_weights=factories.STATUS_WEIGHTS if current else CLOSED_STATUS_WEIGHTS, batch_size=batch_size,
+            )
+            rows = 0
+            if options['attendance_days']:
+                days = weekdays_before(timezone.localdate(opens), options['attendance_days'])
+                rows = factories.bulk_attendance([student_id for student_id, _, _ in students], days, rng)
+            total_forms += forms
+            self.stdout.write(f'{session}: {forms} forms, {payments} payments, {rows} attendance rows in {time.monotonic() - step:.1f}s')
+
+        if not ExamSession.objects.filter(is_active=True).exists():
+            ExamSession.objects.filter(year=terms[-1][0], exam_type=terms[-1][1]).update(is_active=True)
+
+        step = time.monotonic()
+        summaries = rebuild_summaries()
+        days = refresh_reports(full=True)
+        self.stdout.write(f'{summaries} attendance summaries, {days} report days in {time.monotonic() - step:.1f}s')
+        if not options['skip_index']:
+            step = time.monotonic()
+            users, tokens = rebuild_index()
+            self.stdout.write(f'Indexed {users} users into {tokens} search tokens in {time.monotonic() - step:.1f}s')
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {len(ids)} students and {total_forms} exam forms in {time.monotonic() - started:.1f}s'
+        ))
@@ -0,0 +1,58 @@
+import csv
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from exam_app.attendance import (
+    ATTENDANCE_BATCH_SIZE, parse_status, rebuild_summaries, student_ids_by_college_id, term_for_date, upsert_attendance,
+)
+
+MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = 'Import attendance from a CSV with college_id,date,status columns, upserting on (student, date)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='CSV file with a header row: college_id,date,status')
+        parser.add_argument('--date-format', default='%Y-%m-%d', help='strptime format of the date column (default: %%Y-%%m-%%d)')
+        parser.add_argument('--batch-size', type=int, default=ATTENDANCE_BATCH_SIZE, help='Rows per upsert statement')
+
+    def handle(self, *args, **options):
+        # One query for the whole file; memory grows with the number of
+        # students, not with the number of attendance rows.
+        self.student_ids = student_ids_by_college_id()
+        self.errors = 0
+        self.terms = set()
+
+        try:
+            fh = open(options['csv_file'], newline='', encoding='utf-8-sig')
+        except OSError as e:
+            raise CommandError(f'Cannot open {options["csv_file"]}: {e}')
+        with fh:
+            reader = csv.DictReader(fh)
+            missing = {'college_id', 'date', 'status'} - set(reader.fieldnames or [])
+            if missing:
+                raise CommandError(f'CSV is missing columns: {", ".join(sorted(missing))}')
+            written = upsert_attendance(self.parse_rows(reader, options['date_format']), options['batch_size'], refresh=False)
+
+        # One rebuild per term touched is far cheaper than refreshing
+        # summaries after every batch of a large file.
+        summaries = rebuild_summaries(sorted(self.terms), options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {written} attendance rows ({self.errors} skipped), rebuilt {summaries} eligibility summaries'
+        ))
+
+    def parse_rows(self, reader, date_format):
+        for row in reader:
+            try:
+                student_id = self.student_ids.get(row['college_id'].strip())
+                if student_id is None:
+                    raise ValueError(f'Unknown college ID {row["college_id"]!r}')
+                date = datetime.datetime.strptime(row['date'].strip(), date_format).date()
+                self.terms.add(term_for_date(date))
+                yield student_id, date, parse_status(row['status'])
+            except (ValueError, AttributeError) as e:
+                self.errors += 1
+                if self.errors <= MAX_REPORTED_ERRORS:
+                    self.stderr.write(f'Line {reader.line_num}: {e}')
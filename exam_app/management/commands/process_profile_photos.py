@@ -0,0 +1,48 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Q
+
+from exam_app.models import CustomUser
+from exam_app.photos import build_thumbnails, save_thumbnails, setup_worker
+
+
+class Command(BaseCommand):
+    help = 'Build missing profile photo thumbnails, decoding and resizing in a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes (default: one per CPU)')
+        parser.add_argument('--all', action='store_true', help='Rebuild thumbnails for every photo, not just the missing ones')
+
+    def handle(self, *args, **options):
+        users = CustomUser.objects.exclude(Q(profile_photo='') | Q(profile_photo__isnull=True))
+        if not options['all']:
+            users = users.filter(
+                Q(profile_thumbnail='') | Q(profile_thumbnail__isnull=True)
+                | Q(profile_thumbnail_2x='') | Q(profile_thumbnail_2x__isnull=True)
+            )
+        jobs = list(users.values_list('pk', 'profile_photo'))
+        if not jobs:
+            self.stdout.write('No profile photos to process')
+            return
+
+        # Workers only decode images and write files; all database writes
+        # happen here. Don't hand the parent's connection to forked children.
+        connections.close_all()
+        done = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=setup_worker) as pool:
+            futures = {pool.submit(build_thumbnails, photo_name): (user_id, photo_name) for user_id, photo_name in jobs}
+            for future in as_completed(futures):
+                user_id, photo_name = futures[future]
+                try:
+                    names = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f'{photo_name}: {e}')
+                    continue
+                save_thumbnails(user_id, photo_name, names)
+                done += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {done} profile photos ({failed} failed)'))
@@ -0,0 +1,28 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+
+from exam_app.attendance import ATTENDANCE_BATCH_SIZE, rebuild_summaries
+
+TERM_RE = re.compile(r'^(\d{4})-(winter|summer)$')
+
+
+class Command(BaseCommand):
+    help = 'Recompute the attendance eligibility summaries from raw Attendance rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--term', action='append', dest='terms', help='Term to rebuild, e.g. 2025-winter (repeatable; default: all terms)')
+        parser.add_argument('--batch-size', type=int, default=ATTENDANCE_BATCH_SIZE, help='Students recomputed per query')
+
+    def handle(self, *args, **options):
+        terms = None
+        if options['terms']:
+            terms = []
+            for value in options['terms']:
+                match = TERM_RE.match(value.strip().lower())
+                if not match:
+                    raise CommandError(f'Invalid term {value!r}; expected YEAR-winter or YEAR-summer')
+                terms.append((int(match.group(1)), match.group(2)))
+
+        written = rebuild_summaries(terms, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} attendance summaries'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from exam_app.search import SEARCH_BATCH_SIZE, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the admin search token index for every user'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=SEARCH_BATCH_SIZE, help='Users re-indexed per transaction')
+
+    def handle(self, *args, **options):
+        users, tokens = rebuild_index(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {users} users ({tokens} tokens)'))
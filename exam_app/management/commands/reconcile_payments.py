@@ -0,0 +1,82 @@
+import csv
+import datetime
+import gzip
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from exam_app.gateway import razorpay_client
+from exam_app.reconciliation import ISSUE_FIELDS, SETTLEMENT_COLUMNS, api_rows, build_index, reconcile, settlement_rows
+from exam_app.reports import parse_day
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconcile recorded payments against a gateway settlement CSV (or the Razorpay payments API) '
+        'and write every mismatch, missing payment and orphan exam form as CSV'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('settlement', nargs='?', help='Settlement CSV export (.csv or .csv.gz); omit with --api')
+        parser.add_argument('--api', action='store_true', help='Page through the Razorpay payments API instead of a file')
+        parser.add_argument('--since', help='First day (YYYY-MM-DD) the gateway records cover')
+        parser.add_argument('--until', help='Last day (YYYY-MM-DD) the gateway records cover')
+        parser.add_argument('--output', help='Write issues to this CSV file instead of stdout')
+        parser.add_argument('--check-fees', action='store_true', help='Also flag payments that differ from the fee schedule')
+        parser.add_argument('--amount-in-paise', action='store_true', help='The export states amounts in paise, not rupees')
+        for field, column in SETTLEMENT_COLUMNS.items():
+            parser.add_argument(f"--{field.replace('_', '-')}-column", default=column, help=f'Settlement CSV column holding the {field} (default: {column})')
+
+    def _period(self, options):
+        bounds = []
+        for name, offset in (('since', 0), ('until', 1)):
+            if not options[name]:
+                bounds.append(None)
+                continue
+            try:
+                day = parse_day(options[name], None)
+            except ValueError as e:
+                raise CommandError(f'--{name}: {e}')
+            # Whole local days: --until is inclusive.
+            bounds.append(timezone.make_aware(datetime.datetime.combine(day + datetime.timedelta(days=offset), datetime.time())))
+        return bounds
+
+    def handle(self, *args, **options):
+        if bool(options['settlement']) == options['api']:
+            raise CommandError('Give either a settlement CSV file or --api')
+        since, until = self._period(options)
+
+        index = build_index(check_fees=options['check_fees'])
+        self.stderr.write(f'Indexed {len(index[0]) + len(index[1])} recorded payments')
+
+        if options['api']:
+            if since is None or until is None:
+                raise CommandError('--api needs --since and --until')
+            client = razorpay_client()
+            source = None
+            records = api_rows(client, since, until)
+        else:
+            path = options['settlement']
+            opener = gzip.open if path.endswith('.gz') else open
+            try:
+                source = opener(path, 'rt', newline='', encoding='utf-8-sig')
+            except OSError as e:
+                raise CommandError(f'Cannot read {path}: {e}')
+            columns = {field: options[f'{field}_column'] for field in SETTLEMENT_COLUMNS}
+            records = settlement_rows(source, columns, options['amount_in_paise'])
+
+        output = open(options['output'], 'w', newline='', encoding='utf-8') if options['output'] else self.stdout
+        try:
+            writer = csv.DictWriter(output, ISSUE_FIELDS)
+            writer.writeheader()
+            counts = reconcile(records, index, writer.writerow, since, until)
+        finally:
+            if source is not None:
+                source.close()
+            if output is not self.stdout:
+                output.close()
+
+        lines = counts.pop('lines', 0)
+        matched = counts.pop('matched', 0)
+        summary = ', '.join(f'{issue}: {count}' for issue, count in sorted(counts.items())) or 'no issues'
+        self.stderr.write(self.style.SUCCESS(f'Read {lines} gateway records, matched {matched} ({summary})'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from exam_app.reports import REFRESH_DAYS_PER_BATCH, last_refresh, refresh_reports
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily registration/fee rollups for days changed since the last run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every day instead of only days changed since the last refresh')
+        parser.add_argument('--days-per-batch', type=int, default=REFRESH_DAYS_PER_BATCH, help='Days recomputed per transaction')
+
+    def handle(self, *args, **options):
+        days = refresh_reports(full=options['full'], days_per_batch=options['days_per_batch'])
+        self.stdout.write(self.style.SUCCESS(f'Recomputed {days} days of reports (watermark {last_refresh().isoformat()})'))
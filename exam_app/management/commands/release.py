@@ -0,0 +1,57 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from exam_app.release import collected_sources, diff_sources, migration_lock, pending_migrations, record_sources, static_sources
+
+
+class Command(BaseCommand):
+    help = (
+        'Release phase of a deploy: apply migrations under a database lock, then run collectstatic '
+        'only if the static sources changed since the last collect'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database to migrate (default: default)')
+        parser.add_argument('--lock-timeout', type=int, default=300, help='Seconds to wait for another release holding the migration lock')
+        parser.add_argument('--skip-migrate', action='store_true', help='Do not apply migrations')
+        parser.add_argument('--skip-static', action='store_true', help='Do not collect static files')
+        parser.add_argument('--force-static', action='store_true', help='Run collectstatic even if the sources look unchanged')
+
+    def handle(self, *args, **options):
+        if not options['skip_migrate']:
+            self.migrate(options)
+        if not options['skip_static']:
+            self.collect_static(options)
+
+    def migrate(self, options):
+        using = options['database']
+        started = time.monotonic()
+        if not pending_migrations(using):
+            self.stdout.write('No migrations to apply')
+            return
+        self.stdout.write('Waiting for the migration lock...')
+        try:
+            with migration_lock(using, options['lock_timeout']):
+                # A release that held the lock may have applied them already; migrate then does nothing.
+                call_command('migrate', database=using, interactive=False, verbosity=options['verbosity'])
+        except TimeoutError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f'Migrations done in {time.monotonic() - started:.1f}s'))
+
+    def collect_static(self, options):
+        started = time.monotonic()
+        sources = static_sources()
+        previous = None if options['force_static'] else collected_sources()
+        if previous == sources:
+            self.stdout.write(f'Static files unchanged ({len(sources)} sources), skipping collectstatic')
+            return
+        if previous is None:
+            self.stdout.write('No record of the last collect, collecting all static files')
+        else:
+            added, changed, removed = diff_sources(previous, sources)
+            self.stdout.write(f'Static sources changed: {len(added)} added, {len(changed)} changed, {len(removed)} removed')
+        call_command('collectstatic', interactive=False, verbosity=options['verbosity'])
+        record_sources(sources)
+        self.stdout.write(self.style.SUCCESS(f'Static files collected in {time.monotonic() - started:.1f}s'))
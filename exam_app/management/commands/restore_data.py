@@ -0,0 +1,69 @@
+import json
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from exam_app.backup import BACKUP_MODELS, MANIFEST_NAME, concrete_fields, read_rows, row_to_instance
+from exam_app.factories import _timestamps_as_given
+
+
+class Command(BaseCommand):
+    help = 'Restore a backup_data directory with batched bulk inserts, upserting rows that already exist'
+
+    def add_arguments(self, parser):
+        parser.add_argument('backup_dirs', nargs='+', help='Backup directories to apply in order (full backup first, then incrementals)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per INSERT statement')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database to restore into')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        for backup_dir in options['backup_dirs']:
+            manifest_path = Path(backup_dir) / MANIFEST_NAME
+            if not manifest_path.exists():
+                raise CommandError(f'{manifest_path} not found')
+            with open(manifest_path) as fh:
+                manifest = json.load(fh)
+
+            # Like loaddata: insert everything with foreign key checks off,
+            # then validate all references once before committing.
+            with transaction.atomic(using=connection.alias):
+                with connection.constraint_checks_disabled():
+                    for model in BACKUP_MODELS:
+                        entry = manifest['models'].get(model._meta.label_lower)
+                        if entry is None:
+                            continue
+                        count = self.restore_model(model, Path(backup_dir) / entry['file'], connection.alias, options['batch_size'])
+                        self.stdout.write(f'{model._meta.label}: {count} rows')
+                connection.check_constraints(table_names=[model._meta.db_table for model in BACKUP_MODELS])
+
+            sequence_sql = connection.ops.sequence_reset_sql(no_style(), BACKUP_MODELS)
+            if sequence_sql:
+                with connection.cursor() as cursor:
+                    for sql in sequence_sql:
+                        cursor.execute(sql)
+            self.stdout.write(self.style.SUCCESS(f'Restored {backup_dir} (watermark {manifest["watermark"]})'))
+
+    def restore_model(self, model, path, using, batch_size):
+        fields = concrete_fields(model)
+        # Upsert on the primary key so incrementals can be applied over a full restore.
+        # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target (Django refuses one);
+        # a restored row matches its old self on the primary key there too.
+        update_fields = [field.name for field in fields if not field.primary_key]
+        unique_fields = ['id'] if connections[using].features.supports_update_conflicts_with_target else None
+        # Keep the backed-up submitted_at/created_at/updated_at instead of stamping the restore time.
+        auto_fields = [field.name for field in fields if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)]
+        rows = read_rows(path)
+        count = 0
+        with _timestamps_as_given(model, *auto_fields):
+            while batch := [row_to_instance(model, fields, row) for row in islice(rows, batch_size)]:
+                model.objects.using(using).bulk_create(
+                    batch,
+                    update_conflicts=True,
+                    unique_fields=unique_fields,
+                    update_fields=update_fields,
+                )
+                count += len(batch)
+        return count
@@ -0,0 +1,65 @@
+import os
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+
+from exam_app.exam_sessions import active_session
+from exam_app.models import ExamForm, ExamSession
+from exam_app.notifications import form_status_context, render_batch, send_batch
+
+
+class Command(BaseCommand):
+    help = 'Email every student whose exam form in a session was approved or rejected (e.g. on results day)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--session', type=int, help='Exam session id (default: the active session)')
+        parser.add_argument('--status', choices=['approved', 'rejected'], default='approved')
+        parser.add_argument('--since', help='Only forms approved (rejected: last changed) at or after this ISO datetime')
+        parser.add_argument('--dashboard-url', help='Absolute dashboard URL for the email links (default: on the current Site)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Render processes (default: one per CPU)')
+        parser.add_argument('--dry-run', action='store_true', help='Render every email and report throughput without sending')
+
+    def handle(self, *args, **options):
+        if options['session']:
+            session = ExamSession.objects.filter(pk=options['session']).first()
+        else:
+            session = active_session()
+        if session is None:
+            raise CommandError('No such exam session (and no active one)')
+
+        forms = ExamForm.objects.filter(session=session, status=options['status']).select_related('student')
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError(f"Invalid --since datetime: {options['since']}")
+            # Rejections never set approved_at; the admin actions stamp updated_at for both.
+            since_field = 'approved_at' if options['status'] == 'approved' else 'updated_at'
+            forms = forms.filter(**{f'{since_field}__gte': since})
+        dashboard_url = options['dashboard_url'] or self.site_url(reverse('student_dashboard'))
+        if not urlsplit(dashboard_url).netloc:
+            raise CommandError(f'--dashboard-url must be absolute, got {dashboard_url}')
+        recipients = [
+            (form_status_context(form, dashboard_url), form.student.email)
+            for form in forms.iterator(chunk_size=2000)
+        ]
+        if not recipients:
+            self.stdout.write(f"No {options['status']} forms in {session}")
+            return
+
+        # Render workers never use the database; don't hand them the parent's connection.
+        connections.close_all()
+        kind = f"form_{options['status']}"
+        if options['dry_run']:
+            _, stats = render_batch(kind, (context for context, _ in recipients), options['workers'])
+        else:
+            stats = send_batch(kind, recipients, options['workers'])
+        self.stdout.write(self.style.SUCCESS(str(stats)))
+
+    def site_url(self, path):
+        scheme = 'https' if settings.SECURE_SSL_REDIRECT else 'http'
+        return f'{scheme}://{Site.objects.get_current().domain}{path}'
@@ -0,0 +1,186 @@
+import json
+import time
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.template.loader import get_template
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+from .admission import (
+    TICKET_COOKIE, acquire_slot, estimated_wait, issue_ticket, mark_served, queue_position, read_ticket, release_slot,
+    sign_ticket,
+)
+from . import health
+from .routers import PIN_COOKIE_NAME, reporting_alias
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+re_accepts_brotli = _lazy_re_compile(r"\bbr\b")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress responses with Brotli when the browser and server both support
+    it, falling back to gzip. Bodies smaller than COMPRESSION_MIN_SIZE bytes
+    are sent as-is since compressing them saves almost nothing, and files are
+    never re-encoded so ranges and sendfile keep working. Event streams are
+    left alone too, since a compressor would hold events back.
+
+    HTML always goes to gzip: pages echo user input next to secrets (the CSRF
+    token), and GZipMiddleware pads its output with random bytes against
+    BREACH length attacks while this Brotli path does not.
+    """
+
+    def process_response(self, request, response):
+        if isinstance(response, FileResponse) or response.status_code == 206:
+            return response
+        if response.get('Content-Type', '').startswith('text/event-stream'):
+            return response
+        min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 200)
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        if (
+            brotli is None
+            or response.streaming
+            or response.has_header('Content-Encoding')
+            or response.get('Content-Type', '').startswith('text/html')
+            or not re_accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+        compressed_content = brotli.compress(response.content, quality=quality)
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response.headers['Content-Length'] = str(len(response.content))
+
+        # Same as GZipMiddleware: a strong ETag no longer matches the encoded body.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """
+    After any write request, pin the client to the primary database for
+    REPLICA_PIN_SECONDS so the pages it is redirected to read its own writes
+    instead of a possibly lagging replica.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and reporting_alias():
+            pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+            response.set_cookie(
+                PIN_COOKIE_NAME,
+                str(time.time() + pin_seconds),
+                max_age=pin_seconds,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+class AdmissionControlMiddleware:
+    """
+    Cap concurrent requests to ADMISSION_PATHS (see exam_app.admission).
+    Paths match exactly, so JSON endpoints below them (the draft autosave at
+    /student/fill-form/draft/) never get the holding page. Excess requests
+    get a 503 holding page with Retry-After and a queue ticket cookie. The
+    page is rendered without a session, user or database query, so turning
+    people away stays cheap at peak. Sits above the session and auth
+    middleware for that reason.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Moving average of how long an admitted request takes in this process.
+        self.avg_seconds = getattr(settings, 'ADMISSION_EXPECTED_SECONDS', 1.0)
+
+    def __call__(self, request):
+        if not getattr(settings, 'ADMISSION_CONTROL', True) or request.path not in settings.ADMISSION_PATHS:
+            return self.get_response(request)
+
+        ticket = read_ticket(request.COOKIES.get(TICKET_COOKIE))
+        slot = acquire_slot()
+        if slot is None:
+            return self.waiting_room(request, ticket)
+
+        started = time.monotonic()
+        try:
+            response = self.get_response(request)
+        finally:
+            release_slot(slot)
+            self.avg_seconds = 0.9 * self.avg_seconds + 0.1 * (time.monotonic() - started)
+        if ticket is not None:
+            mark_served(ticket)
+            response.delete_cookie(TICKET_COOKIE)
+        return response
+
+    def waiting_room(self, request, ticket):
+        if ticket is None:
+            ticket = issue_ticket()
+        position = queue_position(ticket)
+        wait = estimated_wait(position, self.avg_seconds)
+        content = get_template('exam_app/waiting_room.html').render({
+            'position': position,
+            'wait': wait,
+            'resubmit': request.method == 'POST',
+        })
+        response = HttpResponse(content, status=503)
+        response['Retry-After'] = str(wait)
+        response['Cache-Control'] = 'no-store'
+        response.set_cookie(
+            TICKET_COOKIE,
+            sign_ticket(ticket),
+            max_age=getattr(settings, 'ADMISSION_TICKET_MAX_AGE', 1800),
+            secure=settings.SESSION_COOKIE_SECURE,
+            httponly=True,
+            samesite='Lax',
+        )
+        return response
+
+
+class HealthCheckMiddleware:
+    """
+    Answer the platform's health probes (see exam_app.health) before any
+    other middleware runs, and count the requests this process is handling
+    for them. Must be first in MIDDLEWARE: probes arrive over plain HTTP with
+    an internal Host header, so they have to skip the HTTPS redirect and
+    host validation as well as the session and auth work.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.paths = {
+            settings.HEALTH_LIVENESS_PATH: False,
+            settings.HEALTH_READINESS_PATH: True,
+        }
+
+    def __call__(self, request):
+        ready = self.paths.get(request.path_info)
+        if ready is not None:
+            body, code = health.status(ready)
+            response = HttpResponse(json.dumps(body), status=code, content_type='application/json')
+            response['Cache-Control'] = 'no-store'
+            return response
+
+        health.request_started()
+        try:
+            return self.get_response(request)
+        finally:
+            health.request_finished()
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam_app', '0003_attendancesummary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='profile_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='profile_photos/thumbs/'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='profile_thumbnail_2x',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='profile_photos/thumbs/'),
+        ),
+    ]
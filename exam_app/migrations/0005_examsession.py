@@ -0,0 +1,78 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam_app', '0004_customuser_profile_thumbnails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedExamForm',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('branch', models.CharField(blank=True, max_length=100, null=True)),
+                ('semester', models.CharField(blank=True, max_length=50, null=True)),
+                ('subjects', models.TextField(blank=True, null=True)),
+                ('exam_type', models.CharField(blank=True, choices=[('winter', 'Winter'), ('summer', 'Summer')], max_length=10, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], max_length=10)),
+                ('submitted_at', models.DateTimeField()),
+                ('approved_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_exam_forms', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedPayment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('razorpay_order_id', models.CharField(max_length=100, unique=True)),
+                ('razorpay_payment_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('status', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('paid_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('exam_form', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='payment', to='exam_app.archivedexamform')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ExamSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('exam_type', models.CharField(choices=[('winter', 'Winter'), ('summer', 'Summer')], max_length=10)),
+                ('is_active', models.BooleanField(db_index=True, default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('closed_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-year', '-exam_type'],
+                'unique_together': {('year', 'exam_type')},
+            },
+        ),
+        migrations.AddField(
+            model_name='archivedexamform',
+            name='session',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_exam_forms', to='exam_app.examsession'),
+        ),
+        migrations.AddField(
+            model_name='examform',
+            name='session',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='exam_forms', to='exam_app.examsession'),
+        ),
+        migrations.AddIndex(
+            model_name='examform',
+            index=models.Index(fields=['session', '-submitted_at'], name='examform_session_submitted'),
+        ),
+        migrations.AddIndex(
+            model_name='examform',
+            index=models.Index(fields=['session', 'status'], name='examform_session_status'),
+        ),
+    ]
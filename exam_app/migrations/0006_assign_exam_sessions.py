@@ -0,0 +1,41 @@
+from django.db import migrations
+from django.utils import timezone
+
+
+def session_key(form):
+    # Same rule as exam_app.attendance.term_for_exam: a winter form filed
+    # before July belongs to the previous year's winter session.
+    submitted = timezone.localdate(form.submitted_at) if form.submitted_at else timezone.localdate()
+    exam_type = form.exam_type or ('winter' if submitted.month >= 7 else 'summer')
+    if exam_type == 'winter' and submitted.month < 7:
+        return submitted.year - 1, exam_type
+    return submitted.year, exam_type
+
+
+def assign_sessions(apps, schema_editor):
+    ExamForm = apps.get_model('exam_app', 'ExamForm')
+    ExamSession = apps.get_model('exam_app', 'ExamSession')
+
+    form_ids_by_session = {}
+    for form in ExamForm.objects.filter(session__isnull=True).only('id', 'exam_type', 'submitted_at').iterator():
+        form_ids_by_session.setdefault(session_key(form), []).append(form.id)
+
+    for (year, exam_type), form_ids in form_ids_by_session.items():
+        session, _ = ExamSession.objects.get_or_create(year=year, exam_type=exam_type)
+        for start in range(0, len(form_ids), 1000):
+            ExamForm.objects.filter(id__in=form_ids[start:start + 1000]).update(session=session)
+
+    latest = ExamSession.objects.order_by('-year', '-exam_type').first()
+    if latest is not None and not ExamSession.objects.filter(is_active=True).exists():
+        ExamSession.objects.filter(pk=latest.pk).update(is_active=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam_app', '0005_examsession'),
+    ]
+
+    operations = [
+        migrations.RunPython(assign_sessions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+
+def backfill_updated_at(apps, schema_editor):
+    # The best record of an existing row's last change.
+    for name in ('ExamForm', 'ArchivedExamForm'):
+        apps.get_model('exam_app', name).objects.update(updated_at=Coalesce(F('approved_at'), F('submitted_at')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam_app', '0007_dailyreport'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examform',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='archivedexamform',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:55
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def seed_base_fee(apps, schema_editor):
+    # The flat fee the payment views used to hardcode.
+    FeeRule = apps.get_model('exam_app', 'FeeRule')
+    if not FeeRule.objects.exists():
+        FeeRule.objects.create(name='Exam form fee', amount=Decimal('100.00'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam_app', '0009_searchtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeeRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('branch', models.CharField(blank=True, default='', max_length=100)),
+                ('semester', models.CharField(blank=True, default='', max_length=50)),
+                ('exam_type', models.CharField(blank=True, choices=[('winter', 'Winter'), ('summer', 'Summer')], default='', max_length=10)),
+                ('min_subjects', models.PositiveSmallIntegerField(default=0, help_text='Applies only to forms with at least this many subjects')),
+                ('starts_on', models.DateField(blank=True, null=True)),
+                ('ends_on', models.DateField(blank=True, null=True)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('per_subject', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['branch', 'semester', 'exam_type', 'starts_on', 'name'],
+            },
+        ),
+        migrations.RunPython(seed_base_fee, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam_app', '0010_feerule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamFormDraft',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('branch', models.CharField(blank=True, default='', max_length=100)),
+                ('semester', models.CharField(blank=True, default='', max_length=50)),
+                ('subjects', models.TextField(blank=True, default='')),
+                ('exam_type', models.CharField(blank=True, choices=[('winter', 'Winter'), ('summer', 'Summer')], default='', max_length=10)),
+                ('razorpay_order_id', models.CharField(blank=True, default='', max_length=100)),
+                ('fee', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('submitted', models.BooleanField(default=False, help_text='The student submitted the form and can proceed to payment')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='exam_form_draft', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
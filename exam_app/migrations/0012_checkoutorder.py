@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exam_app', '0011_examformdraft'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckoutOrder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('razorpay_order_id', models.CharField(max_length=100, unique=True)),
+                ('branch', models.CharField(max_length=100)),
+                ('semester', models.CharField(max_length=50)),
+                ('subjects', models.TextField()),
+                ('exam_type', models.CharField(choices=[('winter', 'Winter'), ('summer', 'Summer')], max_length=10)),
+                ('fee', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkout_orders', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
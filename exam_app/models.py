@@ -16,6 +16,12 @@ class CustomUser(AbstractUser):
     date_of_birth = models.DateField(blank=True, null=True)
     address = models.TextField(blank=True, null=True)
     profile_photo = models.ImageField(upload_to='profile_photos/', blank=True, null=True)
+    # Square WebP variants built from profile_photo by exam_app.photos
+    profile_thumbnail = models.ImageField(upload_to='profile_photos/thumbs/', blank=True, null=True, editable=False)
+    profile_thumbnail_2x = models.ImageField(upload_to='profile_photos/thumbs/', blank=True, null=True, editable=False)
+    # Bumped on every save; incremental backups select changed users by it.
+    # Queryset .update() calls that change a user must set it explicitly.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.username} ({self.role})"
@@ -36,8 +42,19 @@ class ExamForm(models.Model):
     subjects = models.TextField(blank=True, null=True)  # Can be a comma-separated list or JSON
     exam_type = models.CharField(max_length=10, choices=EXAM_TYPE_CHOICES, blank=True, null=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
-    submitted_at = models.DateTimeField(auto_now_add=True)
+    submitted_at = models.DateTimeField(auto_now_add=True, db_index=True)
     approved_at = models.DateTimeField(blank=True, null=True)
+    # Bumped on every save; the change feed behind live status updates.
+    # Queryset .update() calls that change a form must set it explicitly.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    session = models.ForeignKey('ExamSession', on_delete=models.PROTECT, related_name='exam_forms', blank=True, null=True)
+
+    class Meta:
+        # Admin pages list one session at a time, newest first, and count it by status.
+        indexes = [
+            models.Index(fields=['session', '-submitted_at'], name='examform_session_submitted'),
+            models.Index(fields=['session', 'status'], name='examform_session_status'),
+        ]
 
     def __str__(self):
         return f"{self.student.username} - {self.branch} - {self.status}"
@@ -49,7 +66,139 @@ class Payment(models.Model):
     razorpay_payment_id = models.CharField(max_length=100, blank=True, null=True)
     status = models.CharField(max_length=20, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
+    paid_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    def __str__(self):
+        return f"Payment for {self.exam_form} - {self.status}"
+
+class ExamFormDraft(models.Model):
+    """
+    A student's exam form in progress: autosaved while they fill it in and
+    read back by the payment step. Replaces the form data that used to live
+    in the session, so it outlives session expiry. Deleted once the paid
+    ExamForm is created.
+    """
+    student = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='exam_form_draft')
+    branch = models.CharField(max_length=100, blank=True, default='')
+    semester = models.CharField(max_length=50, blank=True, default='')
+    subjects = models.TextField(blank=True, default='')  # comma-separated, as on ExamForm
+    exam_type = models.CharField(max_length=10, choices=ExamForm.EXAM_TYPE_CHOICES, blank=True, default='')
+    # Set by the payment step: the open Razorpay order and the fee it charges.
+    # Cleared whenever the draft changes, so a stale order is never reused.
+    razorpay_order_id = models.CharField(max_length=100, blank=True, default='')
+    fee = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    submitted = models.BooleanField(default=False, help_text='The student submitted the form and can proceed to payment')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def form_data(self):
+        return {'branch': self.branch, 'semester': self.semester, 'subjects': self.subjects, 'exam_type': self.exam_type}
+
+    def __str__(self):
+        return f"Draft for {self.student.username}"
+
+class CheckoutOrder(models.Model):
+    """
+    A Razorpay order opened by the payment step, with the form contents and
+    fee it charges for. payment_success records the ExamForm and Payment
+    from this snapshot, not from the draft, so editing the draft while
+    checkout is still open can neither change nor lose what was paid for.
+    """
+    razorpay_order_id = models.CharField(max_length=100, unique=True)
+    student = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='checkout_orders')
+    branch = models.CharField(max_length=100)
+    semester = models.CharField(max_length=50)
+    subjects = models.TextField()
+    exam_type = models.CharField(max_length=10, choices=ExamForm.EXAM_TYPE_CHOICES)
+    fee = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def form_data(self):
+        return {'branch': self.branch, 'semester': self.semester, 'subjects': self.subjects, 'exam_type': self.exam_type}
+
+    def __str__(self):
+        return f"{self.razorpay_order_id} for {self.student.username}"
+
+class FeeRule(models.Model):
+    """
+    One line of the exam fee schedule. A form's fee is the sum, over every
+    active rule that matches it, of `amount` plus `per_subject` times its
+    subject count. Blank branch/semester/exam type match any value. The
+    optional date window (e.g. a late fee) is checked against the checkout date.
+    Evaluated by exam_app.fees.
+    """
+    name = models.CharField(max_length=100)
+    branch = models.CharField(max_length=100, blank=True, default='')
+    semester = models.CharField(max_length=50, blank=True, default='')
+    exam_type = models.CharField(max_length=10, choices=ExamForm.EXAM_TYPE_CHOICES, blank=True, default='')
+    min_subjects = models.PositiveSmallIntegerField(default=0, help_text='Applies only to forms with at least this many subjects')
+    starts_on = models.DateField(blank=True, null=True)
+    ends_on = models.DateField(blank=True, null=True)
+    amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    per_subject = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['branch', 'semester', 'exam_type', 'starts_on', 'name']
+
+    def __str__(self):
+        return self.name
+
+class ExamSession(models.Model):
+    """
+    A winter or summer exam session, e.g. "Winter 2026". Closed sessions can
+    be moved to the archive tables with `manage.py archive_sessions`.
+    """
+    year = models.PositiveSmallIntegerField()
+    exam_type = models.CharField(max_length=10, choices=ExamForm.EXAM_TYPE_CHOICES)
+    is_active = models.BooleanField(default=False, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    closed_at = models.DateTimeField(blank=True, null=True)
+    archived_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        unique_together = ('year', 'exam_type')
+        # Newest first: in a year the winter session follows the summer one.
+        ordering = ['-year', '-exam_type']
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if self.is_active:
+            ExamSession.objects.filter(is_active=True).exclude(pk=self.pk).update(is_active=False)
+
+    def __str__(self):
+        return f"{self.get_exam_type_display()} {self.year}"
+
+class ArchivedExamForm(models.Model):
+    """ExamForm rows of an archived session, keeping their original ids."""
+    id = models.BigIntegerField(primary_key=True)
+    student = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='archived_exam_forms')
+    branch = models.CharField(max_length=100, blank=True, null=True)
+    semester = models.CharField(max_length=50, blank=True, null=True)
+    subjects = models.TextField(blank=True, null=True)
+    exam_type = models.CharField(max_length=10, choices=ExamForm.EXAM_TYPE_CHOICES, blank=True, null=True)
+    status = models.CharField(max_length=10, choices=ExamForm.STATUS_CHOICES)
+    submitted_at = models.DateTimeField()
+    approved_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField()
+    session = models.ForeignKey(ExamSession, on_delete=models.PROTECT, related_name='archived_exam_forms')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.student.username} - {self.branch} - {self.status} (archived)"
+
+class ArchivedPayment(models.Model):
+    """Payment rows of an archived session, keeping their original ids."""
+    id = models.BigIntegerField(primary_key=True)
+    exam_form = models.OneToOneField(ArchivedExamForm, on_delete=models.CASCADE, related_name='payment')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    razorpay_order_id = models.CharField(max_length=100, unique=True)
+    razorpay_payment_id = models.CharField(max_length=100, blank=True, null=True)
+    status = models.CharField(max_length=20)
+    created_at = models.DateTimeField()
     paid_at = models.DateTimeField(blank=True, null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"Payment for {self.exam_form} - {self.status}"
@@ -58,9 +207,79 @@ class Attendance(models.Model):
     student = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='attendance')
     date = models.DateField()
     status = models.BooleanField(default=False)  # True for present, False for absent
+    # When the row was last written, whatever its date: incremental backups
+    # pick up backdated imports by it.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = ('student', 'date')
 
     def __str__(self):
         return f"{self.student.username} - {self.date} - {'Present' if self.status else 'Absent'}"
+
+class AttendanceSummary(models.Model):
+    """
+    Rollup of Attendance per student and exam term, kept current by
+    exam_app.attendance so eligibility checks are a single indexed lookup.
+    A winter term covers July-December, a summer term January-June.
+    """
+    student = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='attendance_summaries')
+    year = models.PositiveSmallIntegerField()
+    exam_type = models.CharField(max_length=10, choices=ExamForm.EXAM_TYPE_CHOICES)
+    present_days = models.PositiveIntegerField(default=0)
+    total_days = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('student', 'year', 'exam_type')
+
+    @property
+    def percentage(self):
+        return round(100 * self.present_days / self.total_days, 1) if self.total_days else None
+
+    def __str__(self):
+        return f"{self.student.username} - {self.get_exam_type_display()} {self.year} - {self.percentage}%"
+
+class DailyReport(models.Model):
+    """
+    Registrations and fees collected per day, branch, semester and exam type,
+    refreshed from ExamForm/Payment (and their archives) by
+    `manage.py refresh_reports`. Reporting pages read only this table.
+    """
+    day = models.DateField()
+    branch = models.CharField(max_length=100, blank=True, default='')
+    semester = models.CharField(max_length=50, blank=True, default='')
+    exam_type = models.CharField(max_length=10, blank=True, default='')
+    registrations = models.PositiveIntegerField(default=0)
+    payments = models.PositiveIntegerField(default=0)
+    fee_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('day', 'branch', 'semester', 'exam_type')
+
+    def __str__(self):
+        return f"{self.day} {self.branch}/{self.semester}/{self.exam_type}: {self.registrations} forms, {self.fee_total}"
+
+class RollupWatermark(models.Model):
+    """Where an incremental rollup refresh left off."""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+class SearchToken(models.Model):
+    """
+    One word of a user's name, username, college ID, email or exam form
+    subjects, maintained by exam_app.search for indexed prefix search.
+    """
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        # Leading on token: a prefix query is a range scan that also yields the user ids.
+        unique_together = ('token', 'user')
+
+    def __str__(self):
+        return f"{self.token} -> {self.user_id}"
@@ -0,0 +1,170 @@
+"""
+Notification emails to students: form submitted, payment received, form
+approved or rejected.
+
+Every email is multipart: a plain-text body from exam_app/email_<kind>.txt
+plus, where the template exists, an HTML alternative from
+email_<kind>.html. Each process compiles a template once and keeps it, so
+rendering a batch costs only the rendering. render_batch() spreads large
+batches (results day, mass approvals) over a pool of worker processes.
+send_batch() then delivers them over one mail connection and reports
+throughput.
+"""
+import functools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from email.header import Header
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.dispatch import receiver
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils.autoreload import file_changed
+
+from .photos import setup_worker
+
+SUBJECTS = {
+    'form_submitted': '📝 Exam Form Submitted Successfully',
+    'payment_success': '💳 Payment Successful - Form Submitted',
+    'form_approved': '🎉 Exam Form Approved - Action Required',
+    'form_rejected': 'Exam Form Rejected',
+}
+# Below this many emails, starting the pool costs more than it saves.
+POOL_THRESHOLD = 2000
+RENDER_CHUNK_SIZE = 500
+
+
+@functools.cache
+def _templates(kind):
+    html = None
+    try:
+        html = get_template(f'exam_app/email_{kind}.html')
+    except TemplateDoesNotExist:
+        pass
+    return get_template(f'exam_app/email_{kind}.txt'), html
+
+
+@receiver(file_changed, dispatch_uid='exam_app_email_templates')
+def _template_changed(sender, file_path, **kwargs):
+    # Lets runserver pick up an edited email template without a restart.
+    if file_path.suffix in ('.html', '.txt'):
+        _templates.cache_clear()
+
+
+def render(kind, context):
+    """(text, html) bodies of a `kind` email; html is None for text-only kinds."""
+    text, html = _templates(kind)
+    return text.render(context), html.render(context) if html else None
+
+
+def _render_chunk(kind, contexts):
+    return [render(kind, context) for context in contexts]
+
+
+@functools.cache
+def _encoded_subject(kind):
+    # Encoding the (emoji) subject is most of the cost of building a message,
+    # and it is the same for every message of a kind. An already-encoded,
+    # ASCII subject is used as is.
+    subject = SUBJECTS[kind]
+    return subject if subject.isascii() else Header(subject, 'utf-8').encode(linesep=' ')
+
+
+def _message(kind, to, text, html, connection=None):
+    email = EmailMultiAlternatives(_encoded_subject(kind), text, settings.DEFAULT_FROM_EMAIL, [to], connection=connection)
+    if html:
+        email.attach_alternative(html, 'text/html')
+    return email
+
+
+def send_email(kind, context, to):
+    """Render and send one email, ignoring delivery failures like the rest of the site."""
+    _message(kind, to, *render(kind, context)).send(fail_silently=True)
+
+
+class RenderStats:
+    def __init__(self, kind, rendered, workers, render_seconds, sent=0, send_seconds=0.0):
+        self.kind = kind
+        self.rendered = rendered
+        self.workers = workers
+        self.render_seconds = render_seconds
+        self.sent = sent
+        self.send_seconds = send_seconds
+
+    def __str__(self):
+        rate = self.rendered / self.render_seconds if self.render_seconds else 0
+        summary = (
+            f'{self.kind}: rendered {self.rendered} in {self.render_seconds:.2f}s '
+            f'({rate:,.0f}/s, {self.workers} worker(s))'
+        )
+        if self.sent:
+            summary += f', sent {self.sent} in {self.send_seconds:.2f}s'
+        return summary
+
+
+def render_batch(kind, contexts, workers=None):
+    """
+    Render every context of a batch in order. Returns ([(text, html), ...],
+    RenderStats). Batches of POOL_THRESHOLD or more are split over `workers`
+    processes (default one per CPU). Workers only render templates and never
+    touch the database.
+    """
+    contexts = list(contexts)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    # Compile before forking so every worker inherits the compiled templates.
+    _templates(kind)
+    if workers == 1 or len(contexts) < POOL_THRESHOLD:
+        workers = 1
+        rendered = _render_chunk(kind, contexts)
+    else:
+        chunks = [contexts[i:i + RENDER_CHUNK_SIZE] for i in range(0, len(contexts), RENDER_CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=setup_worker) as pool:
+            rendered = [body for chunk in pool.map(functools.partial(_render_chunk, kind), chunks) for body in chunk]
+    return rendered, RenderStats(kind, len(rendered), workers, time.perf_counter() - start)
+
+
+def send_batch(kind, recipients, workers=None):
+    """
+    Render and send a `kind` email to each (context, address) pair over one
+    mail connection, ignoring delivery failures. Returns RenderStats.
+    """
+    recipients = [(context, to) for context, to in recipients if to]
+    rendered, stats = render_batch(kind, (context for context, _ in recipients), workers)
+    if not rendered:
+        return stats
+    start = time.perf_counter()
+    with get_connection(fail_silently=True) as connection:
+        emails = [_message(kind, to, text, html, connection) for (_, to), (text, html) in zip(recipients, rendered)]
+        stats.sent = connection.send_messages(emails) or 0
+    stats.send_seconds = time.perf_counter() - start
+    return stats
+
+
+def form_status_context(exam_form, dashboard_url):
+    student = exam_form.student
+    return {
+        'user_name': student.get_full_name() or student.username,
+        'form_id': exam_form.id,
+        'branch': exam_form.branch,
+        'semester': exam_form.semester,
+        'exam_type': exam_form.exam_type,
+        'subjects': exam_form.subjects,
+        'approved_at': exam_form.approved_at.strftime('%d %B %Y, %I:%M %p') if exam_form.approved_at else '',
+        'dashboard_url': dashboard_url,
+    }
+
+
+def send_form_status_emails(exam_forms, dashboard_url, workers=None):
+    """Tell each form's student it was approved or rejected. Returns one RenderStats per status."""
+    by_status = {}
+    for exam_form in exam_forms:
+        by_status.setdefault(exam_form.status, []).append(
+            (form_status_context(exam_form, dashboard_url), exam_form.student.email)
+        )
+    return [
+        send_batch(f'form_{status}', recipients, workers)
+        for status, recipients in by_status.items() if f'form_{status}' in SUBJECTS
+    ]
@@ -0,0 +1,111 @@
+"""
+Profile photo thumbnails. Uploads are size-checked in the form and stored
+as-is. The fixed square WebP variants are rendered after the response: on a
+small per-process thread pool for edits, or in bulk by the
+process_profile_photos command. Variant files are named after a hash of
+their content, so a URL never changes meaning and can be cached forever.
+
+Nothing here touches the database at import time, so the module can be
+loaded by process-pool workers before django.setup().
+"""
+import hashlib
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Avatars are shown at 80-96 CSS pixels; the 2x variant covers high-DPI screens.
+THUMBNAIL_VARIANTS = {'profile_thumbnail': 96, 'profile_thumbnail_2x': 192}
+THUMBNAIL_DIR = 'profile_photos/thumbs'
+WEBP_QUALITY = 80
+
+_executor = None
+
+
+def render_thumbnails(fh):
+    """Decode an image once and return {field: WebP bytes} for every variant."""
+    largest = max(THUMBNAIL_VARIANTS.values())
+    with Image.open(fh) as image:
+        # JPEGs can be decoded at 1/2-1/8 scale, far cheaper than full size.
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGBA' if image.has_transparency_data else 'RGB')
+        base = ImageOps.fit(image, (largest, largest), Image.Resampling.LANCZOS)
+
+    rendered = {}
+    for field, size in THUMBNAIL_VARIANTS.items():
+        thumb = base if size == largest else base.resize((size, size), Image.Resampling.LANCZOS)
+        buf = io.BytesIO()
+        thumb.save(buf, 'WEBP', quality=WEBP_QUALITY, method=4)
+        rendered[field] = buf.getvalue()
+    return rendered
+
+
+def store_thumbnail(content, size):
+    """Save under a content-hashed name; identical thumbnails are stored once."""
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    name = f'{THUMBNAIL_DIR}/{digest}-{size}.webp'
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+    return name
+
+
+def build_thumbnails(photo_name):
+    """Render and store every variant of a stored photo; returns {field: storage name}."""
+    with default_storage.open(photo_name, 'rb') as fh:
+        rendered = render_thumbnails(fh)
+    return {field: store_thumbnail(content, THUMBNAIL_VARIANTS[field]) for field, content in rendered.items()}
+
+
+def save_thumbnails(user_id, photo_name, names):
+    """Record thumbnails unless the user has uploaded a different photo meanwhile."""
+    from .models import CustomUser
+    return CustomUser.objects.filter(pk=user_id, profile_photo=photo_name).update(**names, updated_at=timezone.now())
+
+
+def reset_thumbnails(user):
+    """Drop the variants of a replaced photo; templates fall back to the original until new ones exist."""
+    for field in THUMBNAIL_VARIANTS:
+        setattr(user, field, None)
+
+
+def process_profile_photo(user_id, photo_name):
+    try:
+        save_thumbnails(user_id, photo_name, build_thumbnails(photo_name))
+    except Exception:
+        logger.exception('Could not build thumbnails for %s', photo_name)
+    finally:
+        if getattr(settings, 'PROFILE_PHOTO_ASYNC', True):
+            # Pool threads get their own connections; don't leave them open.
+            connections.close_all()
+
+
+def schedule_thumbnails(user):
+    """Build the user's thumbnails once the current transaction commits, off the request thread."""
+    global _executor
+    if not user.profile_photo:
+        return
+    user_id, photo_name = user.pk, user.profile_photo.name
+    if not getattr(settings, 'PROFILE_PHOTO_ASYNC', True):
+        transaction.on_commit(lambda: process_profile_photo(user_id, photo_name))
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'PROFILE_PHOTO_WORKERS', 2),
+            thread_name_prefix='profile-photos',
+        )
+    transaction.on_commit(lambda: _executor.submit(process_profile_photo, user_id, photo_name))
+
+
+def setup_worker():
+    """ProcessPoolExecutor initializer; a no-op when workers are forked from a configured process."""
+    django.setup()
@@ -0,0 +1,180 @@
+"""
+Payment reconciliation against the gateway's own records.
+
+build_index() reads every recorded payment (live and archived) in one pass
+into two dicts: one keyed by Razorpay payment id, and one keyed by order id
+for payments whose callback never stored a payment id. reconcile() then
+streams the gateway records, a settlement CSV export (settlement_rows()) or
+the paginated payments API (api_rows()), one line at a time. Each line is a
+dict lookup, so memory is bounded by the number of payments in the database,
+however many lines the export has.
+
+Issues are written as they are found:
+
+- amount_mismatch: the gateway captured a different amount than we recorded.
+- status_mismatch: the gateway captured a payment we don't record as paid.
+- gateway_only: a captured payment with no Payment row at all, e.g. a lost
+  success callback.
+- duplicate: the same payment id appears twice in the gateway records.
+- missing_settlement: we record a payment as paid during the period the
+  gateway records cover, but they don't include it.
+- fee_mismatch: with check_fees, the recorded amount differs from the fee
+  the FeeRule schedule charges for the form.
+- orphan_form: an exam form without any payment row. Forms are only created
+  once a payment succeeds, so this should never happen.
+"""
+import csv
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+
+from django.utils import timezone
+
+from .fees import FeeSchedule, subject_count
+from .models import ArchivedExamForm, ArchivedPayment, ExamForm, Payment
+
+ISSUE_FIELDS = [
+    'issue', 'payment_id', 'order_id', 'gateway_amount', 'recorded_amount', 'recorded_status',
+    'source', 'payment_pk', 'exam_form_id', 'detail',
+]
+# Razorpay settlement report columns; override for other export layouts.
+SETTLEMENT_COLUMNS = {'payment_id': 'entity_id', 'order_id': 'order_id', 'amount': 'amount', 'type': 'type'}
+API_PAGE_SIZE = 100  # the payments API's maximum
+INDEX_CHUNK_SIZE = 5000
+
+
+def build_index(check_fees=False):
+    """
+    Recorded payments as ({payment_id: entry}, {order_id: entry}), where an
+    entry is (source, pk, exam_form_id, order_id, payment_id, amount, status,
+    paid_at, expected_fee).
+    """
+    schedule = FeeSchedule.load() if check_fees else None
+    by_payment, by_order = {}, {}
+    for source, model in (('live', Payment), ('archived', ArchivedPayment)):
+        rows = model.objects.values_list(
+            'pk', 'exam_form_id', 'razorpay_order_id', 'razorpay_payment_id', 'amount', 'status', 'paid_at',
+            'exam_form__branch', 'exam_form__semester', 'exam_form__exam_type', 'exam_form__subjects', 'exam_form__submitted_at',
+        )
+        for pk, form_id, order_id, payment_id, amount, status, paid_at, branch, semester, exam_type, subjects, submitted_at in rows.iterator(chunk_size=INDEX_CHUNK_SIZE):
+            expected = None
+            if schedule is not None:
+                expected = schedule.fee(branch, semester, exam_type, subject_count(subjects), timezone.localdate(submitted_at))
+            entry = (source, pk, form_id, order_id, payment_id, amount, status, paid_at, expected)
+            if payment_id:
+                by_payment[payment_id] = entry
+            else:
+                by_order[order_id] = entry
+    return by_payment, by_order
+
+
+def _in_period(moment, since, until):
+    return moment is not None and (since is None or moment >= since) and (until is None or moment < until)
+
+
+def _amount(value, in_paise=False):
+    try:
+        amount = Decimal(str(value).replace(',', '').strip())
+    except InvalidOperation:
+        return None
+    return (amount / 100 if in_paise else amount).quantize(Decimal('0.01'))
+
+
+def settlement_rows(lines, columns=None, amount_in_paise=False):
+    """
+    Yield (payment_id, order_id, amount, captured) for each payment line of a
+    settlement CSV, read lazily from `lines` (an open file). Refund and
+    adjustment lines are skipped.
+    """
+    columns = {**SETTLEMENT_COLUMNS, **(columns or {})}
+    for row in csv.DictReader(lines):
+        kind = (row.get(columns['type']) or 'payment').strip().lower()
+        if kind != 'payment':
+            continue
+        yield (
+            (row.get(columns['payment_id']) or '').strip(),
+            (row.get(columns['order_id']) or '').strip(),
+            _amount(row.get(columns['amount'], ''), amount_in_paise),
+            True,
+        )
+
+
+def api_rows(client, since, until, page_size=API_PAGE_SIZE):
+    """Yield (payment_id, order_id, amount, captured) from the gateway's payments API, one page at a time."""
+    skip = 0
+    while True:
+        page = client.payment.all({
+            'from': int(since.timestamp()), 'to': int(until.timestamp()), 'count': page_size, 'skip': skip,
+        })
+        items = page.get('items', [])
+        for item in items:
+            yield item['id'], item.get('order_id') or '', _amount(item.get('amount', ''), in_paise=True), item.get('status') == 'captured'
+        if len(items) < page_size:
+            return
+        skip += page_size
+
+
+def _issue(issue, entry=None, payment_id='', order_id='', gateway_amount=None, detail=''):
+    row = {'issue': issue, 'payment_id': payment_id, 'order_id': order_id, 'gateway_amount': gateway_amount, 'detail': detail}
+    if entry is not None:
+        source, pk, form_id, entry_order_id, entry_payment_id, amount, status, _, _ = entry
+        row.update({
+            'payment_id': payment_id or entry_payment_id or '', 'order_id': order_id or entry_order_id,
+            'recorded_amount': amount, 'recorded_status': status, 'source': source, 'payment_pk': pk, 'exam_form_id': form_id,
+        })
+    return row
+
+
+def reconcile(records, index, write, since=None, until=None):
+    """
+    Match gateway `records` against a build_index() `index`, passing each
+    issue dict to `write`. `since`/`until` give the period the gateway
+    records cover: only payments paid (and forms submitted) in it are
+    expected there. Returns a Counter of lines read and issues by type.
+    """
+    by_payment, by_order = index
+    matched = set()
+    counts = Counter()
+    for payment_id, order_id, amount, captured in records:
+        counts['lines'] += 1
+        if not captured:
+            continue
+        entry = by_payment.pop(payment_id, None) if payment_id else None
+        if entry is None and order_id:
+            entry = by_order.pop(order_id, None)
+        if entry is None:
+            if (payment_id or order_id) in matched:
+                issue = _issue('duplicate', payment_id=payment_id, order_id=order_id, gateway_amount=amount)
+            else:
+                issue = _issue('gateway_only', payment_id=payment_id, order_id=order_id, gateway_amount=amount)
+            counts[issue['issue']] += 1
+            write(issue)
+            continue
+        matched.add(payment_id or order_id)
+        recorded_amount, status, expected = entry[5], entry[6], entry[8]
+        if amount is None or amount != recorded_amount:
+            counts['amount_mismatch'] += 1
+            write(_issue('amount_mismatch', entry, payment_id, order_id, amount))
+        if status != 'paid':
+            counts['status_mismatch'] += 1
+            write(_issue('status_mismatch', entry, payment_id, order_id, amount))
+        if expected is not None and recorded_amount != expected:
+            counts['fee_mismatch'] += 1
+            write(_issue('fee_mismatch', entry, payment_id, order_id, amount, detail=f'schedule charges {expected}'))
+        counts['matched'] += 1
+
+    for remaining in (by_payment, by_order):
+        for entry in remaining.values():
+            if entry[6] == 'paid' and _in_period(entry[7], since, until):
+                counts['missing_settlement'] += 1
+                write(_issue('missing_settlement', entry))
+
+    for source, model in (('live', ExamForm), ('archived', ArchivedExamForm)):
+        forms = model.objects.filter(payment__isnull=True)
+        if since:
+            forms = forms.filter(submitted_at__gte=since)
+        if until:
+            forms = forms.filter(submitted_at__lt=until)
+        for form_id in forms.values_list('pk', flat=True).iterator(chunk_size=INDEX_CHUNK_SIZE):
+            counts['orphan_form'] += 1
+            write({'issue': 'orphan_form', 'source': source, 'exam_form_id': form_id})
+    return counts
@@ -0,0 +1,134 @@
+"""
+Release-phase steps of a deploy (the `release` management command).
+
+Migrations run once per deploy instead of on every web instance's boot.
+They run under a database lock, so two releases started together can't
+apply them twice. The lock is GET_LOCK on MySQL and an advisory lock on
+PostgreSQL. SQLite needs none.
+
+collectstatic only runs when the static sources changed. The digests of the
+sources collected last are recorded in the static manifest itself
+(staticfiles.json, under "sources"), and a release compares them with the
+sources the finders see now. With the manifest storage that whitenoise
+configures, an unchanged tree skips post-processing (hashing and
+compressing every file) altogether.
+
+On Render the pre-deploy command runs on its own instance whose filesystem
+changes are thrown away, so there static files are collected (and their
+sources recorded) by `build_assets` in the build, and the release runs with
+--skip-static.
+"""
+import hashlib
+import json
+import time
+import zlib
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.base import ContentFile
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+
+MIGRATION_LOCK_NAME = 'exam_form_system.migrate'
+MIGRATION_LOCK_POLL = 1  # seconds between PostgreSQL lock attempts
+SOURCES_KEY = 'sources'
+
+
+def pending_migrations(using='default'):
+    """Migrations not yet applied to the `using` database."""
+    executor = MigrationExecutor(connections[using])
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+@contextmanager
+def migration_lock(using='default', timeout=300):
+    """
+    Hold a database-wide lock for the block, waiting up to `timeout`
+    seconds for it. Raises TimeoutError if another release keeps it.
+    """
+    connection = connections[using]
+    if connection.vendor == 'mysql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT GET_LOCK(%s, %s)', [MIGRATION_LOCK_NAME, timeout])
+            acquired = cursor.fetchone()[0] == 1
+        if not acquired:
+            raise TimeoutError(f'Another release held the migration lock for over {timeout}s')
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT RELEASE_LOCK(%s)', [MIGRATION_LOCK_NAME])
+    elif connection.vendor == 'postgresql':
+        key = zlib.crc32(MIGRATION_LOCK_NAME.encode())
+        deadline = time.monotonic() + timeout
+        with connection.cursor() as cursor:
+            # pg_advisory_lock() can't time out; poll the non-blocking form instead.
+            while True:
+                cursor.execute('SELECT pg_try_advisory_lock(%s)', [key])
+                if cursor.fetchone()[0]:
+                    break
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f'Another release held the migration lock for over {timeout}s')
+                time.sleep(MIGRATION_LOCK_POLL)
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [key])
+    else:
+        # SQLite: one file on one host, and it serialises writers itself.
+        yield
+
+
+def static_sources():
+    """{path: sha256} of every file collectstatic would collect, first finder winning as it does."""
+    ignore_patterns = apps.get_app_config('staticfiles').ignore_patterns
+    sources = {}
+    for finder in finders.get_finders():
+        for path, storage in finder.list(ignore_patterns):
+            prefix = getattr(storage, 'prefix', None)
+            name = f'{prefix}/{path}' if prefix else path
+            if name in sources:
+                continue
+            with storage.open(path) as f:
+                sources[name] = hashlib.file_digest(f, 'sha256').hexdigest()
+    return sources
+
+
+def collected_sources():
+    """The sources recorded by the last collect, or None if there is no record (or no manifest storage)."""
+    if not hasattr(staticfiles_storage, 'read_manifest'):
+        return None
+    content = staticfiles_storage.read_manifest()
+    if content is None:
+        return None
+    try:
+        return json.loads(content).get(SOURCES_KEY)
+    except ValueError:
+        return None
+
+
+def record_sources(sources):
+    """Record `sources` in the manifest after a collect. Returns False without a manifest storage."""
+    if not hasattr(staticfiles_storage, 'read_manifest'):
+        return False
+    content = staticfiles_storage.read_manifest()
+    if content is None:
+        return False
+    stored = json.loads(content)
+    stored[SOURCES_KEY] = sources
+    # Deleted first so save() writes the same name instead of a suffixed copy.
+    name = staticfiles_storage.manifest_name
+    staticfiles_storage.manifest_storage.delete(name)
+    staticfiles_storage.manifest_storage.save(name, ContentFile(json.dumps(stored).encode()))
+    return True
+
+
+def diff_sources(previous, current):
+    """(added, changed, removed) paths between two static_sources() results."""
+    added = sorted(current.keys() - previous.keys())
+    removed = sorted(previous.keys() - current.keys())
+    changed = sorted(name for name in current.keys() & previous.keys() if current[name] != previous[name])
+    return added, changed, removed
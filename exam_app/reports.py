@@ -0,0 +1,203 @@
+"""
+Daily registration and fee rollups behind the reports page.
+
+DailyReport holds one row per (day, branch, semester, exam_type): forms
+submitted that day and paid payments (count and amount) settled that day.
+refresh_reports() only recomputes the days that have forms submitted or
+payments made since the last watermark, so a run every few minutes touches a
+handful of rows no matter how many payments exist. Archived forms and
+payments are counted too, so archiving a session leaves its history intact.
+
+Edits that move no timestamp (an admin changing a form's branch, a refunded
+payment, a deleted form) are not seen by the incremental refresh; run
+`refresh_reports --full` after such corrections.
+"""
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import ArchivedExamForm, ArchivedPayment, DailyReport, ExamForm, Payment, RollupWatermark
+
+WATERMARK_NAME = 'daily_report'
+REPORT_DIMENSIONS = ('branch', 'semester', 'exam_type')
+# Days recomputed per transaction; keeps each OR'd range filter short.
+REFRESH_DAYS_PER_BATCH = 31
+# A form or payment stamped just before a refresh may commit just after it,
+# so each run looks back this far past the previous watermark.
+WATERMARK_OVERLAP = datetime.timedelta(minutes=5)
+
+
+def day_bounds(day):
+    """Aware [start, end) datetimes of a local calendar day."""
+    start = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+    return start, start + datetime.timedelta(days=1)
+
+
+def _in_days(field, days):
+    """One indexed range condition per day instead of a function over the column."""
+    ranges = [Q(**{f'{field}__gte': start, f'{field}__lt': end}) for start, end in map(day_bounds, days)]
+    return Q(*ranges, _connector=Q.OR)
+
+
+def _days(queryset, field):
+    tz = timezone.get_current_timezone()
+    return set(queryset.annotate(day=TruncDate(field, tzinfo=tz)).values_list('day', flat=True).distinct().order_by())
+
+
+def changed_days(since):
+    """Local days with forms submitted or payments made after `since` (every day when `since` is None)."""
+    forms = ExamForm.objects.all()
+    payments = Payment.objects.filter(status='paid', paid_at__isnull=False)
+    days = set()
+    if since is None:
+        days |= _days(ArchivedExamForm.objects.all(), 'submitted_at')
+        days |= _days(ArchivedPayment.objects.filter(status='paid', paid_at__isnull=False), 'paid_at')
+    else:
+        forms = forms.filter(submitted_at__gt=since)
+        payments = payments.filter(paid_at__gt=since)
+    return days | _days(forms, 'submitted_at') | _days(payments, 'paid_at')
+
+
+def _registrations(model, days):
+    tz = timezone.get_current_timezone()
+    return (
+        model.objects
+        .filter(_in_days('submitted_at', days))
+        .annotate(day=TruncDate('submitted_at', tzinfo=tz))
+        .values('day', *REPORT_DIMENSIONS)
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+
+
+def _fees(model, days):
+    tz = timezone.get_current_timezone()
+    return (
+        model.objects
+        .filter(_in_days('paid_at', days), status='paid')
+        .annotate(day=TruncDate('paid_at', tzinfo=tz), **{name: F(f'exam_form__{name}') for name in REPORT_DIMENSIONS})
+        .values('day', *REPORT_DIMENSIONS)
+        .annotate(count=Count('id'), total=Sum('amount'))
+        .order_by()
+    )
+
+
+def build_rows(days):
+    """Aggregate the rollup rows for `days` from the live and archived tables."""
+    rows = defaultdict(lambda: {'registrations': 0, 'payments': 0, 'fee_total': Decimal('0')})
+
+    def key(row):
+        return (row['day'],) + tuple(row[name] or '' for name in REPORT_DIMENSIONS)
+
+    for model in (ExamForm, ArchivedExamForm):
+        for row in _registrations(model, days):
+            rows[key(row)]['registrations'] += row['count']
+    for model in (Payment, ArchivedPayment):
+        for row in _fees(model, days):
+            entry = rows[key(row)]
+            entry['payments'] += row['count']
+            entry['fee_total'] += row['total'] or 0
+
+    return [
+        DailyReport(day=day, branch=branch, semester=semester, exam_type=exam_type, **values)
+        for (day, branch, semester, exam_type), values in rows.items()
+    ]
+
+
+def last_refresh():
+    return RollupWatermark.objects.filter(name=WATERMARK_NAME).values_list('value', flat=True).first()
+
+
+def refresh_reports(full=False, days_per_batch=REFRESH_DAYS_PER_BATCH):
+    """
+    Recompute the DailyReport rows of every day changed since the last run
+    (or of every day with full=True) and move the watermark forward.
+    Returns the number of days recomputed.
+    """
+    # Taken before reading anything: rows written while the refresh runs are
+    # picked up again by the next one, since rebuilding a day is idempotent.
+    watermark = timezone.now()
+    since = None if full else last_refresh()
+    if since is not None:
+        since -= WATERMARK_OVERLAP
+    days = sorted(changed_days(since))
+
+    if full:
+        DailyReport.objects.exclude(day__in=days).delete()
+    for start in range(0, len(days), days_per_batch):
+        batch = days[start:start + days_per_batch]
+        with transaction.atomic():
+            # Delete and insert rather than upsert, so a (branch, semester,
+            # exam_type) combination that no longer occurs on a day goes away.
+            DailyReport.objects.filter(day__in=batch).delete()
+            DailyReport.objects.bulk_create(build_rows(batch))
+
+    RollupWatermark.objects.update_or_create(name=WATERMARK_NAME, defaults={'value': watermark})
+    return len(days)
+
+
+def parse_day(value, default):
+    if not value:
+        return default
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'Invalid date {value!r}, expected YYYY-MM-DD')
+
+
+def _money(value):
+    return f'{value or 0:.2f}'
+
+
+def report_data(start, end, **filters):
+    """
+    Daily totals and per-branch/semester/exam-type breakdowns for
+    [start, end], read from DailyReport only. `filters` narrow the rows by
+    any of REPORT_DIMENSIONS.
+    """
+    rows = DailyReport.objects.filter(day__range=(start, end), **{
+        name: value for name, value in filters.items() if name in REPORT_DIMENSIONS and value
+    })
+    totals = Sum('registrations'), Sum('payments'), Sum('fee_total')
+
+    def grouped(field):
+        return [
+            {field: row[field], 'registrations': row['r'], 'payments': row['p'], 'fee_total': _money(row['f'])}
+            for row in rows.values(field).annotate(r=totals[0], p=totals[1], f=totals[2]).order_by(field)
+        ]
+
+    overall = rows.aggregate(r=totals[0], p=totals[1], f=totals[2])
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'refreshed_at': last_refresh(),
+        'totals': {
+            'registrations': overall['r'] or 0,
+            'payments': overall['p'] or 0,
+            'fee_total': _money(overall['f']),
+        },
+        'daily': [
+            {**row, 'day': row['day'].isoformat()}
+            for row in grouped('day')
+        ],
+        **{f'by_{name}': grouped(name) for name in REPORT_DIMENSIONS},
+    }
+
+
+def session_registrations(session):
+    """
+    Forms filed for `session` by the rollups, as of the last refresh. A form
+    belongs to the session term_for_exam() gives its exam type on the day it
+    was filed, so a winter session takes July to the next June.
+    """
+    if session.exam_type == 'winter':
+        days = (datetime.date(session.year, 7, 1), datetime.date(session.year + 1, 6, 30))
+    else:
+        days = (datetime.date(session.year, 1, 1), datetime.date(session.year, 12, 31))
+    rows = DailyReport.objects.filter(exam_type=session.exam_type, day__range=days)
+    return rows.aggregate(n=Sum('registrations'))['n'] or 0
@@ -0,0 +1,79 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+# Only these models are routed to the replica (related rows fetched from a
+# replica instance follow it there). Sessions and auth lookups always go to
+# the primary so a lagging replica can't log users out or hide a new account.
+REPORTING_MODELS = {
+    'exam_app.ExamForm', 'exam_app.Payment', 'exam_app.Attendance', 'exam_app.AttendanceSummary',
+    'exam_app.ExamSession', 'exam_app.ArchivedExamForm', 'exam_app.ArchivedPayment',
+    'exam_app.DailyReport', 'exam_app.RollupWatermark',
+}
+
+PIN_COOKIE_NAME = 'primary_pin'
+
+_reporting = ContextVar('reporting_reads', default=False)
+
+
+def reporting_alias():
+    """Return the configured replica alias, or None if no replica is configured."""
+    alias = getattr(settings, 'REPORTING_DB_ALIAS', 'replica')
+    return alias if alias in connections.settings else None
+
+
+@contextmanager
+def reporting_reads():
+    """Send reads of reporting models made inside this block to the replica."""
+    token = _reporting.set(True)
+    try:
+        yield
+    finally:
+        _reporting.reset(token)
+
+
+def is_pinned_to_primary(request):
+    """
+    True for writes and for a short window after the client's last write, so
+    a redirect straight after a POST (read-your-writes) never sees replica lag.
+    """
+    if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+        return True
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE_NAME, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def reporting_view(view_func):
+    """Run a read-only reporting view against the replica when it is safe to."""
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if is_pinned_to_primary(request):
+            return view_func(request, *args, **kwargs)
+        with reporting_reads():
+            return view_func(request, *args, **kwargs)
+    return _wrapped_view
+
+
+class ReportingReplicaRouter:
+    """
+    Route reads made under reporting_reads() to REPORTING_DB_ALIAS. Every
+    write, and every read outside a reporting block, uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _reporting.get() and model._meta.label in REPORTING_MODELS:
+            return reporting_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
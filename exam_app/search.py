@@ -0,0 +1,134 @@
+"""
+Prefix search over users for the admin, backed by a token table instead of
+LIKE '%...%' scans.
+
+Each user gets one SearchToken row per distinct word of their name,
+username, college ID, email and the subjects of their exam forms. A query
+word matches the tokens in the index range [word, next prefix), so each word
+costs one index range scan on MySQL and SQLite alike, however many users
+there are. Every word of a multi-word query must match.
+
+Single saves keep the index current through signals. Bulk writes that
+bypass save() should call index_users(), or run
+`manage.py rebuild_search_index`.
+"""
+import re
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .models import CustomUser, ExamForm, SearchToken
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+MAX_TOKEN_LENGTH = 64
+# Shorter query words match too much of the index to be worth a lookup.
+MIN_PREFIX_LENGTH = 2
+MAX_QUERY_WORDS = 5
+SEARCH_BATCH_SIZE = 2000
+
+USER_FIELDS = ('username', 'first_name', 'middle_name', 'last_name', 'email', 'college_id')
+
+
+def tokenize(*texts):
+    tokens = set()
+    for text in texts:
+        if text:
+            tokens.update(token[:MAX_TOKEN_LENGTH] for token in TOKEN_RE.findall(str(text).lower()))
+    return tokens
+
+
+def user_tokens(user, subjects=()):
+    """Tokens for a values() dict of USER_FIELDS; the full email is kept as one token too."""
+    tokens = tokenize(*(user[field] for field in USER_FIELDS), *subjects)
+    if user['email']:
+        tokens.add(user['email'].lower()[:MAX_TOKEN_LENGTH])
+    return tokens
+
+
+def index_users(user_ids, batch_size=SEARCH_BATCH_SIZE):
+    """Rebuild the tokens of the given users, one transaction per batch. Returns the tokens written."""
+    user_ids = list(user_ids)
+    written = 0
+    for start in range(0, len(user_ids), batch_size):
+        batch = user_ids[start:start + batch_size]
+        subjects = defaultdict(list)
+        for student_id, form_subjects in ExamForm.objects.filter(student_id__in=batch).values_list('student_id', 'subjects'):
+            subjects[student_id].append(form_subjects)
+        tokens = [
+            SearchToken(user_id=user['pk'], token=token)
+            for user in CustomUser.objects.filter(pk__in=batch).values('pk', *USER_FIELDS)
+            for token in user_tokens(user, subjects[user['pk']])
+        ]
+        with transaction.atomic():
+            SearchToken.objects.filter(user_id__in=batch).delete()
+            SearchToken.objects.bulk_create(tokens, batch_size=batch_size)
+        written += len(tokens)
+    return written
+
+
+def rebuild_index(batch_size=SEARCH_BATCH_SIZE):
+    """Re-index every user in primary-key order. Returns (users, tokens)."""
+    users = tokens = 0
+    last_pk = 0
+    while True:
+        batch = list(CustomUser.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return users, tokens
+        tokens += index_users(batch, batch_size)
+        users += len(batch)
+        last_pk = batch[-1]
+
+
+def query_words(query):
+    words = sorted((word for word in tokenize(query) if len(word) >= MIN_PREFIX_LENGTH), key=len, reverse=True)
+    return words[:MAX_QUERY_WORDS]
+
+
+def _prefix(word):
+    # Index range of every token starting with `word`; unlike LIKE it can use
+    # the index whatever the database's collation rules for LIKE.
+    return {'token__gte': word, 'token__lt': word[:-1] + chr(ord(word[-1]) + 1)}
+
+
+def matching_users(query):
+    """Queryset of users matching every word of `query` as a prefix (none for an empty query)."""
+    words = query_words(query)
+    users = CustomUser.objects.all()
+    if not words:
+        return users.none()
+    for word in words:
+        users = users.filter(pk__in=SearchToken.objects.filter(**_prefix(word)).values('user_id'))
+    return users
+
+
+def search_students(query, limit=10):
+    """
+    Top `limit` students for a search-as-you-type query, read off the
+    (token, user) index in order: whole-word matches (a full college ID or
+    name) come first since they sort before longer tokens, and the scan stops
+    once `limit` students are found instead of ranking every match.
+    """
+    words = query_words(query)
+    if not words:
+        return []
+    # The longest word drives the scan; the others are checked against each
+    # candidate's own few tokens rather than materialising their matches.
+    candidates = SearchToken.objects.filter(**_prefix(words[0]), user__role='student')
+    for word in words[1:]:
+        candidates = candidates.filter(Exists(SearchToken.objects.filter(user_id=OuterRef('user_id'), **_prefix(word))))
+    candidates = candidates.order_by('token', 'user_id').values_list('user_id', flat=True)
+
+    # A student can match through several tokens (name and email), so read
+    # a little ahead and drop repeats.
+    user_ids = []
+    offset, chunk_size = 0, limit * 2
+    while len(user_ids) < limit:
+        chunk = list(candidates[offset:offset + chunk_size])
+        user_ids.extend(user_id for user_id in dict.fromkeys(chunk) if user_id not in user_ids)
+        if len(chunk) < chunk_size:
+            break
+        offset += chunk_size
+    user_ids = user_ids[:limit]
+    users = CustomUser.objects.only('pk', 'username', 'first_name', 'last_name', 'email', 'college_id').in_bulk(user_ids)
+    return [users[user_id] for user_id in user_ids]
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .attendance import refresh_summaries, term_for_date
+from .models import Attendance, CustomUser, ExamForm
+from .search import USER_FIELDS, index_users
+
+
+@receiver([post_save, post_delete], sender=Attendance)
+def refresh_attendance_summary(sender, instance, raw=False, **kwargs):
+    # Single-row writes (admin edits, shell); bulk upserts refresh their own summaries.
+    if raw:
+        return
+    refresh_summaries([(instance.student_id, term_for_date(instance.date))])
+
+
+@receiver(post_save, sender=CustomUser)
+def index_user(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Logins save only last_login; skip anything that touches no indexed field.
+    if raw or (update_fields is not None and not set(update_fields) & set(USER_FIELDS)):
+        return
+    index_users([instance.pk])
+
+
+@receiver(post_save, sender=ExamForm)
+def index_form_subjects(sender, instance, raw=False, update_fields=None, **kwargs):
+    # No post_delete receiver: it would stop archive_sessions' bulk deletes
+    # from running as one query, and stale subject tokens only widen a match.
+    if raw or (update_fields is not None and 'subjects' not in update_fields):
+        return
+    index_users([instance.student_id])
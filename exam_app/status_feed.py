@@ -0,0 +1,150 @@
+"""
+Live exam form status for students, pushed as server-sent events.
+
+Each event loop (one per ASGI worker process) runs a single StatusFeed.
+While at least one student is connected it polls ExamForm for rows whose
+updated_at moved since the previous poll, and hands each change to that
+student's open streams: one query every STATUS_FEED_INTERVAL seconds per
+process, however many students are listening. The browser reloads the page
+only when a status actually changes.
+
+Streaming needs an ASGI server (see render.yaml). Under WSGI the stream view
+answers with a snapshot and a retry hint instead of holding a worker, so the
+browser's EventSource degrades to polling that tiny response.
+"""
+import asyncio
+import datetime
+import json
+import weakref
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from .models import ExamForm
+
+# A status change stamped just before a poll may commit just after it, so
+# each poll looks back this far and skips rows it has already sent.
+LATE_COMMIT_WINDOW = datetime.timedelta(seconds=10)
+
+STATUS_LABELS = dict(ExamForm.STATUS_CHOICES)
+
+_feeds = weakref.WeakKeyDictionary()
+
+
+def format_event(data, event='status'):
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+def status_payload(row):
+    return {
+        'id': row['id'],
+        'status': row['status'],
+        'status_display': STATUS_LABELS.get(row['status'], row['status']),
+        'updated_at': row['updated_at'].isoformat(),
+    }
+
+
+def student_forms(student_id):
+    return list(ExamForm.objects.filter(student_id=student_id).values('id', 'status', 'updated_at').order_by('id'))
+
+
+def changed_forms(since):
+    return list(
+        ExamForm.objects
+        .filter(updated_at__gt=since)
+        .values('id', 'student_id', 'status', 'updated_at')
+        .order_by('updated_at')
+    )
+
+
+class StatusFeed:
+    """Polls for changed forms on behalf of every stream open in this event loop."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.listeners = defaultdict(set)
+        self.task = None
+        self.polls = 0
+
+    def subscribe(self, student_id):
+        queue = asyncio.Queue()
+        self.listeners[student_id].add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.run())
+        return queue
+
+    def unsubscribe(self, student_id, queue):
+        queues = self.listeners.get(student_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.listeners[student_id]
+
+    async def run(self):
+        since = timezone.now() - LATE_COMMIT_WINDOW
+        sent = {}
+        # Stops once the last stream closes; the next subscriber restarts it.
+        while self.listeners:
+            await asyncio.sleep(self.interval)
+            if not self.listeners:
+                break
+            polled_at = timezone.now()
+            try:
+                rows = await sync_to_async(changed_forms)(since)
+            except DatabaseError:
+                # Outside the request cycle nothing else recycles a dropped
+                # connection; reconnect and retry from the same point.
+                await sync_to_async(connection.close)()
+                continue
+            self.polls += 1
+            for row in rows:
+                if sent.get(row['id']) == row['updated_at']:
+                    continue
+                sent[row['id']] = row['updated_at']
+                for queue in self.listeners.get(row['student_id'], ()):
+                    queue.put_nowait(status_payload(row))
+            since = polled_at - LATE_COMMIT_WINDOW
+            sent = {form_id: updated_at for form_id, updated_at in sent.items() if updated_at > since}
+
+
+def get_feed():
+    loop = asyncio.get_running_loop()
+    if loop not in _feeds:
+        _feeds[loop] = StatusFeed(getattr(settings, 'STATUS_FEED_INTERVAL', 2))
+    return _feeds[loop]
+
+
+def snapshot(forms, retry):
+    """Current status of each form, after a `retry` field setting the browser's reconnect delay (ms)."""
+    return f'retry: {retry}\n\n' + ''.join(format_event(status_payload(form)) for form in forms)
+
+
+async def status_events(student_id):
+    """
+    Current status of each of the student's forms, then one event per change
+    until STATUS_STREAM_MAX_SECONDS have passed. The browser reconnects right
+    away, which bounds how long a dead connection can hold a queue.
+    """
+    feed = get_feed()
+    # Subscribe before reading the snapshot so no change falls in between.
+    queue = feed.subscribe(student_id)
+    try:
+        forms = await sync_to_async(student_forms)(student_id)
+        yield snapshot(forms, getattr(settings, 'STATUS_STREAM_RETRY_MS', 3000))
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + getattr(settings, 'STATUS_STREAM_MAX_SECONDS', 300)
+        heartbeat = getattr(settings, 'STATUS_STREAM_HEARTBEAT', 25)
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                payload = await asyncio.wait_for(queue.get(), timeout=min(remaining, heartbeat))
+            except asyncio.TimeoutError:
+                # Comment line: keeps proxies from closing an idle connection.
+                yield ': keepalive\n\n'
+                continue
+            yield format_event(payload)
+    finally:
+        feed.unsubscribe(student_id, queue)
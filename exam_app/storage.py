@@ -0,0 +1,76 @@
+"""
+Media storage with signed URLs. Files whose names are content hashes
+(PUBLIC_MEDIA_PREFIXES) get plain, permanently cacheable URLs; every other
+media file - original uploads and anything private - gets a URL carrying an
+expiry and an HMAC of the path, which the serve_media view checks without
+touching the database.
+"""
+import posixpath
+import time
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.http import urlencode
+
+# Names under these prefixes are content-hashed (see exam_app.photos).
+PUBLIC_MEDIA_PREFIXES = ('profile_photos/thumbs/',)
+
+SIGNATURE_SALT = 'exam_app.storage.media'
+
+
+def media_name(path):
+    """
+    The storage name a /media/ URL path refers to, normalised, or None if it
+    has `..` segments or is absolute. Checks must run on this name, not the
+    raw path: profile_photos/thumbs/../x.jpg is not under the public prefix.
+    """
+    if '..' in path.split('/') or path.startswith('/'):
+        return None
+    name = posixpath.normpath(path)
+    return None if name in ('', '.') else name
+
+
+def is_public(name):
+    return name.startswith(PUBLIC_MEDIA_PREFIXES)
+
+
+def media_url_max_age():
+    return getattr(settings, 'MEDIA_URL_MAX_AGE', 3600)
+
+
+def sign(name, expires):
+    return salted_hmac(SIGNATURE_SALT, f'{name}:{expires}').hexdigest()[:32]
+
+
+def signed_query(name, now=None):
+    """
+    Query string granting access to `name`. Expiry is rounded up to the next
+    MEDIA_URL_MAX_AGE boundary, so a page rendered twice in the same window
+    gets the same URL and the browser cache still works. Links stay valid
+    for between one and two windows.
+    """
+    max_age = media_url_max_age()
+    now = int(now if now is not None else time.time())
+    expires = (now // max_age + 2) * max_age
+    return urlencode({'expires': expires, 'signature': sign(name, expires)})
+
+
+def check_signature(name, expires, signature, now=None):
+    """Return the seconds the link stays valid, or None if it is forged or expired."""
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return None
+    remaining = expires - int(now if now is not None else time.time())
+    if remaining <= 0 or not constant_time_compare(sign(name, expires), signature or ''):
+        return None
+    return remaining
+
+
+class SignedMediaStorage(FileSystemStorage):
+    def url(self, name):
+        url = super().url(name)
+        if name is None or is_public(name):
+            return url
+        return f'{url}?{signed_query(name)}'
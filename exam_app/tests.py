@@ -1,3 +1,1371 @@
-from django.test import TestCase
+import asyncio
+import csv
+import datetime
+import io
+import json
+import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from email.header import decode_header, make_header
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connections
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from .admission import TICKET_COOKIE, acquire_slot, release_slot
+from .attendance import attach_eligibility, term_bounds, term_for_exam, upsert_attendance
+from . import factories, health
+from .exam_sessions import active_session, session_for_exam
+from .fees import checkout_fee, expected_fees
+from .forms import ExamFormForm
+from .middleware import CompressionMiddleware, ReplicaPinningMiddleware
+from .notifications import SUBJECTS, render_batch, send_email, send_form_status_emails
+from .models import (
+    ArchivedExamForm, ArchivedPayment, Attendance, AttendanceSummary, CustomUser, DailyReport, ExamForm, ExamFormDraft,
+    ExamSession, FeeRule,
+    Payment, SearchToken,
+)
+from .reconciliation import api_rows, build_index, reconcile
+from .reports import day_bounds, refresh_reports, session_registrations
+from .search import search_students
+from .status_feed import get_feed
+from .routers import PIN_COOKIE_NAME, ReportingReplicaRouter, is_pinned_to_primary, reporting_reads
+
+STATIC_STORAGES = {
+    'default': {'BACKEND': 'exam_app.storage.SignedMediaStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+@mock.patch('exam_app.routers.reporting_alias', return_value='replica')
+class ReportingReplicaRouterTests(TestCase):
+    def setUp(self):
+        self.router = ReportingReplicaRouter()
+        self.factory = RequestFactory()
+
+    def test_reporting_reads_go_to_replica(self, _alias):
+        self.assertIsNone(self.router.db_for_read(ExamForm))
+        with reporting_reads():
+            self.assertEqual(self.router.db_for_read(ExamForm), 'replica')
+            self.assertEqual(self.router.db_for_read(Payment), 'replica')
+        self.assertIsNone(self.router.db_for_read(Payment))
+
+    def test_sessions_and_users_stay_on_primary(self, _alias):
+        with reporting_reads():
+            self.assertIsNone(self.router.db_for_read(Session))
+            self.assertIsNone(self.router.db_for_read(CustomUser))
+
+    def test_writes_always_go_to_primary(self, _alias):
+        with reporting_reads():
+            self.assertEqual(self.router.db_for_write(ExamForm), 'default')
+            self.assertEqual(self.router.db_for_write(Payment), 'default')
+
+    def test_writes_and_recent_writers_are_pinned(self, _alias):
+        self.assertTrue(is_pinned_to_primary(self.factory.post('/admin/approve/1/')))
+        self.assertFalse(is_pinned_to_primary(self.factory.get('/admin/dashboard/')))
+
+        request = self.factory.get('/admin/dashboard/')
+        request.COOKIES[PIN_COOKIE_NAME] = str(time.time() + 5)
+        self.assertTrue(is_pinned_to_primary(request))
+        request.COOKIES[PIN_COOKIE_NAME] = str(time.time() - 5)
+        self.assertFalse(is_pinned_to_primary(request))
+
+    @mock.patch('exam_app.middleware.reporting_alias', return_value='replica')
+    def test_middleware_pins_after_post(self, _middleware_alias, _alias):
+        middleware = ReplicaPinningMiddleware(lambda request: mock.MagicMock(set_cookie=mock.Mock()))
+        response = middleware(self.factory.post('/admin/approve/1/'))
+        response.set_cookie.assert_called_once()
+        self.assertEqual(response.set_cookie.call_args.args[0], PIN_COOKIE_NAME)
+
+        response = middleware(self.factory.get('/admin/dashboard/'))
+        response.set_cookie.assert_not_called()
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class ReplicaDashboardTests(TestCase):
+    # Runs when a second database is configured, e.g.
+    # DB_ENGINE=sqlite SQLITE_REPLICA_PATH=replica.sqlite3 python manage.py test
+    databases = '__all__'
+
+    def setUp(self):
+        if 'replica' not in connections.settings:
+            self.skipTest('No replica database configured')
+        self.admin = CustomUser.objects.create_user('admin', 'admin@kdkce.edu.in', 'pass', role='admin')
+        self.client.force_login(self.admin)
+
+    def test_dashboard_reads_from_replica(self):
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any('exam_app_examform' in query['sql'] for query in replica_queries))
+
+    def test_changelist_renders_from_replica(self):
+        self.admin.is_staff = self.admin.is_superuser = True
+        self.admin.save()
+        ExamForm.objects.create(student=self.admin, branch='cse', semester='5', exam_type='winter')
+        # The date hierarchy drills down to one year, then runs its dates query while rendering.
+        year = timezone.localdate().year
+        with CaptureQueriesContext(connections['default']) as primary_queries:
+            response = self.client.get(reverse('admin:exam_app_examform_changelist'), {'session': 'all', 'submitted_at__year': year})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query['sql'] for query in primary_queries if 'exam_app_examform' in query['sql']])
+
+    def test_dashboard_after_write_reads_from_primary(self):
+        self.client.cookies[PIN_COOKIE_NAME] = str(time.time() + 5)
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(replica_queries), 0)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class PaymentSuccessConcurrencyTests(TransactionTestCase):
+    DUPLICATES = 200
+    WORKERS = 20
+    MAX_LATENCY = 5.0  # seconds, for any single callback
+
+    def setUp(self):
+        self.student = CustomUser.objects.create_user('student', 'student@kdkce.edu.in', 'pass', college_id='S001')
+        self.client.force_login(self.student)
+        ExamFormDraft.objects.create(
+            student=self.student, branch='cse', semester='5', subjects='computer_networks', exam_type='winter',
+            submitted=True, razorpay_order_id='order_TEST123', fee=Decimal('100.00'),
+        )
+        self.session_key = self.client.session.session_key
+        razorpay_client = mock.patch('razorpay.Client')
+        razorpay_client.start()
+        self.addCleanup(razorpay_client.stop)
+
+    def post_callback(self, _):
+        client = Client()
+        client.cookies[settings.SESSION_COOKIE_NAME] = self.session_key
+        payload = json.dumps({
+            'razorpay_order_id': 'order_TEST123',
+            'razorpay_payment_id': 'pay_TEST123',
+            'razorpay_signature': 'signature',
+        })
+        try:
+            start_time = time.perf_counter()
+            response = client.post(reverse('payment_success'), payload, content_type='application/json')
+            return response.json(), time.perf_counter() - start_time
+        finally:
+            connections.close_all()
+
+    def test_duplicate_callbacks_create_one_form_and_payment(self):
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+            results = list(executor.map(self.post_callback, range(self.DUPLICATES)))
+
+        self.assertEqual(ExamForm.objects.count(), 1)
+        self.assertEqual(Payment.objects.count(), 1)
+        self.assertEqual(Payment.objects.get().exam_form, ExamForm.objects.get())
+        self.assertEqual([body for body, _ in results], [{'status': 'success'}] * self.DUPLICATES)
+        self.assertLess(max(latency for _, latency in results), self.MAX_LATENCY)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_replayed_callback_after_draft_cleared_is_idempotent(self):
+        first, _ = self.post_callback(None)
+        replay, _ = self.post_callback(None)
+        self.assertEqual(first, {'status': 'success'})
+        self.assertEqual(replay, {'status': 'success'})
+        self.assertEqual(ExamForm.objects.count(), 1)
+        self.assertFalse(ExamFormDraft.objects.exists())
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class AttendanceBulkTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user('admin', 'admin@kdkce.edu.in', 'pass', role='admin')
+        self.alice = CustomUser.objects.create_user('alice', 'alice@kdkce.edu.in', 'pass', college_id='CS001')
+        self.bob = CustomUser.objects.create_user('bob', 'bob@kdkce.edu.in', 'pass', college_id='CS002')
+        self.day = datetime.date(2026, 10, 19)
+        self.client.force_login(self.admin)
+
+    def attendance(self):
+        return dict(Attendance.objects.filter(date=self.day).values_list('student__college_id', 'status'))
+
+    def test_marking_page_upserts_class_day(self):
+        data = {'date': '2026-10-19', 'students': [self.alice.pk, self.bob.pk], 'present': [self.alice.pk]}
+        self.client.post(reverse('mark_attendance'), data)
+        self.assertEqual(self.attendance(), {'CS001': True, 'CS002': False})
+
+        data['present'] = [self.bob.pk]
+        self.client.post(reverse('mark_attendance'), data)
+        self.assertEqual(self.attendance(), {'CS001': False, 'CS002': True})
+
+        response = self.client.get(reverse('mark_attendance'), {'date': '2026-10-19'})
+        self.assertContains(response, '2 already marked')
+
+    def test_json_api_reports_unknown_students(self):
+        payload = {'date': '2026-10-19', 'present': ['CS001'], 'absent': ['CS002', 'CS999']}
+        response = self.client.post(reverse('attendance_bulk'), json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.json(), {'written': 2, 'unknown': ['CS999']})
+        self.assertEqual(self.attendance(), {'CS001': True, 'CS002': False})
+
+    def test_csv_import_is_idempotent(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as fh:
+            fh.write('college_id,date,status\nCS001,2026-10-19,P\nCS002,2026-10-19,A\nCS002,2026-10-19,P\nCS999,2026-10-19,P\n')
+        for _ in range(2):
+            call_command('import_attendance', fh.name, stdout=io.StringIO(), stderr=io.StringIO())
+        self.assertEqual(Attendance.objects.count(), 2)
+        self.assertEqual(self.attendance(), {'CS001': True, 'CS002': True})
+
+    def test_upsert_on_backends_without_a_conflict_target(self):
+        # MySQL's ON DUPLICATE KEY UPDATE: Django refuses unique_fields there.
+        with mock.patch.object(connections['default'].features, 'supports_update_conflicts_with_target', False):
+            self.assertEqual(upsert_attendance([(self.alice.pk, self.day, True)], refresh=False), 1)
+        self.assertEqual(self.attendance(), {'CS001': True})
+
+
+class BackupRestoreTests(TestCase):
+    def setUp(self):
+        self.backup_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.backup_dir)
+        self.form = factories.make_paid_form()
+        call_command('backup_data', self.backup_dir, stdout=io.StringIO())
+
+    def rows(self):
+        return list(Payment.objects.values_list('pk', 'exam_form__student__username', 'razorpay_order_id'))
+
+    def test_restore_upserts_over_existing_rows(self):
+        expected = self.rows()
+        Payment.objects.update(razorpay_order_id='changed')
+        call_command('restore_data', self.backup_dir, stdout=io.StringIO())
+        self.assertEqual(self.rows(), expected)
+
+    def test_restore_keeps_auto_timestamps(self):
+        submitted = timezone.make_aware(datetime.datetime(2026, 7, 11, 10, 30))
+        ExamForm.objects.update(submitted_at=submitted, updated_at=submitted)
+        Payment.objects.update(created_at=submitted)
+        call_command('backup_data', self.backup_dir, stdout=io.StringIO())
+        ExamForm.objects.all().delete()
+        call_command('restore_data', self.backup_dir, stdout=io.StringIO())
+        form = ExamForm.objects.get(pk=self.form.pk)
+        self.assertEqual((form.submitted_at, form.updated_at, form.payment.created_at), (submitted, submitted, submitted))
+
+    def test_incremental_backup_sees_backdated_attendance_and_profile_edits(self):
+        since = timezone.now()
+        student = self.form.student
+        student.email = 'renamed@kdkce.edu.in'
+        student.save()
+        upsert_attendance([(student.pk, datetime.date(2026, 7, 1), True)])
+        call_command('backup_data', self.backup_dir, f'--since={since.isoformat()}', stdout=io.StringIO())
+        with open(f'{self.backup_dir}/manifest.json') as fh:
+            models = json.load(fh)['models']
+        self.assertEqual(models['exam_app.customuser']['rows'], 1)
+        self.assertEqual(models['exam_app.attendance']['rows'], 1)
+        self.assertEqual(models['exam_app.examform']['rows'], 0)
+
+    def test_restore_on_backends_without_a_conflict_target(self):
+        expected = self.rows()
+        CustomUser.objects.all().delete()
+        # MySQL's ON DUPLICATE KEY UPDATE: Django refuses unique_fields there.
+        with mock.patch.object(connections['default'].features, 'supports_update_conflicts_with_target', False):
+            call_command('restore_data', self.backup_dir, stdout=io.StringIO())
+        self.assertEqual(self.rows(), expected)
+
+
+@override_settings(MIN_ATTENDANCE_PERCENT=75)
+class AttendanceEligibilityTests(TestCase):
+    def setUp(self):
+        self.student = CustomUser.objects.create_user('carol', 'carol@kdkce.edu.in', 'pass', college_id='CS003')
+        # Four days of the term a winter exam form filed today counts, three present: 75%
+        self.term = term_for_exam('winter')
+        start, _ = term_bounds(*self.term)
+        self.days = [start + datetime.timedelta(days=offset) for offset in range(5)]
+        upsert_attendance([(self.student.pk, day, day != self.days[0]) for day in self.days[:4]])
+
+    def summary(self):
+        year, exam_type = self.term
+        return AttendanceSummary.objects.get(student=self.student, year=year, exam_type=exam_type)
+
+    def form(self, exam_type='winter'):
+        data = {'branch': 'cse', 'semester': '3', 'subjects': ['data_structures'], 'exam_type': exam_type}
+        return ExamFormForm(data, student=self.student)
+
+    def test_summary_follows_bulk_and_single_row_writes(self):
+        self.assertEqual((self.summary().present_days, self.summary().total_days), (3, 4))
+
+        upsert_attendance([(self.student.pk, self.days[1], False)])
+        self.assertEqual(self.summary().percentage, 50.0)
+
+        Attendance.objects.get(student=self.student, date=self.days[1]).delete()
+        self.assertEqual(self.summary().percentage, 66.7)
+
+        Attendance.objects.all().delete()
+        self.assertFalse(AttendanceSummary.objects.exists())
+
+    def test_single_row_writes_on_backends_without_a_conflict_target(self):
+        dave = CustomUser.objects.create_user('dave', 'dave@kdkce.edu.in', 'pass', college_id='CS004')
+        # MySQL's ON DUPLICATE KEY UPDATE: Django refuses unique_fields there.
+        with mock.patch.object(connections['default'].features, 'supports_update_conflicts_with_target', False):
+            Attendance.objects.create(student=dave, date=self.days[0], status=True)
+        summary = AttendanceSummary.objects.get(student=dave)
+        self.assertEqual((summary.present_days, summary.total_days), (1, 1))
+
+    def test_attach_eligibility_reads_only_the_forms_students(self):
+        other = CustomUser.objects.create_user('erin', 'erin@kdkce.edu.in', 'pass', college_id='CS005')
+        upsert_attendance([(other.pk, day, True) for day in self.days])
+        form = ExamForm.objects.create(student=self.student, branch='cse', semester='3', exam_type='winter')
+        with CaptureQueriesContext(connections['default']) as queries:
+            [form] = attach_eligibility([form])
+        self.assertEqual(form.attendance_summary, self.summary())
+        self.assertTrue(form.attendance_eligible)
+        self.assertIn(f'IN ({self.student.pk})', queries[0]['sql'])
+
+    def test_rebuild_matches_incremental_summaries(self):
+        expected = list(AttendanceSummary.objects.values_list('student', 'year', 'exam_type', 'present_days', 'total_days'))
+        AttendanceSummary.objects.all().delete()
+        call_command('rebuild_attendance_summaries', stdout=io.StringIO())
+        rebuilt = list(AttendanceSummary.objects.values_list('student', 'year', 'exam_type', 'present_days', 'total_days'))
+        self.assertEqual(rebuilt, expected)
+
+    def test_exam_form_checks_term_attendance(self):
+        self.assertTrue(self.form().is_valid())
+
+        upsert_attendance([(self.student.pk, self.days[4], False)])
+        form = self.form()
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+        self.assertIn('60.0%', form.errors['exam_type'][0])
+
+        # No attendance recorded for the summer term: not blocked
+        self.assertTrue(self.form('summer').is_valid())
+
+
+def make_photo(size=(640, 480), name='photo.jpg'):
+    buf = io.BytesIO()
+    Image.new('RGB', size, (200, 120, 40)).save(buf, 'JPEG')
+    return SimpleUploadedFile(name, buf.getvalue(), content_type='image/jpeg')
+
+
+class MediaRootMixin:
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False, PROFILE_PHOTO_ASYNC=False)
+class ProfilePhotoTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = CustomUser.objects.create_user('dave', 'dave@kdkce.edu.in', 'pass', college_id='CS004')
+        self.client.force_login(self.student)
+
+    def post_photo(self, photo):
+        data = {'username': 'dave', 'email': 'dave@kdkce.edu.in', 'college_id': 'CS004', 'profile_photo': photo}
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('edit_profile'), data)
+
+    def test_upload_builds_hashed_thumbnails_after_commit(self):
+        self.post_photo(make_photo())
+        self.student.refresh_from_db()
+        for field, size in (('profile_thumbnail', 96), ('profile_thumbnail_2x', 192)):
+            name = getattr(self.student, field).name
+            self.assertRegex(name, rf'^profile_photos/thumbs/[0-9a-f]{{16}}-{size}\.webp$')
+            with Image.open(getattr(self.student, field).path) as thumb:
+                self.assertEqual(thumb.size, (size, size))
+
+    @override_settings(PROFILE_PHOTO_MAX_SIZE=1024)
+    def test_oversized_upload_is_rejected(self):
+        response = self.post_photo(make_photo(size=(1200, 1200)))
+        self.assertContains(response, 'Photo must be smaller than')
+        self.student.refresh_from_db()
+        self.assertFalse(self.student.profile_photo)
+
+
+@override_settings(STORAGES=STATIC_STORAGES)
+class ProfilePhotoBackfillTests(MediaRootMixin, TransactionTestCase):
+    def test_backfill_processes_missing_thumbnails(self):
+        student = CustomUser.objects.create_user('erin', 'erin@kdkce.edu.in', 'pass')
+        student.profile_photo.save('erin.jpg', make_photo(), save=True)
+
+        out = io.StringIO()
+        call_command('process_profile_photos', workers=2, stdout=out, stderr=io.StringIO())
+        self.assertIn('Processed 1 profile photos (0 failed)', out.getvalue())
+        student.refresh_from_db()
+        self.assertTrue(student.profile_thumbnail.name.endswith('-96.webp'))
+        self.assertTrue(student.profile_thumbnail_2x.name.endswith('-192.webp'))
+
+        out = io.StringIO()
+        call_command('process_profile_photos', stdout=out)
+        self.assertIn('No profile photos to process', out.getvalue())
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class MediaServingTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.photo = default_storage.save('profile_photos/me.jpg', ContentFile(b'0123456789' * 100))
+        self.thumb = default_storage.save('profile_photos/thumbs/abcdef0123456789-96.webp', ContentFile(b'RIFF' * 10))
+
+    def test_private_media_needs_a_valid_signature(self):
+        url = default_storage.url(self.photo)
+        self.assertIn('signature=', url)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789' * 100)
+        self.assertRegex(response['Cache-Control'], r'^private, max-age=\d+$')
+
+        self.assertEqual(self.client.get(url.replace('me.jpg', 'other.jpg')).status_code, 403)
+        self.assertEqual(self.client.get(url.split('?')[0]).status_code, 403)
+        with mock.patch('exam_app.storage.time.time', return_value=time.time() + 3 * settings.MEDIA_URL_MAX_AGE):
+            self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_hashed_media_is_public_and_immutable(self):
+        url = default_storage.url(self.thumb)
+        self.assertNotIn('?', url)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_traversal_out_of_the_public_prefix_is_refused(self):
+        direct = default_storage.url(self.photo).split('?')[0]
+        self.assertEqual(self.client.get(direct).status_code, 403)
+        for path in ('profile_photos/thumbs/../me.jpg', 'profile_photos/thumbs/./../me.jpg', 'profile_photos/thumbs/../../../etc/passwd'):
+            self.assertEqual(self.client.get(f'{settings.MEDIA_URL}{path}').status_code, 404, path)
+
+    def test_range_requests(self):
+        url = default_storage.url(self.photo)
+        response = self.client.get(url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1000')
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+
+        response = self.client.get(url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(response.streaming_content), b'56789')
+        self.assertEqual(self.client.get(url, HTTP_RANGE='bytes=5000-').status_code, 416)
+
+
+class CompressionMiddlewareTests(TestCase):
+    def compress(self, content_type):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='br, gzip')
+        response = HttpResponse('<p>Exam form submitted</p>' * 200, content_type=content_type)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_html_is_gzipped_with_breach_padding_not_brotli(self):
+        self.assertEqual(self.compress('text/html; charset=utf-8')['Content-Encoding'], 'gzip')
+
+    def test_other_responses_use_brotli(self):
+        self.assertEqual(self.compress('application/json')['Content-Encoding'], 'br')
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False, ADMISSION_MAX_IN_FLIGHT=1)
+class AdmissionControlTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = CustomUser.objects.create_user('frank', 'frank@kdkce.edu.in', 'pass', college_id='CS005')
+        self.client.force_login(self.student)
+
+    def test_excess_requests_are_queued_without_touching_the_database(self):
+        slot = acquire_slot()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('fill_exam_form'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertContains(response, 'position 1', status_code=503)
+        ticket = response.cookies[TICKET_COOKIE].value
+
+        # Same ticket on retry, so the position doesn't reset
+        response = self.client.get(reverse('fill_exam_form'))
+        self.assertEqual(response.cookies[TICKET_COOKIE].value.split(':')[0], ticket.split(':')[0])
+
+        # Other journeys are never queued, nor is the form's JSON autosave
+        self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 200)
+        response = self.client.post(reverse('exam_form_draft'), json.dumps({'branch': 'cse'}), content_type='application/json')
+        self.assertEqual(response.json()['status'], 'saved')
+
+        release_slot(slot)
+        response = self.client.get(reverse('fill_exam_form'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.cookies[TICKET_COOKIE].value, '')
+        self.assertIsNotNone(acquire_slot())
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class ExamSessionTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user('grace', 'grace@kdkce.edu.in', 'pass', role='admin')
+        self.student = CustomUser.objects.create_user('heidi', 'heidi@kdkce.edu.in', 'pass', college_id='CS006')
+        self.old = ExamSession.objects.create(year=2025, exam_type='winter')
+        self.current = ExamSession.objects.create(year=2026, exam_type='winter', is_active=True)
+        for session, count in ((self.old, 3), (self.current, 2)):
+            for i in range(count):
+                form = ExamForm.objects.create(student=self.student, branch='cse', semester='5', exam_type='winter', session=session)
+                Payment.objects.create(exam_form=form, amount=100, razorpay_order_id=f'order_{session.pk}_{i}', status='paid')
+
+    def test_admin_dashboard_defaults_to_active_session(self):
+        self.client.force_login(self.admin)
+        # Read this test's rows from the primary even when a replica is configured
+        self.client.cookies[PIN_COOKIE_NAME] = str(time.time() + 60)
+        response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.context['total_forms'], 2)
+        self.assertContains(response, 'Winter 2026 Exam Forms')
+
+        response = self.client.get(reverse('admin_dashboard'), {'session': 'all'})
+        self.assertEqual(response.context['total_forms'], 5)
+
+    def test_a_new_term_becomes_the_active_session(self):
+        # Late winter forms belong to last year's winter; an older new term stays inactive.
+        self.assertEqual(session_for_exam('winter', datetime.date(2026, 3, 1)), self.old)
+        self.assertFalse(session_for_exam('summer', datetime.date(2024, 3, 1)).is_active)
+
+        new = session_for_exam('summer', datetime.date(2027, 2, 1))
+        form = ExamForm.objects.create(student=self.student, branch='cse', semester='6', exam_type='summer', session=new)
+        Payment.objects.create(exam_form=form, amount=100, razorpay_order_id='order_new_term', status='paid')
+        self.assertEqual(active_session(), new)
+        self.assertFalse(ExamSession.objects.get(pk=self.current.pk).is_active)
+
+        self.client.force_login(self.admin)
+        self.client.cookies[PIN_COOKIE_NAME] = str(time.time() + 60)
+        response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.context['total_forms'], 1)
+        self.assertContains(response, 'Summer 2027 Exam Forms')
+
+    def test_archive_moves_closed_sessions_in_chunks(self):
+        with self.assertRaises(CommandError):
+            call_command('archive_sessions', '2026-winter', stdout=io.StringIO())
+
+        form_ids = set(ExamForm.objects.filter(session=self.old).values_list('pk', flat=True))
+        out = io.StringIO()
+        call_command('archive_sessions', '2025-winter', close=True, chunk_size=2, stdout=out)
+        self.assertIn('Winter 2025: archived 3 forms', out.getvalue())
+
+        self.assertFalse(ExamForm.objects.filter(session=self.old).exists())
+        self.assertEqual(set(ArchivedExamForm.objects.values_list('pk', flat=True)), form_ids)
+        self.assertEqual(ArchivedPayment.objects.count(), 3)
+        self.assertEqual(Payment.objects.count(), 2)
+        self.old.refresh_from_db()
+        self.assertIsNotNone(self.old.archived_at)
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class ReportTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user('ivan', 'ivan@kdkce.edu.in', 'pass', role='admin')
+        self.student = CustomUser.objects.create_user('judy', 'judy@kdkce.edu.in', 'pass', college_id='CS007')
+        self.session = ExamSession.objects.create(year=2026, exam_type='winter', is_active=True)
+        self.day1, self.day2 = datetime.date(2026, 10, 1), datetime.date(2026, 10, 2)
+        self.pay('cse', '5', self.day1, 'o1')
+        self.pay('cse', '5', self.day1, 'o2')
+        self.pay('mech', '3', self.day2, 'o3')
+
+    def pay(self, branch, semester, day, order_id, amount=100):
+        at = day_bounds(day)[0] + datetime.timedelta(hours=10) if day else timezone.now()
+        form = ExamForm.objects.create(student=self.student, branch=branch, semester=semester, exam_type='winter', session=self.session)
+        ExamForm.objects.filter(pk=form.pk).update(submitted_at=at)
+        Payment.objects.create(exam_form=form, amount=amount, razorpay_order_id=order_id, status='paid', paid_at=at)
+        return form
+
+    def test_refresh_only_recomputes_changed_days(self):
+        self.assertEqual(refresh_reports(), 2)
+        cse = DailyReport.objects.get(day=self.day1, branch='cse')
+        self.assertEqual((cse.registrations, cse.payments, cse.fee_total), (2, 2, 200))
+
+        self.assertEqual(refresh_reports(), 0)
+        self.pay('cse', '5', None, 'o4', amount=150)
+        self.assertEqual(refresh_reports(), 1)
+        self.assertEqual(DailyReport.objects.get(day=timezone.localdate()).fee_total, 150)
+
+        # Archived sessions still count after a full rebuild.
+        self.session.is_active = False
+        self.session.closed_at = timezone.now()
+        self.session.save()
+        call_command('archive_sessions', '2026-winter', stdout=io.StringIO())
+        call_command('refresh_reports', full=True, stdout=io.StringIO())
+        self.assertEqual(DailyReport.objects.get(day=self.day1, branch='cse').fee_total, 200)
+        self.assertEqual(DailyReport.objects.count(), 3)
+
+    def test_session_registrations_follow_the_filing_term(self):
+        DailyReport.objects.create(day=datetime.date(2026, 3, 1), exam_type='winter', registrations=50)  # Winter 2025
+        DailyReport.objects.create(day=datetime.date(2026, 8, 1), exam_type='summer', registrations=40)
+        DailyReport.objects.create(day=datetime.date(2027, 2, 1), exam_type='winter', registrations=5)  # late winter forms
+        refresh_reports()
+        self.assertEqual(session_registrations(self.session), 8)
+        self.assertEqual(session_registrations(ExamSession(year=2026, exam_type='summer')), 40)
+
+    def test_reports_api_reads_only_rollups(self):
+        refresh_reports()
+        self.client.force_login(self.admin)
+        self.client.cookies[PIN_COOKIE_NAME] = str(time.time() + 60)
+        with CaptureQueriesContext(connections['default']) as queries:
+            response = self.client.get(reverse('reports_data'), {'start': '2026-10-01', 'end': '2026-10-31', 'branch': 'cse'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['totals'], {'registrations': 2, 'payments': 2, 'fee_total': '200.00'})
+        self.assertEqual([row['day'] for row in data['daily']], ['2026-10-01'])
+        self.assertFalse([q for q in queries if 'exam_app_examform' in q['sql'] or 'exam_app_payment' in q['sql']])
+
+        self.assertEqual(self.client.get(reverse('reports_data'), {'start': 'yesterday'}).status_code, 400)
+        response = self.client.get(reverse('reports'), {'start': '2026-10-01', 'end': '2026-10-31'})
+        self.assertContains(response, '₹300.00')
+
+        self.client.force_login(self.student)
+        self.assertEqual(self.client.get(reverse('reports_data')).status_code, 403)
+
+
+@override_settings(
+    STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False, STATUS_FEED_INTERVAL=0.05, STATUS_STREAM_MAX_SECONDS=1, STATUS_STREAM_HEARTBEAT=0.5,
+)
+class StatusStreamTests(TransactionTestCase):
+    def setUp(self):
+        self.student = CustomUser.objects.create_user('ken', 'ken@kdkce.edu.in', 'pass', college_id='CS008')
+        self.other = CustomUser.objects.create_user('lena', 'lena@kdkce.edu.in', 'pass', college_id='CS009')
+        self.form = ExamForm.objects.create(student=self.student, branch='cse', semester='5', exam_type='winter')
+        self.other_form = ExamForm.objects.create(student=self.other, branch='cse', semester='5', exam_type='winter')
+
+    def test_wsgi_falls_back_to_snapshot_polling(self):
+        self.client.force_login(self.student)
+        response = self.client.get(reverse('status_stream'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertIn(b'retry: 30000', response.content)
+        self.assertIn(f'"id": {self.form.pk}, "status": "pending"'.encode(), response.content)
+        self.assertNotIn(f'"id": {self.other_form.pk},'.encode(), response.content)
+
+    async def test_stream_pushes_only_own_status_changes(self):
+        await self.async_client.aforce_login(self.student)
+        response = await self.async_client.get(reverse('status_stream'))
+        events = aiter(response.streaming_content)
+        self.assertIn(b'"status": "pending"', await anext(events))
+
+        await ExamForm.objects.filter(pk=self.other_form.pk).aupdate(status='rejected', updated_at=timezone.now())
+        await ExamForm.objects.filter(pk=self.form.pk).aupdate(status='approved', updated_at=timezone.now())
+        event = await asyncio.wait_for(anext(events), timeout=5)
+        self.assertIn(f'"id": {self.form.pk}, "status": "approved"'.encode(), event)
+
+        # One poller per event loop, stopped once the last stream ends.
+        feed = get_feed()
+        self.assertEqual(list(feed.listeners), [self.student.pk])
+        remaining = [part async for part in events]
+        self.assertEqual(remaining, [b': keepalive\n\n'] * len(remaining))
+        await asyncio.wait_for(feed.task, timeout=5)
+        self.assertFalse(feed.listeners)
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class AdminDashboardChangesTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user('mallory', 'mallory@kdkce.edu.in', 'pass', role='admin')
+        self.student = CustomUser.objects.create_user('nina', 'nina@kdkce.edu.in', 'pass', college_id='CS010')
+        self.session = ExamSession.objects.create(year=2026, exam_type='winter', is_active=True)
+        self.old = ExamSession.objects.create(year=2025, exam_type='winter')
+        self.pending = ExamForm.objects.create(student=self.student, branch='cse', semester='5', exam_type='winter', session=self.session)
+        self.client.force_login(self.admin)
+        self.client.cookies[PIN_COOKIE_NAME] = str(time.time() + 60)
+
+    def changes(self, cursor, **params):
+        return self.client.get(reverse('admin_dashboard_changes'), {'cursor': cursor, **params})
+
+    def test_returns_only_rows_changed_since_cursor(self):
+        cursor = self.client.get(reverse('admin_dashboard')).context['cursor']
+        # Outside the late-commit window, so not sent again.
+        ExamForm.objects.filter(pk=self.pending.pk).update(updated_at=timezone.now() - datetime.timedelta(minutes=5))
+        self.assertEqual(self.changes(cursor).json()['forms'], [])
+
+        new = ExamForm.objects.create(student=self.student, branch='cse', semester='5', exam_type='winter', session=self.session)
+        ExamForm.objects.create(student=self.student, branch='cse', semester='5', exam_type='winter', session=self.old)
+        data = self.changes(cursor).json()
+        self.assertEqual([form['id'] for form in data['forms']], [new.pk])
+        self.assertIn(f'data-form-id="{new.pk}"', data['forms'][0]['html'])
+        self.assertEqual(data['stats'], {'total_forms': 2, 'pending_forms': 2, 'approved_forms': 0, 'rejected_forms': 0})
+        self.assertGreater(data['cursor'], cursor)
+
+        self.assertEqual(len(self.changes(cursor, session='all').json()['forms']), 2)
+
+    def test_rejects_bad_cursor_and_students(self):
+        self.assertEqual(self.changes('soon').status_code, 400)
+        self.client.force_login(self.student)
+        self.assertEqual(self.changes(timezone.now().isoformat()).status_code, 403)
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user('olga', 'olga@kdkce.edu.in', 'pass', role='admin', is_staff=True, is_superuser=True)
+        self.ada = CustomUser.objects.create_user('ada', 'ada.l@kdkce.edu.in', 'pass', first_name='Ada', last_name='Lovelace', college_id='CS0101')
+        self.alan = CustomUser.objects.create_user('alan', 'alan@kdkce.edu.in', 'pass', first_name='Alan', last_name='Turing', college_id='CS01')
+        self.form = ExamForm.objects.create(student=self.ada, branch='cse', semester='5', exam_type='winter', subjects='computer_networks,software_engineering')
+
+    def test_index_follows_saves_and_ranks_whole_words_first(self):
+        self.assertEqual([s.pk for s in search_students('cs01')], [self.alan.pk, self.ada.pk])
+        self.assertEqual([s.pk for s in search_students('netw lov')], [self.ada.pk])
+        self.assertEqual([s.pk for s in search_students('ada.l@kdkce.edu.in')], [self.ada.pk])
+        self.assertEqual(search_students('a'), [])
+
+        self.alan.last_name = 'Kay'
+        self.alan.save()
+        self.assertEqual(search_students('turing'), [])
+        tokens = SearchToken.objects.count()
+        self.alan.save(update_fields=['last_login'])
+        self.assertEqual(SearchToken.objects.count(), tokens)
+
+        SearchToken.objects.all().delete()
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        self.assertEqual(SearchToken.objects.count(), tokens)
+
+    def test_admin_search_endpoint_and_changelist(self):
+        self.client.force_login(self.admin)
+        self.client.cookies[PIN_COOKIE_NAME] = str(time.time() + 60)
+        results = self.client.get(reverse('admin_search'), {'q': 'love'}).json()['results']
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['college_id'], 'CS0101')
+        self.assertEqual(results[0]['latest_form']['id'], self.form.pk)
+
+        response = self.client.get(reverse('admin:exam_app_examform_changelist'), {'q': 'lovelace', 'session': 'all'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.form])
+
+        self.client.force_login(self.ada)
+        self.assertEqual(self.client.get(reverse('admin_search'), {'q': 'ada'}).status_code, 403)
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user('olga', 'olga@kdkce.edu.in', 'pass', role='admin', is_staff=True, is_superuser=True)
+        self.client.force_login(self.admin)
+        self.client.cookies[PIN_COOKIE_NAME] = str(time.time() + 60)
+
+    def add_forms(self, count):
+        forms = []
+        for _ in range(count):
+            n = CustomUser.objects.count()
+            student = CustomUser.objects.create_user(f'st{n}', f'st{n}@kdkce.edu.in', 'pass', college_id=f'CS{n:04d}')
+            form = ExamForm.objects.create(student=student, branch='cse', semester='5', exam_type='winter')
+            Payment.objects.create(exam_form=form, amount=100, razorpay_order_id=f'order_{n}')
+            forms.append(form)
+        return forms
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connections['default']) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        urls = [reverse('admin:exam_app_examform_changelist'), reverse('admin:exam_app_payment_changelist')]
+        self.add_forms(2)
+        before = [self.changelist_queries(url) for url in urls]
+        self.add_forms(5)
+        self.assertEqual([self.changelist_queries(url) for url in urls], before)
+
+    def test_estimated_count_only_for_unfiltered_lists(self):
+        self.add_forms(3)
+        url = reverse('admin:exam_app_payment_changelist')
+        with mock.patch('exam_app.admin._estimated_row_count', return_value=120000):
+            self.assertEqual(self.client.get(url).context['cl'].result_count, 120000)
+            self.assertEqual(self.client.get(url, {'status': 'pending'}).context['cl'].result_count, 3)
+
+    def test_default_session_view_is_estimated_from_the_rollups(self):
+        session = ExamSession.objects.create(year=2026, exam_type='winter', is_active=True)
+        self.add_forms(3)
+        ExamForm.objects.update(session=session)
+        url = reverse('admin:exam_app_examform_changelist')
+        with mock.patch('exam_app.admin.session_registrations', return_value=120000), \
+                mock.patch('exam_app.admin.active_session', wraps=active_session) as lookup:
+            self.assertEqual(self.client.get(url).context['cl'].result_count, 120000)
+            self.assertEqual(lookup.call_count, 1)
+            self.assertEqual(self.client.get(reverse('admin:exam_app_payment_changelist')).context['cl'].result_count, 120000)
+            self.assertEqual(self.client.get(url, {'status': 'pending'}).context['cl'].result_count, 3)
+            self.assertEqual(self.client.get(url, {'session': session.pk}).context['cl'].result_count, 3)
+
+    def test_bulk_actions(self):
+        approve, reject, other = self.add_forms(3)
+        stamped = ExamForm.objects.get(pk=approve.pk).updated_at
+        url = reverse('admin:exam_app_examform_changelist')
+        self.client.post(url, {'action': 'approve_forms', '_selected_action': [approve.pk]})
+        self.client.post(url, {'action': 'reject_forms', '_selected_action': [reject.pk]})
+
+        approve.refresh_from_db()
+        self.assertEqual(approve.status, 'approved')
+        self.assertIsNotNone(approve.approved_at)
+        self.assertGreater(approve.updated_at, stamped)
+        self.assertEqual(ExamForm.objects.get(pk=reject.pk).status, 'rejected')
+        self.assertEqual(ExamForm.objects.get(pk=other.pk).status, 'pending')
+        self.assertEqual([m.to for m in mail.outbox], [[approve.student.email], [reject.student.email]])
+
+        self.client.post(reverse('admin:exam_app_payment_changelist'), {
+            'action': 'mark_paid', '_selected_action': [approve.payment.pk],
+        })
+        payment = Payment.objects.get(pk=approve.payment.pk)
+        self.assertEqual(payment.status, 'paid')
+        self.assertIsNotNone(payment.paid_at)
+
+    @override_settings(ADMIN_STATUS_EMAIL_LIMIT=1)
+    def test_bulk_actions_over_the_email_limit_leave_sending_to_the_command(self):
+        session = ExamSession.objects.create(year=2026, exam_type='winter')
+        forms = self.add_forms(2)
+        ExamForm.objects.update(session=session)
+        response = self.client.post(reverse('admin:exam_app_examform_changelist'), {
+            'action': 'reject_forms', '_selected_action': [form.pk for form in forms],
+        }, follow=True)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(ExamForm.objects.filter(status='rejected').count(), 2)
+        message = str(list(response.context['messages'])[0])
+        self.assertIn(f'send_status_emails --session {session.pk} --status rejected --since ', message)
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class NotificationTests(TransactionTestCase):
+    def setUp(self):
+        self.session = ExamSession.objects.create(year=2026, exam_type='winter', is_active=True)
+        self.forms = []
+        for n, status in enumerate(['approved', 'approved', 'rejected']):
+            student = CustomUser.objects.create_user(f'st{n}', f'st{n}@kdkce.edu.in', 'pass', first_name=f'Student{n}')
+            self.forms.append(ExamForm.objects.create(
+                student=student, branch='cse', semester='5', exam_type='winter', subjects='computer_networks,compiler_design',
+                status=status, approved_at=timezone.now() if status == 'approved' else None, session=self.session,
+            ))
+
+    def test_status_emails_are_multipart_and_batched(self):
+        stats = send_form_status_emails(self.forms, 'https://exams.example.edu/student/dashboard/')
+        self.assertEqual(sorted((s.kind, s.sent) for s in stats), [('form_approved', 2), ('form_rejected', 1)])
+        approved, _, rejected = mail.outbox
+        self.assertEqual(str(make_header(decode_header(approved.subject))), '🎉 Exam Form Approved - Action Required')
+        self.assertIn('Dear Student0', approved.body)
+        self.assertIn('https://exams.example.edu/student/dashboard/', approved.body)
+        self.assertEqual(approved.alternatives[0][1], 'text/html')
+        self.assertIn('<strong>Student0</strong>', approved.alternatives[0][0])
+        self.assertEqual(rejected.subject, 'Exam Form Rejected')
+        self.assertEqual(rejected.alternatives, [])
+
+        send_email('form_submitted', {'user_name': 'Ada', 'subjects': 'computer_networks,compiler_design'}, 'ada@kdkce.edu.in')
+        self.assertIn('2. compiler_design', mail.outbox[-1].body)
+
+    def test_pool_renders_like_one_process(self):
+        contexts = [{'user_name': f'Student {i}', 'form_id': i, 'approved_at': 'today'} for i in range(6)]
+        serial, _ = render_batch('form_approved', contexts, workers=1)
+        with mock.patch('exam_app.notifications.POOL_THRESHOLD', 0), mock.patch('exam_app.notifications.RENDER_CHUNK_SIZE', 4):
+            pooled, stats = render_batch('form_approved', contexts, workers=2)
+        self.assertEqual(stats.workers, 2)
+        self.assertEqual(pooled, serial)
+
+    def test_send_status_emails_command(self):
+        out = io.StringIO()
+        call_command('send_status_emails', '--dry-run', '--workers=1', stdout=out)
+        self.assertIn('form_approved: rendered 2', out.getvalue())
+        self.assertEqual(mail.outbox, [])
+        call_command('send_status_emails', '--status=rejected', '--workers=1', stdout=io.StringIO())
+        self.assertEqual([m.to for m in mail.outbox], [['st2@kdkce.edu.in']])
+
+    def test_send_status_emails_since_and_links(self):
+        # Rejections have no approved_at: --since goes by when they last changed.
+        since = timezone.now()
+        ExamForm.objects.filter(pk=self.forms[2].pk).update(updated_at=since - datetime.timedelta(hours=1))
+        call_command('send_status_emails', '--status=rejected', f'--since={since.isoformat()}', '--workers=1', stdout=io.StringIO())
+        self.assertEqual(mail.outbox, [])
+        ExamForm.objects.filter(pk=self.forms[2].pk).update(updated_at=since)
+        call_command('send_status_emails', '--status=rejected', f'--since={since.isoformat()}', '--workers=1', stdout=io.StringIO())
+        self.assertEqual([m.to for m in mail.outbox], [['st2@kdkce.edu.in']])
+
+        # Links default to the current Site; a relative URL is refused.
+        call_command('send_status_emails', '--workers=1', stdout=io.StringIO())
+        self.assertIn('http://example.com/student/dashboard/', mail.outbox[-1].body)
+        with self.assertRaises(CommandError):
+            call_command('send_status_emails', '--dashboard-url=/student/dashboard/', stdout=io.StringIO())
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class FeeScheduleTests(TestCase):
+    form_data = {'branch': 'cse', 'semester': '5', 'subjects': 'computer_networks,compiler_design,software_engineering', 'exam_type': 'winter'}
+
+    def test_rules_add_up_and_changes_are_picked_up(self):
+        # Seeded by the migration: the flat fee the views used to hardcode.
+        self.assertEqual(checkout_fee(self.form_data), Decimal('100.00'))
+
+        FeeRule.objects.create(name='CSE lab fee', branch='cse', per_subject=Decimal('20.00'), min_subjects=3)
+        FeeRule.objects.create(name='Late fee', exam_type='winter', amount=Decimal('50.00'),
+                               starts_on=datetime.date(2026, 11, 1), ends_on=datetime.date(2026, 11, 15))
+        FeeRule.objects.create(name='Summer only', exam_type='summer', amount=Decimal('999.00'))
+        self.assertEqual(checkout_fee(self.form_data, datetime.date(2026, 10, 1)), Decimal('160.00'))
+        self.assertEqual(checkout_fee(self.form_data, datetime.date(2026, 11, 2)), Decimal('210.00'))
+        self.assertEqual(checkout_fee({**self.form_data, 'subjects': 'compiler_design'}, datetime.date(2026, 10, 1)), Decimal('100.00'))
+
+        FeeRule.objects.filter(name='CSE lab fee').update(is_active=False, updated_at=timezone.now())
+        self.assertEqual(checkout_fee(self.form_data, datetime.date(2026, 10, 1)), Decimal('100.00'))
+
+        form = ExamForm.objects.create(student=CustomUser.objects.create_user('st', 'st@kdkce.edu.in', 'pass'), **self.form_data)
+        self.assertEqual(expected_fees(ExamForm.objects.all()), {form.pk: checkout_fee(self.form_data)})
+
+    @mock.patch('razorpay.Client')
+    def test_checkout_charges_and_records_the_scheduled_fee(self, razorpay_client):
+        razorpay_client.return_value.order.create.return_value = {'id': 'order_FEE1'}
+        FeeRule.objects.create(name='Per subject', per_subject=Decimal('12.50'))
+        student = CustomUser.objects.create_user('st', 'st@kdkce.edu.in', 'pass')
+        self.client.force_login(student)
+        ExamFormDraft.objects.create(student=student, submitted=True, **self.form_data)
+
+        response = self.client.get(reverse('payment'))
+        self.assertEqual(razorpay_client.return_value.order.create.call_args.kwargs['data']['amount'], 13750)
+        self.assertContains(response, '"amount": "13750"')
+
+        FeeRule.objects.all().update(amount=Decimal('1.00'), updated_at=timezone.now())
+        self.client.post(reverse('payment_success'), json.dumps({
+            'razorpay_order_id': 'order_FEE1', 'razorpay_payment_id': 'pay_FEE1', 'razorpay_signature': 'sig',
+        }), content_type='application/json')
+        self.assertEqual(Payment.objects.get().amount, Decimal('137.50'))
+        self.assertIn('137.50', mail.outbox[-1].body)
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class ReconciliationTests(TestCase):
+    def setUp(self):
+        student = CustomUser.objects.create_user('st', 'st@kdkce.edu.in', 'pass')
+        now = timezone.now()
+        for n, status, payment_id in [(1, 'paid', 'pay_1'), (2, 'paid', 'pay_2'), (3, 'paid', 'pay_3'), (4, 'pending', None)]:
+            form = ExamForm.objects.create(student=student, branch='cse', semester='5', exam_type='winter', subjects='compiler_design')
+            Payment.objects.create(exam_form=form, amount=Decimal('100.00'), razorpay_order_id=f'order_{n}', razorpay_payment_id=payment_id,
+                                   status=status, paid_at=now if status == 'paid' else None)
+        self.orphan = ExamForm.objects.create(student=student, branch='cse', semester='5', exam_type='winter')
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_settlement_csv(self):
+        path = f'{self.tmp}/settlement.csv'
+        with open(path, 'w', newline='') as f:
+            f.write('entity_id,type,amount,order_id\n'
+                    'pay_1,payment,100.00,order_1\n'
+                    'pay_2,payment,150.00,order_2\n'
+                    'pay_4,payment,100.00,order_4\n'
+                    'rfnd_1,refund,100.00,\n'
+                    'pay_9,payment,100.00,order_9\n'
+                    'pay_1,payment,100.00,order_1\n')
+        out, err = io.StringIO(), io.StringIO()
+        call_command('reconcile_payments', path, '--check-fees', stdout=out, stderr=err)
+
+        issues = sorted((row['issue'], row['payment_id'] or row['exam_form_id']) for row in csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(issues, [
+            ('amount_mismatch', 'pay_2'), ('duplicate', 'pay_1'), ('gateway_only', 'pay_9'),
+            ('missing_settlement', 'pay_3'), ('orphan_form', str(self.orphan.pk)), ('status_mismatch', 'pay_4'),
+        ])
+        self.assertIn('Read 5 gateway records, matched 3', err.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('reconcile_payments', stdout=out, stderr=err)
+
+    def test_api_pages(self):
+        pages = [
+            {'items': [{'id': 'pay_1', 'order_id': 'order_1', 'amount': 10000, 'status': 'captured'},
+                       {'id': 'pay_2', 'order_id': 'order_2', 'amount': 10000, 'status': 'captured'}]},
+            {'items': [{'id': 'pay_5', 'order_id': 'order_5', 'amount': 10000, 'status': 'failed'}]},
+        ]
+        client = mock.Mock()
+        client.payment.all.side_effect = pages
+        since = timezone.now() - datetime.timedelta(days=1)
+        records = list(api_rows(client, since, timezone.now(), page_size=2))
+        self.assertEqual([r[0] for r in records], ['pay_1', 'pay_2', 'pay_5'])
+        self.assertEqual(records[0][2], Decimal('100.00'))
+        self.assertEqual([c.args[0]['skip'] for c in client.payment.all.call_args_list], [0, 2])
+
+        issues = []
+        counts = reconcile(records, build_index(), issues.append, since=since)
+        self.assertEqual(counts['matched'], 2)
+        self.assertEqual(sorted(i['issue'] for i in issues), ['missing_settlement', 'orphan_form'])
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class ExamFormDraftTests(TestCase):
+    def setUp(self):
+        self.student = CustomUser.objects.create_user('st', 'st@kdkce.edu.in', 'pass')
+        self.client.force_login(self.student)
+
+    def autosave(self, **changes):
+        return self.client.post(reverse('exam_form_draft'), json.dumps(changes), content_type='application/json')
+
+    def test_autosave_applies_partial_updates_and_validates(self):
+        self.assertEqual(self.client.get(reverse('exam_form_draft')).json(), {'draft': None})
+        self.assertEqual(self.autosave(branch='cse', semester='5').json()['status'], 'saved')
+        self.autosave(subjects=['computer_networks', 'software_engineering'])
+        self.autosave(exam_type='winter')
+        draft = self.client.get(reverse('exam_form_draft')).json()['draft']
+        self.assertEqual(draft, {
+            'branch': 'cse', 'semester': '5', 'subjects': ['computer_networks', 'software_engineering'],
+            'exam_type': 'winter', 'submitted': False,
+        })
+
+        self.assertEqual(self.autosave(branch='nope').status_code, 400)
+        self.assertEqual(self.autosave(subjects=['not_a_subject']).status_code, 400)
+        self.assertEqual(self.autosave(fee='0').status_code, 400)
+        self.assertEqual(ExamFormDraft.objects.get().branch, 'cse')
+
+        # Switching semester keeps only the subjects it still offers.
+        self.autosave(semester='6')
+        self.assertEqual(ExamFormDraft.objects.get().subjects, '')
+        self.assertEqual(ExamFormDraft.objects.count(), 1)
+
+    def test_first_autosaves_from_two_tabs_do_not_collide(self):
+        # The other tab's first autosave creates the draft after this one found none.
+        ExamFormDraft.objects.create(student=self.student, branch='cse')
+        with mock.patch('exam_app.drafts.draft_for', return_value=None):
+            self.assertEqual(self.autosave(semester='5').json()['status'], 'saved')
+        draft = ExamFormDraft.objects.get()
+        self.assertEqual((draft.branch, draft.semester), ('cse', '5'))
+
+    @mock.patch('razorpay.Client')
+    def test_draft_survives_a_new_session_and_reuses_its_order(self, razorpay_client):
+        razorpay_client.return_value.order.create.return_value = {'id': 'order_DRAFT1'}
+        self.client.post(reverse('fill_exam_form'), {
+            'branch': 'cse', 'semester': '5', 'subjects': ['computer_networks'], 'exam_type': 'winter',
+        })
+        self.assertTrue(ExamFormDraft.objects.get().submitted)
+
+        # Log in again: the old session and everything in it is gone.
+        self.client.logout()
+        self.client.force_login(self.student)
+        self.assertContains(self.client.get(reverse('student_dashboard')), 'awaiting payment')
+        self.assertContains(self.client.get(reverse('fill_exam_form')), '["computer_networks"]')
+        self.assertContains(self.client.get(reverse('payment')), 'order_DRAFT1')
+        self.client.get(reverse('payment'))
+        self.assertEqual(razorpay_client.return_value.order.create.call_count, 1)
+
+        # Editing the draft withdraws it from payment until it is submitted again.
+        self.autosave(exam_type='summer')
+        draft = ExamFormDraft.objects.get()
+        self.assertEqual((draft.submitted, draft.razorpay_order_id, draft.fee), (False, '', None))
+        self.assertRedirects(self.client.get(reverse('payment')), reverse('fill_exam_form'))
+
+    @mock.patch('razorpay.Client')
+    def test_editing_during_checkout_records_what_the_order_paid_for(self, razorpay_client):
+        FeeRule.objects.create(name='Per subject', per_subject=Decimal('50.00'))
+        razorpay_client.return_value.order.create.side_effect = [{'id': 'order_OLD'}, {'id': 'order_NEW'}]
+        subjects = ['computer_networks', 'software_engineering']
+        old_fee, new_fee = (
+            checkout_fee({'branch': 'cse', 'semester': '5', 'subjects': ','.join(chosen), 'exam_type': 'winter'})
+            for chosen in (subjects, subjects[:1])
+        )
+        self.assertNotEqual(old_fee, new_fee)
+        self.client.post(reverse('fill_exam_form'), {'branch': 'cse', 'semester': '5', 'subjects': subjects, 'exam_type': 'winter'})
+        self.assertContains(self.client.get(reverse('payment')), 'order_OLD')
+
+        def pay(order_id):
+            return self.client.post(reverse('payment_success'), json.dumps({
+                'razorpay_order_id': order_id, 'razorpay_payment_id': f'pay_{order_id}', 'razorpay_signature': 'sig',
+            }), content_type='application/json').json()
+
+        # Another tab edits the form while Razorpay checkout is open; the old order is still paid.
+        self.autosave(subjects=subjects[:1])
+        self.assertEqual(pay('order_OLD'), {'status': 'success'})
+        paid = Payment.objects.get(razorpay_order_id='order_OLD')
+        self.assertEqual((paid.exam_form.subjects, paid.amount), (','.join(subjects), old_fee))
+        # The edited draft is kept for the student to submit separately.
+        self.assertEqual(ExamFormDraft.objects.get().subjects, subjects[0])
+
+        # Re-submitting before paying the old order: each order records its own contents and fee.
+        self.client.post(reverse('fill_exam_form'), {'branch': 'cse', 'semester': '5', 'subjects': subjects[:1], 'exam_type': 'winter'})
+        self.assertContains(self.client.get(reverse('payment')), 'order_NEW')
+        self.assertEqual(pay('order_NEW'), {'status': 'success'})
+        paid = Payment.objects.get(razorpay_order_id='order_NEW')
+        self.assertEqual((paid.exam_form.subjects, paid.amount), (subjects[0], new_fee))
+        self.assertFalse(ExamFormDraft.objects.exists())
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=True, ALLOWED_HOSTS=['exam.example.com'])
+class HealthCheckTests(TestCase):
+    def setUp(self):
+        health._db_check = None
+        cache.clear()
+
+    def test_probes_skip_redirect_host_check_and_session(self):
+        # Probes come over plain HTTP with an internal Host header.
+        with self.assertNumQueries(0):
+            response = self.client.get('/healthz', HTTP_HOST='10.0.0.5:10000')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'ok')
+        self.assertNotIn('database', response.json())
+        self.assertFalse(response.cookies)
+        self.assertEqual(self.client.get('/student/dashboard/', HTTP_HOST='exam.example.com').status_code, 301)
+
+    def test_readiness_checks_the_database_once_per_interval(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/readyz', HTTP_HOST='10.0.0.5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['database'], 'ok')
+        self.assertEqual(response.json()['admission'], {'in_flight': 0, 'max': settings.ADMISSION_MAX_IN_FLIGHT})
+        with self.assertNumQueries(0):
+            self.client.get('/readyz', HTTP_HOST='10.0.0.5')
+
+        health._db_check = None
+        with mock.patch('exam_app.health.connections') as db:
+            db.__getitem__.return_value.cursor.side_effect = OperationalError('server has gone away')
+            response = self.client.get('/readyz', HTTP_HOST='10.0.0.5')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['database'], 'server has gone away')
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class ReleaseTests(TestCase):
+    def release(self):
+        out = io.StringIO()
+        call_command('release', stdout=out, verbosity=0)
+        return out.getvalue()
+
+    def test_static_files_are_collected_only_when_their_sources_change(self):
+        sources, static_root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, sources)
+        self.addCleanup(shutil.rmtree, static_root)
+        with open(f'{sources}/release.css', 'w') as f:
+            f.write('body { color: red; }')
+        storages = {**STATIC_STORAGES, 'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'}}
+
+        with self.settings(STATIC_ROOT=static_root, STATICFILES_DIRS=[sources], STORAGES=storages):
+            first = self.release()
+            self.assertIn('No migrations to apply', first)
+            self.assertIn('collecting all static files', first)
+            self.assertIn('Static files unchanged', self.release())
+
+            with open(f'{sources}/release.css', 'w') as f:
+                f.write('body { color: blue; }')
+            with open(f'{sources}/release.js', 'w') as f:
+                f.write('')
+            self.assertIn('1 added, 1 changed, 0 removed', self.release())
+            with open(f'{static_root}/staticfiles.json') as f:
+                manifest = json.load(f)
+            self.assertIn('release.js', manifest['paths'])
+            self.assertEqual(len(manifest['sources']['release.css']), 64)
+
+            # A build's collect is recorded too, so the release after it has nothing to do.
+            with open(f'{sources}/release.js', 'w') as f:
+                f.write('console.log(1);')
+            call_command('build_assets', '--skip-npm', '--noinput', stdout=io.StringIO(), verbosity=0)
+            self.assertIn('Static files unchanged', self.release())
+
+
+class GenerateDatasetTests(TestCase):
+    def generate(self, **options):
+        call_command('generate_dataset', students=40, sessions=2, attendance_days=2, force=True, stdout=io.StringIO(), **options)
+
+    def generated(self, prefix):
+        return list(
+            ExamForm.objects.filter(student__username__startswith=prefix).order_by('student_id', 'session__year', 'session__exam_type')
+            .values_list('session__exam_type', 'branch', 'semester', 'subjects', 'status', 'payment__amount')
+        )
+
+    def test_generates_sessions_forms_and_attendance(self):
+        self.generate()
+
+        current, previous = ExamSession.objects.all()  # newest first
+        self.assertTrue(current.is_active)
+        self.assertIsNotNone(previous.closed_at)
+        self.assertEqual(current.exam_forms.count(), 40)
+        # As in production, where a form is only created once its payment succeeds.
+        self.assertFalse(ExamForm.objects.filter(payment__isnull=True).exists())
+        self.assertFalse(previous.exam_forms.filter(status='pending').exists())
+        for form in ExamForm.objects.all():
+            self.assertLessEqual(set(form.subjects.split(',')), set(factories.subjects_for(form.branch, form.semester)))
+        # A student is one semester further in each session.
+        for form in previous.exam_forms.all():
+            self.assertEqual(int(current.exam_forms.get(student=form.student).semester), int(form.semester) + 1)
+
+        student = CustomUser.objects.get(username='gen0')
+        self.assertTrue(student.check_password(factories.PASSWORD))
+        self.assertEqual(Attendance.objects.filter(student=student).count(), 4)
+        self.assertEqual(AttendanceSummary.objects.filter(student=student).count(), 2)
+        self.assertIn(student, search_students(student.college_id))
+
+    def test_same_seed_generates_same_data(self):
+        self.generate(prefix='one')
+        self.generate(prefix='two')
+        self.generate(prefix='three', seed=7)
+        self.assertEqual(self.generated('one'), self.generated('two'))
+        self.assertNotEqual(self.generated('one'), self.generated('three'))
+
+    def test_refuses_without_debug_unless_forced(self):
+        with self.assertRaises(CommandError):
+            call_command('generate_dataset', students=1, stdout=io.StringIO())
+        self.assertFalse(CustomUser.objects.exists())
+
+
+@override_settings(STORAGES=STATIC_STORAGES, SECURE_SSL_REDIRECT=False)
+class ViewTests(TestCase):
+    """Every page and endpoint in exam_app.urls, as anonymous visitors, students and admins see it."""
+
+    # URL names covered here or by the feature tests above (drafts, dashboard changes, bulk attendance, status stream).
+    TESTED = {
+        'home', 'login', 'logout', 'password_reset', 'password_reset_done', 'password_reset_confirm',
+        'password_reset_complete', 'student_dashboard', 'fill_exam_form', 'exam_form_draft', 'payment',
+        'download_receipt', 'receipts', 'edit_profile', 'admin_dashboard', 'admin_dashboard_changes', 'admin_register',
+        'approve_form', 'mark_attendance', 'attendance_bulk', 'admin_search', 'reports', 'reports_data', 'view_status',
+        'status_stream', 'payment_success', 'get_subjects', 'extend_session', 'check_username', 'check_email',
+    }
+
+    def setUp(self):
+        self.student = factories.make_student()
+        self.admin = factories.make_admin()
+        self.form = factories.make_paid_form(self.student, status='approved', approved_at=timezone.now())
+        self.client.cookies[PIN_COOKIE_NAME] = str(time.time() + 60)
+
+    def test_every_url_is_tested(self):
+        from .urls import urlpatterns
+
+        self.assertEqual({pattern.name for pattern in urlpatterns} - self.TESTED, set())
+
+    def test_anonymous_visitors_see_public_pages_only(self):
+        for name in ('home', 'login', 'password_reset', 'password_reset_done', 'password_reset_complete'):
+            self.assertEqual(self.client.get(reverse(name)).status_code, 200, name)
+        for name in ('student_dashboard', 'admin_dashboard', 'receipts', 'get_subjects', 'check_email'):
+            response = self.client.get(reverse(name))
+            self.assertRedirects(response, f"{settings.LOGIN_URL}?next={reverse(name)}", fetch_redirect_response=False)
+
+    def test_login_by_username_or_college_id_and_logout(self):
+        response = self.client.post(reverse('login'), {'username': self.student.username, 'password': factories.PASSWORD})
+        self.assertRedirects(response, reverse('student_dashboard'))
+        self.assertRedirects(self.client.get(reverse('home')), reverse('student_dashboard'))
+        self.assertRedirects(self.client.get(reverse('logout')), reverse('home'))
+
+        response = self.client.post(reverse('login'), {'username': self.admin.username, 'password': factories.PASSWORD})
+        self.assertRedirects(response, reverse('admin_dashboard'))
+        response = self.client.post(reverse('login'), {'username': self.student.college_id, 'password': factories.PASSWORD})
+        self.assertRedirects(response, reverse('student_dashboard'))
+        self.assertContains(self.client.post(reverse('login'), {'username': self.student.username, 'password': 'wrong'}), 'Invalid credentials')
+
+    def test_password_reset_by_email(self):
+        response = self.client.post(reverse('password_reset'), {'email': self.student.email})
+        self.assertRedirects(response, reverse('password_reset_done'))
+        self.assertEqual(mail.outbox[-1].to, [self.student.email])
+        reset_url = re.search(r'http://testserver(/reset/\S+/)', mail.outbox[-1].body).group(1)
+
+        self.assertEqual(self.client.get(reset_url).status_code, 200)
+        self.assertContains(self.client.post(reset_url, {'new_password': 'a-new-pass', 'confirm_password': 'other'}), 'Passwords do not match')
+        response = self.client.post(reset_url, {'new_password': 'a-new-pass', 'confirm_password': 'a-new-pass'})
+        self.assertRedirects(response, reverse('password_reset_complete'))
+        self.assertTrue(self.client.login(username=self.student.username, password='a-new-pass'))
+        # The token is single-use: the new password invalidated it.
+        self.assertRedirects(self.client.get(reset_url), reverse('password_reset'))
+        self.assertContains(self.client.post(reverse('password_reset'), {'email': 'nobody@kdkce.edu.in'}), 'No user with this email')
+
+    def test_student_pages(self):
+        self.client.force_login(self.student)
+        self.assertContains(self.client.get(reverse('student_dashboard')), f'data-form-id="{self.form.pk}"')
+        self.assertContains(self.client.get(reverse('fill_exam_form')), 'Submit Exam Form')
+        self.assertContains(self.client.get(reverse('receipts')), reverse('download_receipt', args=[self.form.pk]))
+        self.assertEqual(self.client.get(reverse('download_receipt', args=[self.form.pk])).status_code, 200)
+        self.assertEqual(self.client.get(reverse('view_status', args=[self.form.pk])).status_code, 200)
+        self.assertEqual(self.client.get(reverse('edit_profile')).status_code, 200)
+        self.assertRedirects(self.client.get(reverse('payment')), reverse('fill_exam_form'))
+
+        subjects = self.client.get(reverse('get_subjects'), {'branch': 'cse', 'semester': '5'}).json()['subjects']
+        self.assertIn({'value': 'computer_networks', 'label': 'Computer Networks'}, subjects)
+        self.assertEqual(self.client.get(reverse('get_subjects')).status_code, 400)
+        self.assertTrue(self.client.post(reverse('extend_session')).json()['success'])
+        self.assertEqual(self.client.get(reverse('extend_session')).status_code, 400)
+
+        for name, args in (('admin_dashboard', []), ('admin_register', []), ('approve_form', [self.form.pk]),
+                           ('mark_attendance', []), ('reports', [])):
+            self.assertRedirects(self.client.get(reverse(name, args=args)), reverse('student_dashboard'), fetch_redirect_response=False)
+        for name in ('check_username', 'check_email', 'attendance_bulk', 'admin_search', 'reports_data', 'admin_dashboard_changes'):
+            self.assertEqual(self.client.get(reverse(name)).status_code, 403, name)
+
+    def test_students_cannot_see_each_others_forms(self):
+        self.client.force_login(factories.make_student())
+        self.assertRedirects(self.client.get(reverse('view_status', args=[self.form.pk])), reverse('student_dashboard'))
+        self.assertEqual(self.client.get(reverse('download_receipt', args=[self.form.pk])).status_code, 404)
+        self.assertNotContains(self.client.get(reverse('receipts')), reverse('download_receipt', args=[self.form.pk]))
+
+    def test_profile_edit(self):
+        self.client.force_login(self.student)
+        response = self.client.post(reverse('edit_profile'), {
+            'username': self.student.username, 'email': self.student.email, 'college_id': self.student.college_id,
+            'first_name': 'Renamed', 'last_name': self.student.last_name, 'mobile_no': '9876543210',
+            'aadhar_no': '123412341234', 'date_of_birth': '2004-05-06', 'address': 'Nagpur',
+        })
+        self.assertRedirects(response, reverse('student_dashboard'))
+        self.student.refresh_from_db()
+        self.assertEqual((self.student.first_name, self.student.mobile_no), ('Renamed', '9876543210'))
+
+    def test_admin_pages(self):
+        self.client.force_login(self.admin)
+        self.assertContains(self.client.get(reverse('admin_dashboard')), self.student.college_id)
+        self.assertEqual(self.client.get(reverse('admin_register')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('approve_form', args=[self.form.pk])).status_code, 200)
+        self.assertContains(self.client.get(reverse('mark_attendance'), {'branch': 'cse'}), self.student.college_id)
+        self.assertEqual(self.client.get(reverse('reports')).status_code, 200)
+        self.assertIn('daily', self.client.get(reverse('reports_data')).json())
+        self.assertEqual(self.client.get(reverse('reports_data'), {'start': 'soon'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('view_status', args=[self.form.pk])).status_code, 200)
+        self.assertEqual(self.client.get(reverse('check_username'), {'username': self.student.username}).json(), {'available': False})
+        self.assertEqual(self.client.get(reverse('check_email'), {'email': 'new@kdkce.edu.in'}).json(), {'available': True})
+        results = self.client.get(reverse('admin_search'), {'q': self.student.first_name}).json()['results']
+        self.assertEqual(results[0]['latest_form']['id'], self.form.pk)
+
+        for name in ('student_dashboard', 'fill_exam_form', 'payment', 'receipts'):
+            self.assertRedirects(self.client.get(reverse(name)), reverse('admin_dashboard'), fetch_redirect_response=False)
+        self.assertEqual(self.client.get(reverse('exam_form_draft')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('status_stream')).status_code, 403)
+
+    def test_admin_dashboard_queries_do_not_grow_with_forms(self):
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connections['default']) as one_form:
+            self.client.get(reverse('admin_dashboard'))
+        for _ in range(5):
+            factories.make_paid_form()
+        with CaptureQueriesContext(connections['default']) as six_forms:
+            self.assertContains(self.client.get(reverse('admin_dashboard')), 'data-updated=', count=6)
+        self.assertEqual(len(six_forms), len(one_form))
+
+    def test_admin_registers_students_marks_attendance_and_reviews_forms(self):
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('admin_register'), {
+            'username': 'newstudent', 'email': 'new.student@kdkce.edu.in', 'college_id': 'S999999', 'first_name': 'New',
+            'last_name': 'Student', 'mobile_no': '9876543210', 'aadhar_no': '111122223333', 'date_of_birth': '2005-01-02',
+            'address': 'Nagpur', 'password1': 'Str0ng-pass-42', 'password2': 'Str0ng-pass-42', 'role': 'student',
+        })
+        self.assertRedirects(response, reverse('login'), fetch_redirect_response=False)
+        new_student = CustomUser.objects.get(username='newstudent')
+
+        day = datetime.date(2026, 10, 19)
+        response = self.client.post(reverse('mark_attendance'), {
+            'date': day.isoformat(), 'branch': '', 'semester': '', 'students': [self.student.pk, new_student.pk], 'present': [self.student.pk],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(dict(Attendance.objects.filter(date=day).values_list('student_id', 'status')), {self.student.pk: True, new_student.pk: False})
+
+        pending = factories.make_paid_form(new_student)
+        self.assertRedirects(self.client.post(reverse('approve_form', args=[pending.pk]), {'action': 'reject'}), reverse('admin_dashboard'), fetch_redirect_response=False)
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, 'rejected')
+        self.assertEqual(mail.outbox[-1].to, [new_student.email])
+
+    @mock.patch('razorpay.Client')
+    def test_checkout_from_form_to_payment_with_stubbed_gateway(self, razorpay_client):
+        razorpay_client.return_value.order.create.return_value = {'id': 'order_VIEW1'}
+        self.client.force_login(self.student)
+        response = self.client.post(reverse('fill_exam_form'), {
+            'branch': 'it', 'semester': '3', 'subjects': factories.subjects_for('it', '3')[:2], 'exam_type': 'summer',
+        })
+        self.assertRedirects(response, reverse('payment'))
+        self.assertContains(self.client.get(reverse('payment')), 'order_VIEW1')
+
+        razorpay_client.return_value.utility.verify_payment_signature.side_effect = Exception('Signature mismatch')
+        bad = self.client.post(reverse('payment_success'), json.dumps({
+            'razorpay_order_id': 'order_VIEW1', 'razorpay_payment_id': 'pay_VIEW1', 'razorpay_signature': 'forged',
+        }), content_type='application/json')
+        self.assertEqual(bad.json(), {'status': 'failed', 'message': 'Signature mismatch'})
+
+        razorpay_client.return_value.utility.verify_payment_signature.side_effect = None
+        response = self.client.post(reverse('payment_success'), json.dumps({
+            'razorpay_order_id': 'order_VIEW1', 'razorpay_payment_id': 'pay_VIEW1', 'razorpay_signature': 'sig',
+        }), content_type='application/json')
+        self.assertEqual(response.json(), {'status': 'success'})
+        form = Payment.objects.get(razorpay_order_id='order_VIEW1').exam_form
+        self.assertEqual((form.branch, form.semester, form.exam_type, form.status), ('it', '3', 'summer', 'pending'))
+        self.assertEqual([str(make_header(decode_header(message.subject))) for message in mail.outbox], [SUBJECTS['form_submitted'], SUBJECTS['payment_success']])
+        self.assertEqual(self.client.get(reverse('payment_success')).json(), {'status': 'invalid'})
@@ -14,14 +14,22 @@ urlpatterns = [
     path('reset/done/', views.password_reset_complete, name='password_reset_complete'),
     path('student/dashboard/', views.student_dashboard, name='student_dashboard'),
     path('student/fill-form/', views.fill_exam_form, name='fill_exam_form'),
+    path('student/fill-form/draft/', views.exam_form_draft, name='exam_form_draft'),
     path('student/payment/', views.payment, name='payment'),
     path('student/receipt/<int:form_id>/', views.download_receipt, name='download_receipt'),
     path('student/receipts/', views.receipts, name='receipts'),
     path('student/edit-profile/', views.edit_profile, name='edit_profile'),
     path('admin/dashboard/', views.admin_dashboard, name='admin_dashboard'),
+    path('admin/dashboard/changes/', views.admin_dashboard_changes, name='admin_dashboard_changes'),
     path('admin/register/', views.register_view, name='admin_register'),
     path('admin/approve/<int:form_id>/', views.approve_form, name='approve_form'),
+    path('admin/attendance/', views.mark_attendance, name='mark_attendance'),
+    path('admin/attendance/bulk/', views.attendance_bulk, name='attendance_bulk'),
+    path('admin/search/', views.admin_search, name='admin_search'),
+    path('admin/reports/', views.reports, name='reports'),
+    path('admin/reports/data/', views.reports_data, name='reports_data'),
     path('status/<int:form_id>/', views.view_status, name='view_status'),
+    path('student/status-stream/', views.status_stream, name='status_stream'),
     path('payment/success/', views.payment_success, name='payment_success'),
     path('get-subjects/', views.get_subjects, name='get_subjects'),
     path('extend-session/', views.extend_session, name='extend_session'),
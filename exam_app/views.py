@@ -3,21 +3,171 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, authenticate, logout, get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.contrib.messages import get_messages
 from django.core.mail import send_mail
 from django.conf import settings
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
-from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, urlencode, urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.contrib.auth.tokens import default_token_generator
 from django.template.loader import render_to_string
 from django.urls import reverse
-import razorpay
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max, Q
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_safe
+from django.views.static import was_modified_since
+from django.utils._os import safe_join
+from django.core.exceptions import PermissionDenied, SuspiciousFileOperation, ValidationError
+from asgiref.sync import sync_to_async
+import datetime
+import hashlib
 import json
-from .models import CustomUser, ExamForm, Payment, Attendance
+import mimetypes
+import re
+from pathlib import Path
+from urllib.parse import quote
+from .models import CheckoutOrder, CustomUser, ExamForm, ExamFormDraft, ExamSession, Payment, Attendance, AttendanceSummary
+from . import drafts
+from .photos import schedule_thumbnails
+from .fees import checkout_fee
+from .gateway import razorpay_client
+from .notifications import send_email, send_form_status_emails
+from .routers import reporting_view
+from .storage import check_signature, is_public, media_name
+from .exam_sessions import active_session, session_for_exam
+from .status_feed import LATE_COMMIT_WINDOW, snapshot, status_events, student_forms
+from .search import search_students
+from .reports import REPORT_DIMENSIONS, last_refresh, parse_day, report_data
+from .attendance import attach_eligibility, parse_status, student_ids_by_college_id, upsert_attendance
 from .forms import ExamFormForm, CustomUserCreationForm, CustomUserEditForm, get_subjects_by_semester, get_subjects_by_branch_and_semester
 
+def _page_etag(request, *parts):
+    # Pending flash messages are rendered into the page, so the browser must
+    # not reuse its cached copy until they have been shown.
+    if len(get_messages(request)):
+        return None
+    # The CSRF secret is part of every rendered form, so a new login (which
+    # rotates it) also invalidates cached pages.
+    key = ':'.join(str(part) for part in (request.user.pk, request.META.get('CSRF_COOKIE', '')) + parts)
+    return hashlib.md5(key.encode()).hexdigest()
+
+def _latest(*timestamps):
+    timestamps = [ts for ts in timestamps if ts]
+    return max(timestamps) if timestamps else None
+
+def _exam_form_version(request, form_id):
+    # Cached on the request so the ETag and Last-Modified callbacks share one query.
+    versions = request.__dict__.setdefault('_exam_form_versions', {})
+    if form_id not in versions:
+        versions[form_id] = ExamForm.objects.filter(id=form_id).values(
+            'student_id', 'status', 'submitted_at', 'approved_at', 'payment__status', 'payment__paid_at'
+        ).first()
+    return versions[form_id]
+
+def _can_view_status(request, version):
+    return version is not None and (request.user.role == 'admin' or version['student_id'] == request.user.pk)
+
+def _can_download_receipt(request, version):
+    return (
+        version is not None
+        and version['student_id'] == request.user.pk
+        and version['status'] == 'approved'
+        and version['payment__status'] == 'paid'
+    )
+
+def _form_conditional_funcs(page, allowed):
+    # Redirects and 404s must never carry validators, so only pages the user
+    # can actually see get an ETag/Last-Modified.
+    def etag(request, form_id):
+        version = _exam_form_version(request, form_id)
+        if not allowed(request, version):
+            return None
+        return _page_etag(request, page, form_id, *version.values())
+
+    def last_modified(request, form_id):
+        version = _exam_form_version(request, form_id)
+        if not allowed(request, version) or len(get_messages(request)):
+            return None
+        return _latest(version['submitted_at'], version['approved_at'], version['payment__paid_at'])
+
+    return {'etag_func': etag, 'last_modified_func': last_modified}
+
+def _receipts_version(request):
+    if not hasattr(request, '_receipts_version'):
+        request._receipts_version = ExamForm.objects.filter(student=request.user, status='approved').aggregate(
+            count=Count('id'),
+            last_approved=Max('approved_at'),
+            last_paid=Max('payment__paid_at'),
+        )
+    return request._receipts_version
+
+def _receipts_etag(request):
+    if request.user.role != 'student':
+        return None
+    return _page_etag(request, 'receipts', *_receipts_version(request).values())
+
+def _receipts_last_modified(request):
+    if request.user.role != 'student' or len(get_messages(request)):
+        return None
+    version = _receipts_version(request)
+    return _latest(version['last_approved'], version['last_paid'])
+
+def _dashboard_session(request):
+    # ?session=<id> or ?session=all; otherwise the active session.
+    if not hasattr(request, '_dashboard_session'):
+        value = request.GET.get('session')
+        if value == 'all':
+            request._dashboard_session = None
+        elif value:
+            if not value.isdigit():
+                raise Http404
+            request._dashboard_session = get_object_or_404(ExamSession, pk=value)
+        else:
+            request._dashboard_session = active_session()
+    return request._dashboard_session
+
+def _dashboard_forms(request):
+    exam_forms = ExamForm.objects.all()
+    session = _dashboard_session(request)
+    if session is not None:
+        exam_forms = exam_forms.filter(session=session)
+    return exam_forms
+
+def _admin_dashboard_stats(request):
+    # One aggregate query feeds both the conditional-GET check and the page.
+    if not hasattr(request, '_admin_dashboard_stats'):
+        request._admin_dashboard_stats = _dashboard_forms(request).aggregate(
+            total_forms=Count('id'),
+            pending_forms=Count('id', filter=Q(status='pending')),
+            approved_forms=Count('id', filter=Q(status='approved')),
+            rejected_forms=Count('id', filter=Q(status='rejected')),
+            last_submitted=Max('submitted_at'),
+            last_updated=Max('updated_at'),
+        )
+        # The attendance column changes whenever a summary is refreshed.
+        request._admin_dashboard_stats.update(AttendanceSummary.objects.aggregate(
+            attendance_summaries=Count('id'),
+            last_attendance_update=Max('updated_at'),
+        ))
+    return request._admin_dashboard_stats
+
+def _admin_dashboard_etag(request):
+    if request.user.role != 'admin':
+        return None
+    session = _dashboard_session(request)
+    return _page_etag(request, 'admin_dashboard', session and session.pk, *_admin_dashboard_stats(request).values())
+
+def _admin_dashboard_last_modified(request):
+    if request.user.role != 'admin' or len(get_messages(request)):
+        return None
+    stats = _admin_dashboard_stats(request)
+    return _latest(stats['last_submitted'], stats['last_updated'], stats['last_attendance_update'])
+
 def home(request):
     # Redirect authenticated users to their dashboard
     if request.user.is_authenticated:
@@ -77,6 +227,7 @@ def student_dashboard(request):
 
     return render(request, 'exam_app/student_dashboard.html', {
         'exam_forms': exam_forms,
+        'draft': drafts.draft_for(request.user),
         'session_expiry_timestamp': session_expiry_timestamp,
         'approved_count': approved_count,
         'pending_count': pending_count
@@ -87,92 +238,160 @@ def fill_exam_form(request):
     if request.user.role != 'student':
         return redirect('admin_dashboard')
     if request.method == 'POST':
-        form = ExamFormForm(request.POST)
+        form = ExamFormForm(request.POST, student=request.user)
         if form.is_valid():
-            # Store form data in session instead of saving to database
+            # Keep the form as the student's draft; the ExamForm is only created once paid
             form_data = {
                 'branch': form.cleaned_data['branch'],
                 'semester': form.cleaned_data['semester'],
                 'subjects': ','.join(form.cleaned_data['subjects']),
                 'exam_type': form.cleaned_data['exam_type']
             }
-            request.session['exam_form_data'] = form_data
-
-            # Send HTML email notification after form submission
-            from django.template.loader import render_to_string
-            from django.core.mail import EmailMessage
+            drafts.submit(request.user, form_data)
 
-            context = {
+            send_email('form_submitted', {
                 'user_name': request.user.get_full_name() or request.user.username,
                 'branch': form_data['branch'],
                 'semester': form_data['semester'],
                 'exam_type': form_data['exam_type'],
                 'subjects': form_data['subjects'],
                 'payment_url': request.build_absolute_uri('/payment/'),
-            }
-
-            html_content = render_to_string('exam_app/email_form_submitted.html', context)
-
-            email = EmailMessage(
-                '📝 Exam Form Submitted Successfully',
-                html_content,
-                settings.DEFAULT_FROM_EMAIL,
-                [request.user.email],
-            )
-            email.content_subtype = 'html'
-            email.send(fail_silently=True)
+            }, request.user.email)
 
             messages.success(request, 'Form details saved. Proceed to payment.')
             return redirect('payment')
     else:
-        # Check if there's existing form data in session (for editing)
-        existing_data = request.session.get('exam_form_data')
-        if existing_data:
-            form = ExamFormForm(initial=existing_data)
+        # Resume the student's draft, if any
+        draft = drafts.draft_for(request.user)
+        if draft and draft.branch and draft.semester:
+            form = ExamFormForm(initial={**draft.form_data(), 'subjects': draft.subjects.split(',')})
         else:
             form = ExamFormForm(initial={'branch': 'cse', 'semester': '1'})
     return render(request, 'exam_app/fill_form.html', {'form': form})
 
+@login_required
+def exam_form_draft(request):
+    """Autosave endpoint: GET the student's draft, POST a JSON object of changed fields."""
+    if request.user.role != 'student':
+        return JsonResponse({'status': 'failed', 'message': 'Only students have exam form drafts'}, status=403)
+    if request.method == 'GET':
+        return JsonResponse(drafts.as_json(drafts.draft_for(request.user)))
+    if request.method != 'POST':
+        return JsonResponse({'status': 'invalid'}, status=405)
+    try:
+        changes = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'status': 'failed', 'message': 'Invalid JSON'}, status=400)
+    if not isinstance(changes, dict):
+        return JsonResponse({'status': 'failed', 'message': 'Expected an object of changed fields'}, status=400)
+    try:
+        draft = drafts.apply_changes(request.user, changes)
+    except ValidationError as e:
+        return JsonResponse({'status': 'failed', 'message': e.messages[0]}, status=400)
+    return JsonResponse({'status': 'saved', 'updated_at': draft.updated_at.isoformat()})
+
 @login_required
 def payment(request):
     if request.user.role != 'student':
         return redirect('admin_dashboard')
 
-    # Check if form data exists in session
-    form_data = request.session.get('exam_form_data')
-    if not form_data:
+    # The student's submitted draft is what gets paid for
+    draft = ExamFormDraft.objects.filter(student=request.user, submitted=True).first()
+    if draft is None:
         messages.error(request, 'No form data found. Please fill the exam form first.')
         return redirect('fill_exam_form')
+    form_data = draft.form_data()
 
-    # Create Razorpay order
-    client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
-    amount = 10000  # Amount in paisa (100 INR)
-    order_data = {
-        'amount': amount,
-        'currency': 'INR',
-        'payment_capture': '1'
-    }
-    order = client.order.create(data=order_data)
-
-    # Store payment order ID in session for later use
-    request.session['razorpay_order_id'] = order['id']
+    fee = checkout_fee(form_data)
+    if fee <= 0:
+        messages.error(request, 'No exam fee is configured for this form. Please contact the exam cell.')
+        return redirect('fill_exam_form')
+    amount = int(fee * 100)  # Amount in paisa
+
+    # Reloading the page reuses the draft's open order while the fee is unchanged
+    order_id = draft.razorpay_order_id
+    if not order_id or draft.fee != fee:
+        client = razorpay_client()
+        order_data = {
+            'amount': amount,
+            'currency': 'INR',
+            'payment_capture': '1'
+        }
+        order_id = client.order.create(data=order_data)['id']
+        # What this order pays for, so payment_success records exactly that
+        # even if the draft is edited while checkout is open.
+        CheckoutOrder.objects.create(razorpay_order_id=order_id, student=request.user, fee=fee, **form_data)
+        ExamFormDraft.objects.filter(pk=draft.pk).update(razorpay_order_id=order_id, fee=fee)
 
     return render(request, 'exam_app/payment.html', {
         'form_data': form_data,
-        'amount': amount / 100,
-        'razorpay_order_id': order['id'],
+        'amount': fee,
+        'amount_paise': amount,
+        'razorpay_order_id': order_id,
         'razorpay_key_id': settings.RAZORPAY_KEY_ID
     })
 
+def _record_payment(request, razorpay_order_id, razorpay_payment_id):
+    """
+    Create the ExamForm and its Payment from the order's CheckoutOrder
+    snapshot in one transaction, or return the existing pair if this order
+    was already recorded. Returns (payment, created).
+    """
+    with transaction.atomic():
+        # Serialise success callbacks per student: a duplicate waits here until
+        # the first one commits, then finds its Payment below.
+        CustomUser.objects.select_for_update().only('pk').get(pk=request.user.pk)
+
+        payment = Payment.objects.select_related('exam_form').filter(razorpay_order_id=razorpay_order_id).first()
+        if payment is not None:
+            return payment, False
+        order = CheckoutOrder.objects.filter(razorpay_order_id=razorpay_order_id, student=request.user).first()
+        draft = ExamFormDraft.objects.filter(student=request.user).first()
+        if order is not None:
+            form_data, amount = order.form_data(), order.fee
+        elif draft is not None and draft.submitted:
+            # An order opened before checkout orders were recorded.
+            form_data = draft.form_data()
+            amount = draft.fee if draft.fee is not None and draft.razorpay_order_id == razorpay_order_id else checkout_fee(form_data)
+        else:
+            return None, False
+
+        # Create exam form only after successful payment
+        exam_form = ExamForm.objects.create(
+            student=request.user,
+            branch=form_data['branch'],
+            semester=form_data['semester'],
+            subjects=form_data['subjects'],
+            exam_type=form_data['exam_type'],
+            status='pending',  # Set to pending for admin approval
+            session=session_for_exam(form_data['exam_type']),
+        )
+
+        # Create payment record
+        payment = Payment.objects.create(
+            exam_form=exam_form,
+            amount=amount,  # in rupees, as charged for this order
+            razorpay_order_id=razorpay_order_id,
+            razorpay_payment_id=razorpay_payment_id,
+            status='paid',
+            paid_at=timezone.now()
+        )
+        # A draft edited into something else after this order opened is kept.
+        if draft is not None and (draft.razorpay_order_id == razorpay_order_id or draft.form_data() == form_data):
+            draft.delete()
+        return payment, True
+
 @csrf_exempt
 def payment_success(request):
     if request.method == 'POST':
+        if not request.user.is_authenticated:
+            return JsonResponse({'status': 'failed', 'message': 'Login required'})
         data = json.loads(request.body)
         razorpay_payment_id = data.get('razorpay_payment_id')
         razorpay_order_id = data.get('razorpay_order_id')
         razorpay_signature = data.get('razorpay_signature')
 
-        client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+        client = razorpay_client()
         try:
             client.utility.verify_payment_signature({
                 'razorpay_order_id': razorpay_order_id,
@@ -180,58 +399,32 @@ def payment_success(request):
                 'razorpay_signature': razorpay_signature
             })
 
-            # Get form data from session
-            form_data = request.session.get('exam_form_data')
-            if not form_data:
+            try:
+                payment, created = _record_payment(request, razorpay_order_id, razorpay_payment_id)
+            except IntegrityError:
+                # Backstop for databases without row locks: the unique order id
+                # rejected a concurrent duplicate and the whole transaction
+                # (including its ExamForm) was rolled back.
+                payment, created = Payment.objects.select_related('exam_form').get(razorpay_order_id=razorpay_order_id), False
+
+            if payment is None:
                 return JsonResponse({'status': 'failed', 'message': 'Form data not found'})
+            exam_form = payment.exam_form
+            if exam_form.student_id != request.user.pk:
+                return JsonResponse({'status': 'failed', 'message': 'Order belongs to another student'})
 
-            # Create exam form only after successful payment
-            exam_form = ExamForm.objects.create(
-                student=request.user,
-                branch=form_data['branch'],
-                semester=form_data['semester'],
-                subjects=form_data['subjects'],
-                exam_type=form_data['exam_type'],
-                status='pending'  # Set to pending for admin approval
-            )
-
-            # Create payment record
-            payment = Payment.objects.create(
-                exam_form=exam_form,
-                amount=100.00,  # Amount in rupees
-                razorpay_order_id=razorpay_order_id,
-                razorpay_payment_id=razorpay_payment_id,
-                status='paid',
-                paid_at=timezone.now()
-            )
-
-            # Clear session data
-            del request.session['exam_form_data']
-            del request.session['razorpay_order_id']
-
-            # Send HTML email notification for payment success
-            from django.template.loader import render_to_string
-            from django.core.mail import EmailMessage
-
-            context = {
+            if not created:
+                # Retried or double-submitted callback: already recorded, no second email.
+                return JsonResponse({'status': 'success'})
+
+            send_email('payment_success', {
                 'user_name': request.user.get_full_name() or request.user.username,
                 'form_id': exam_form.id,
-                'amount': '100.00',
+                'amount': str(payment.amount),
                 'payment_id': razorpay_payment_id,
                 'payment_date': payment.paid_at.strftime('%d %B %Y, %I:%M %p'),
                 'dashboard_url': request.build_absolute_uri('/student/dashboard/'),
-            }
-
-            html_content = render_to_string('exam_app/email_payment_success.html', context)
-
-            email = EmailMessage(
-                '💳 Payment Successful - Form Submitted',
-                html_content,
-                settings.DEFAULT_FROM_EMAIL,
-                [exam_form.student.email],
-            )
-            email.content_subtype = 'html'
-            email.send(fail_silently=True)
+            }, request.user.email)
 
             return JsonResponse({'status': 'success'})
         except Exception as e:
@@ -239,6 +432,8 @@ def payment_success(request):
     return JsonResponse({'status': 'invalid'})
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(**_form_conditional_funcs('download_receipt', _can_download_receipt))
 def download_receipt(request, form_id):
     exam_form = get_object_or_404(ExamForm, id=form_id, student=request.user)
     if exam_form.status != 'approved' or not hasattr(exam_form, 'payment') or exam_form.payment.status != 'paid':
@@ -247,6 +442,8 @@ def download_receipt(request, form_id):
     return render(request, 'exam_app/receipt.html', {'exam_form': exam_form})
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_receipts_etag, last_modified_func=_receipts_last_modified)
 def receipts(request):
     if request.user.role != 'student':
         return redirect('admin_dashboard')
@@ -258,7 +455,9 @@ def edit_profile(request):
     if request.method == 'POST':
         form = CustomUserEditForm(request.POST, request.FILES, instance=request.user)
         if form.is_valid():
-            form.save()
+            user = form.save()
+            if 'profile_photo' in form.changed_data:
+                schedule_thumbnails(user)
             messages.success(request, 'Profile updated successfully.')
             return redirect('admin_dashboard' if request.user.role == 'admin' else 'student_dashboard')
     else:
@@ -266,26 +465,72 @@ def edit_profile(request):
     return render(request, 'exam_app/edit_profile.html', {'form': form})
 
 @login_required
+@reporting_view
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_admin_dashboard_etag, last_modified_func=_admin_dashboard_last_modified)
 def admin_dashboard(request):
     if request.user.role != 'admin':
         return redirect('student_dashboard')
-    exam_forms = ExamForm.objects.all().order_by('-submitted_at')
+    # Taken before the query, so admin_dashboard_changes re-sends anything
+    # that changes while the page renders.
+    cursor = timezone.now()
+    exam_forms = attach_eligibility(_dashboard_forms(request).select_related('student').order_by('-submitted_at'))
 
     # Calculate statistics
-    total_forms = exam_forms.count()
-    pending_forms = exam_forms.filter(status='pending').count()
-    approved_forms = exam_forms.filter(status='approved').count()
-    rejected_forms = exam_forms.filter(status='rejected').count()
+    stats = _admin_dashboard_stats(request)
 
     context = {
         'exam_forms': exam_forms,
-        'total_forms': total_forms,
-        'pending_forms': pending_forms,
-        'approved_forms': approved_forms,
-        'rejected_forms': rejected_forms,
+        'total_forms': stats['total_forms'],
+        'pending_forms': stats['pending_forms'],
+        'approved_forms': stats['approved_forms'],
+        'rejected_forms': stats['rejected_forms'],
+        'sessions': ExamSession.objects.all(),
+        'current_session': _dashboard_session(request),
+        'cursor': cursor.isoformat(),
+        'poll_seconds': getattr(settings, 'ADMIN_DASHBOARD_POLL_SECONDS', 10),
     }
     return render(request, 'exam_app/admin_dashboard.html', context)
 
+@login_required
+@require_safe
+def admin_dashboard_changes(request):
+    """
+    Forms of the dashboard's session changed since `cursor` (the value the
+    page or the previous call returned), as rendered table rows, plus fresh
+    counts when anything changed:
+        GET /admin/dashboard/changes/?cursor=2026-10-19T09:30:00%2B00:00&session=3
+    Rows changed in the last few seconds before the cursor are sent again in
+    case they committed late; the page replaces rows by id, so repeats are
+    harmless. Reads the primary, since replica lag could skip past a change.
+    """
+    if request.user.role != 'admin':
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    since = parse_datetime(request.GET.get('cursor', ''))
+    if since is None:
+        return JsonResponse({'error': 'A valid cursor is required'}, status=400)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+
+    cursor = timezone.now()
+    changed = attach_eligibility(
+        _dashboard_forms(request)
+        .filter(updated_at__gt=since - LATE_COMMIT_WINDOW)
+        .select_related('student')
+        .order_by('submitted_at')
+    )
+    data = {
+        'cursor': cursor.isoformat(),
+        'forms': [
+            {'id': form.pk, 'html': render_to_string('exam_app/admin_dashboard_row.html', {'form': form}, request)}
+            for form in changed
+        ],
+    }
+    if changed:
+        stats = _admin_dashboard_stats(request)
+        data['stats'] = {name: stats[name] for name in ('total_forms', 'pending_forms', 'approved_forms', 'rejected_forms')}
+    return JsonResponse(data)
+
 @login_required
 def register_view(request):
     if request.user.role != 'admin':
@@ -323,47 +568,15 @@ def approve_form(request, form_id):
             status_text = 'rejected'
         exam_form.save()
 
-        # Send HTML email notification for approval/rejection
-        from django.template.loader import render_to_string
-        from django.core.mail import EmailMessage
-
-        if action == 'approve':
-            context = {
-                'user_name': exam_form.student.get_full_name() or exam_form.student.username,
-                'form_id': exam_form.id,
-                'branch': exam_form.branch,
-                'semester': exam_form.semester,
-                'exam_type': exam_form.exam_type,
-                'subjects': exam_form.subjects,
-                'approved_at': exam_form.approved_at.strftime('%d %B %Y, %I:%M %p'),
-                'dashboard_url': request.build_absolute_uri('/student/dashboard/'),
-            }
-
-            html_content = render_to_string('exam_app/email_form_approved.html', context)
-
-            email = EmailMessage(
-                '🎉 Exam Form Approved - Action Required',
-                html_content,
-                settings.DEFAULT_FROM_EMAIL,
-                [exam_form.student.email],
-            )
-            email.content_subtype = 'html'
-            email.send(fail_silently=True)
-        else:
-            # Send simple rejection email (keeping it simple for now)
-            send_mail(
-                f'Exam Form {status_text.capitalize()}',
-                f'Your exam form {exam_form.id} has been {status_text}.',
-                settings.DEFAULT_FROM_EMAIL,
-                [exam_form.student.email],
-                fail_silently=True,
-            )
+        send_form_status_emails([exam_form], request.build_absolute_uri('/student/dashboard/'))
 
         messages.success(request, f'Form {status_text}.')
         return redirect('admin_dashboard')
     return render(request, 'exam_app/approve_form.html', {'exam_form': exam_form})
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(**_form_conditional_funcs('view_status', _can_view_status))
 def view_status(request, form_id):
     exam_form = get_object_or_404(ExamForm, id=form_id)
     if request.user.role != 'admin' and exam_form.student != request.user:
@@ -371,6 +584,28 @@ def view_status(request, form_id):
     return render(request, 'exam_app/view_status.html', {'exam_form': exam_form})
 
 @login_required
+async def status_stream(request):
+    """
+    Server-sent events with the status of the student's exam forms, pushed
+    whenever one changes (see exam_app.status_feed).
+    """
+    user = await request.auser()
+    if user.role != 'student':
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(status_events(user.pk), content_type='text/event-stream')
+        # Stop nginx-style proxies from buffering the stream.
+        response['X-Accel-Buffering'] = 'no'
+    else:
+        # A WSGI worker can't be held open per student: send the snapshot and
+        # let EventSource reconnect after the fallback interval.
+        forms = await sync_to_async(student_forms)(user.pk)
+        response = HttpResponse(snapshot(forms, settings.STATUS_STREAM_FALLBACK_RETRY_MS), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+@login_required
+@cache_control(private=True, max_age=3600)
 def get_subjects(request):
     branch = request.GET.get('branch')
     semester = request.GET.get('semester')
@@ -454,3 +689,278 @@ def check_email(request):
     email = request.GET.get('email', '')
     exists = CustomUser.objects.filter(email=email).exists()
     return JsonResponse({'available': not exists})
+
+@login_required
+def mark_attendance(request):
+    if request.user.role != 'admin':
+        return redirect('student_dashboard')
+
+    if request.method == 'POST':
+        filters = {key: request.POST.get(key, '') for key in ('date', 'branch', 'semester')}
+        try:
+            date = datetime.date.fromisoformat(filters['date'])
+        except ValueError:
+            messages.error(request, 'Please choose a valid date.')
+            return redirect('mark_attendance')
+        listed_ids = [pk for pk in request.POST.getlist('students') if pk.isdigit()]
+        present_ids = set(request.POST.getlist('present'))
+        student_ids = CustomUser.objects.filter(role='student', pk__in=listed_ids).values_list('pk', flat=True)
+        written = upsert_attendance((pk, date, str(pk) in present_ids) for pk in student_ids)
+        messages.success(request, f'Attendance saved for {written} students on {date:%d %b %Y}.')
+        return redirect(f"{reverse('mark_attendance')}?{urlencode(filters)}")
+
+    try:
+        date = datetime.date.fromisoformat(request.GET.get('date', ''))
+    except ValueError:
+        date = timezone.localdate()
+    branch = request.GET.get('branch', '')
+    semester = request.GET.get('semester', '')
+
+    # A "class" is the set of students who filed forms for a branch/semester.
+    students = CustomUser.objects.filter(role='student')
+    if branch:
+        students = students.filter(exam_forms__branch=branch)
+    if semester:
+        students = students.filter(exam_forms__semester=semester)
+    students = students.distinct()
+
+    marked = dict(Attendance.objects.filter(date=date, student__in=students.values('pk')).values_list('student_id', 'status'))
+    students = list(students.order_by('college_id', 'username').only('pk', 'username', 'first_name', 'last_name', 'college_id'))
+    for student in students:
+        # Students not marked yet default to present.
+        student.is_present = marked.get(student.pk, True)
+        student.is_marked = student.pk in marked
+
+    return render(request, 'exam_app/mark_attendance.html', {
+        'students': students,
+        'date': date,
+        'branch': branch,
+        'semester': semester,
+        'branch_choices': ExamFormForm.BRANCH_CHOICES,
+        'semester_choices': ExamFormForm.SEMESTER_CHOICES,
+        'marked_count': len(marked),
+    })
+
+@login_required
+def attendance_bulk(request):
+    """
+    JSON API for bulk attendance. Accepts either a whole class-day:
+        {"date": "2026-10-19", "present": ["CS001", ...], "absent": ["CS002", ...]}
+    or arbitrary rows (e.g. a month at a time):
+        {"records": [{"college_id": "CS001", "date": "2026-10-01", "status": "P"}, ...]}
+    """
+    if request.user.role != 'admin':
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request method'}, status=400)
+
+    try:
+        data = json.loads(request.body)
+        if 'records' in data:
+            rows = [(r['college_id'], datetime.date.fromisoformat(r['date']), parse_status(r['status'])) for r in data['records']]
+        else:
+            date = datetime.date.fromisoformat(data['date'])
+            rows = [(college_id, date, True) for college_id in data.get('present', [])]
+            rows += [(college_id, date, False) for college_id in data.get('absent', [])]
+    except (ValueError, KeyError, TypeError) as e:
+        return JsonResponse({'error': f'Invalid payload: {e}'}, status=400)
+
+    student_ids = student_ids_by_college_id({college_id for college_id, _, _ in rows})
+    unknown = sorted({college_id for college_id, _, _ in rows if college_id not in student_ids})
+    written = upsert_attendance(
+        (student_ids[college_id], date, status) for college_id, date, status in rows if college_id in student_ids
+    )
+    return JsonResponse({'written': written, 'unknown': unknown})
+
+
+@login_required
+@reporting_view
+def admin_search(request):
+    """
+    Search-as-you-type over students for the admin dashboard, backed by the
+    SearchToken index (exam_app.search):
+        GET /admin/search/?q=cs0&limit=10
+    Each result carries the student's most recent exam form, if any.
+    """
+    if request.user.role != 'admin':
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 50)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be a number'}, status=400)
+    students = search_students(request.GET.get('q', ''), limit)
+
+    latest_forms = {}
+    for form in ExamForm.objects.filter(student__in=students).order_by('submitted_at').values('id', 'student_id', 'status', 'branch', 'semester'):
+        latest_forms[form.pop('student_id')] = form
+    return JsonResponse({'results': [
+        {
+            'id': student.pk,
+            'college_id': student.college_id,
+            'name': student.get_full_name() or student.username,
+            'email': student.email,
+            'latest_form': latest_forms.get(student.pk),
+        }
+        for student in students
+    ]})
+
+def _report_params(request):
+    """Date range (default: the last 30 days) and dimension filters from the query string."""
+    end = parse_day(request.GET.get('end'), timezone.localdate())
+    start = parse_day(request.GET.get('start'), end - datetime.timedelta(days=29))
+    if start > end:
+        raise ValueError('start must not be after end')
+    return start, end, {name: request.GET.get(name, '') for name in REPORT_DIMENSIONS}
+
+def _reports_etag(request):
+    if request.user.role != 'admin':
+        return None
+    return _page_etag(request, 'reports', request.GET.urlencode(), last_refresh())
+
+def _reports_last_modified(request):
+    if request.user.role != 'admin' or len(get_messages(request)):
+        return None
+    return last_refresh()
+
+@login_required
+@reporting_view
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_reports_etag, last_modified_func=_reports_last_modified)
+def reports(request):
+    """Registrations and fees by day, branch, semester and exam type, read from the DailyReport rollups."""
+    if request.user.role != 'admin':
+        return redirect('student_dashboard')
+    try:
+        start, end, filters = _report_params(request)
+    except ValueError as e:
+        messages.error(request, str(e))
+        return redirect('reports')
+    data = report_data(start, end, **filters)
+    peak = max((day['registrations'] for day in data['daily']), default=0)
+    return render(request, 'exam_app/reports.html', {
+        'report': data,
+        'filters': filters,
+        'peak': peak or 1,
+        'data_url': f"{reverse('reports_data')}?{request.GET.urlencode()}",
+        'branch_choices': ExamFormForm.BRANCH_CHOICES,
+        'semester_choices': ExamFormForm.SEMESTER_CHOICES,
+        'exam_type_choices': ExamForm.EXAM_TYPE_CHOICES,
+    })
+
+@login_required
+@reporting_view
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_reports_etag, last_modified_func=_reports_last_modified)
+def reports_data(request):
+    """
+    JSON API behind the reports page, for charts and exports:
+        GET /admin/reports/data/?start=2026-10-01&end=2026-10-31&branch=CSE
+    Fee totals are decimal strings. Reads only the rollup tables.
+    """
+    if request.user.role != 'admin':
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    try:
+        start, end, filters = _report_params(request)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse(report_data(start, end, **filters))
+
+
+# Content-hashed media never changes, so browsers may keep it for a year.
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_byte_range_re = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+class _FileRange:
+    """File-like view of `length` bytes of an open file, for 206 responses."""
+
+    def __init__(self, fh, start, length):
+        fh.seek(start)
+        self.fh = fh
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fh.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.fh.close()
+
+def _byte_range(request, size, last_modified):
+    """
+    Parse a single-range Range header into (start, end). Returns None to send
+    the whole file (no header, multiple ranges, or a stale If-Range) and
+    raises ValueError when the range is unsatisfiable.
+    """
+    match = _byte_range_re.match(request.META.get('HTTP_RANGE', '').strip())
+    if not match or request.META.get('HTTP_IF_RANGE', last_modified) != last_modified:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last or int(last) == 0:
+            raise ValueError
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start > end:
+        raise ValueError
+    return start, end
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve uploaded media in production. Content-hashed files are public and
+    cached forever; everything else needs a signed URL from
+    SignedMediaStorage, checked without a database query. With
+    MEDIA_ACCEL_REDIRECT set the transfer is handed to nginx, otherwise the
+    file is streamed with FileResponse (os.sendfile under gunicorn) and
+    single byte ranges are honoured.
+    """
+    path = media_name(path)
+    if path is None:
+        raise Http404
+    if is_public(path):
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        remaining = check_signature(path, request.GET.get('expires'), request.GET.get('signature'))
+        if remaining is None:
+            raise PermissionDenied
+        cache_control = f'private, max-age={remaining}'
+
+    try:
+        fullpath = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404
+    if not fullpath.is_file():
+        raise Http404
+    stat = fullpath.stat()
+    last_modified = http_date(stat.st_mtime)
+    content_type = mimetypes.guess_type(fullpath.name)[0] or 'application/octet-stream'
+
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), int(stat.st_mtime)):
+        response = HttpResponseNotModified()
+    elif getattr(settings, 'MEDIA_ACCEL_REDIRECT', ''):
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT + quote(path)
+    else:
+        try:
+            byte_range = _byte_range(request, stat.st_size, last_modified)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        if byte_range is None:
+            response = FileResponse(fullpath.open('rb'), content_type=content_type)
+        else:
+            start, end = byte_range
+            length = end - start + 1
+            response = FileResponse(_FileRange(fullpath.open('rb'), start, length), status=206, content_type=content_type)
+            response['Content-Length'] = str(length)
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        response['Accept-Ranges'] = 'bytes'
+    response['Last-Modified'] = last_modified
+    response['Cache-Control'] = cache_control
+    return response
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'exam_form_system.settings')
+# Read by settings to pick ASGI-safe database defaults (see CONN_MAX_AGE there).
+os.environ.setdefault('SERVER_INTERFACE', 'asgi')
 
 application = get_asgi_application()
@@ -58,15 +58,68 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'exam_app.middleware.HealthCheckMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'exam_app.middleware.AdmissionControlMiddleware',
+    'exam_app.middleware.CompressionMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
+    'exam_app.middleware.ReplicaPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'allauth.account.middleware.AccountMiddleware',
 ]
 
+# Health probes (exam_app.health), answered ahead of the HTTPS redirect,
+# host check, session and auth. render.yaml's healthCheckPath is the readiness one.
+HEALTH_LIVENESS_PATH = '/healthz'
+HEALTH_READINESS_PATH = '/readyz'
+HEALTH_DB_CHECK_TTL = config('HEALTH_DB_CHECK_TTL', default=5, cast=float)  # seconds a database check is reused per process
+
+# Admission control for the deadline-day student journey (exam_app.admission).
+# Exact paths, not prefixes: the fill form's JSON autosave (fill-form/draft/) is
+# never queued. payment/success/ is deliberately not listed: a student who has
+# paid is never queued.
+ADMISSION_CONTROL = config('ADMISSION_CONTROL', default=True, cast=bool)
+ADMISSION_PATHS = ['/student/fill-form/', '/student/payment/']
+ADMISSION_MAX_IN_FLIGHT = config('ADMISSION_MAX_IN_FLIGHT', default=20, cast=int)  # across all workers sharing the cache
+ADMISSION_SLOT_TIMEOUT = config('ADMISSION_SLOT_TIMEOUT', default=30, cast=int)  # seconds; match the gunicorn timeout
+ADMISSION_TICKET_MAX_AGE = 1800  # seconds a queue ticket keeps its place
+
+# Live form status for students (exam_app.status_feed). Streams need the ASGI
+# worker in render.yaml; under WSGI browsers poll every fallback interval.
+STATUS_FEED_INTERVAL = config('STATUS_FEED_INTERVAL', default=2, cast=float)  # seconds between change polls per process
+STATUS_STREAM_MAX_SECONDS = 300  # a stream closes after this and the browser reconnects
+STATUS_STREAM_HEARTBEAT = 25  # seconds between keepalive comments on an idle stream
+STATUS_STREAM_RETRY_MS = 3000
+STATUS_STREAM_FALLBACK_RETRY_MS = 30000
+ADMIN_DASHBOARD_POLL_SECONDS = 10  # how often an open admin dashboard fetches changed rows
+# Admin changelists of at least this many rows page by an estimate instead of
+# an exact COUNT(*): the database's row estimate when unfiltered, the session's
+# DailyReport registrations in the default (active session) view.
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=50000, cast=int)
+
+# Shared cache for cross-worker state such as admission slots. Without
+# REDIS_URL each process gets its own local-memory cache.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    # Needs `pip install redis`
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL}}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# Admin approve/reject actions email at most this many students in the request;
+# larger batches are left to `manage.py send_status_emails`.
+ADMIN_STATUS_EMAIL_LIMIT = config('ADMIN_STATUS_EMAIL_LIMIT', default=200, cast=int)
+
+# Response compression (exam_app.middleware.CompressionMiddleware)
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)  # bytes
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)  # 0-11
+
 ROOT_URLCONF = 'exam_form_system.urls'
 
 TEMPLATES = [
@@ -91,20 +144,87 @@ WSGI_APPLICATION = 'exam_form_system.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': config('MYSQL_DATABASE', default='exam_form_system'),
-        'USER': config('MYSQL_USER', default='root'),
-        'PASSWORD': config('MYSQL_PASSWORD', default=''),
-        'HOST': config('MYSQL_HOST', default='localhost'),
-        'PORT': config('MYSQL_PORT', default='3306'),
-        'OPTIONS': {
-            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
-            'ssl': {} if config('MYSQL_SSL', default=True, cast=bool) else None,
-        },
+DB_ENGINE = config('DB_ENGINE', default='mysql')  # 'mysql', or 'sqlite' as a local stand-in
+DB_POOL = config('DB_POOL', default=False, cast=bool)  # django-db-connection-pool[mysql]; on in render.yaml
+
+if DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3')),
+            # Take the write lock at BEGIN so concurrent requests queue (up to
+            # `timeout` seconds) instead of failing with "database is locked".
+            'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
+            # File-backed so tests that use several threads share one database.
+            'TEST': {'NAME': config('SQLITE_TEST_PATH', default=str(BASE_DIR / 'test_db.sqlite3'))},
+        }
     }
-}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'dj_db_conn_pool.backends.mysql' if DB_POOL else 'django.db.backends.mysql',
+            'NAME': config('MYSQL_DATABASE', default='exam_form_system'),
+            'USER': config('MYSQL_USER', default='root'),
+            'PASSWORD': config('MYSQL_PASSWORD', default=''),
+            'HOST': config('MYSQL_HOST', default='localhost'),
+            'PORT': config('MYSQL_PORT', default='3306'),
+            'OPTIONS': {
+                'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+                'ssl': {} if config('MYSQL_SSL', default=True, cast=bool) else None,
+            },
+        }
+    }
+    if DB_POOL:
+        # A process-wide pool shared by all threads; PRE_PING replaces Django's
+        # own health check and Django closes (returns) connections after each request.
+        DATABASES['default']['POOL_OPTIONS'] = {
+            'POOL_SIZE': config('DB_POOL_SIZE', default=5, cast=int),
+            'MAX_OVERFLOW': config('DB_POOL_MAX_OVERFLOW', default=5, cast=int),
+            'RECYCLE': config('DB_POOL_RECYCLE', default=1800, cast=int),  # seconds
+            'PRE_PING': True,
+        }
+
+# Under WSGI, keep each worker's connection open between requests instead of
+# paying a fresh TLS handshake to the database every time. Health checks ping a
+# reused connection once per request so a server-side timeout doesn't surface as
+# an error. Under ASGI (exam_form_system.asgi sets SERVER_INTERFACE) each
+# request's sync code runs in its own thread context, so a persistent
+# connection is never reused and only piles up until the server times it out:
+# the default there is 0, and DB_POOL is how to reuse connections.
+SERVER_INTERFACE = config('SERVER_INTERFACE', default='wsgi')
+DATABASES['default']['CONN_MAX_AGE'] = 0 if DB_POOL else config(
+    'DB_CONN_MAX_AGE', default=0 if SERVER_INTERFACE == 'asgi' else 600, cast=int,
+)  # seconds
+DATABASES['default']['CONN_HEALTH_CHECKS'] = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+
+# Optional read replica for reporting/dashboard reads (see exam_app.routers).
+# SQLITE_REPLICA_PATH points at a second SQLite file for local testing.
+REPORTING_DB_ALIAS = config('REPORTING_DB_ALIAS', default='replica')
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)  # read-your-writes window
+if DB_ENGINE == 'sqlite':
+    # A separate file (and separate test database), so tests can tell which
+    # database a query actually went to.
+    _replica_overrides = {
+        'NAME': config('SQLITE_REPLICA_PATH', default=''),
+        'TEST': {'NAME': str(BASE_DIR / 'test_replica.sqlite3')},
+    }
+    _replica_enabled = bool(_replica_overrides['NAME'])
+else:
+    _replica_overrides = {
+        'HOST': config('MYSQL_REPLICA_HOST', default=''),
+        'PORT': config('MYSQL_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        # A real replica is read-only; tests read it through the primary's test database.
+        'TEST': {'MIRROR': 'default'},
+    }
+    _replica_enabled = bool(_replica_overrides['HOST'])
+if _replica_enabled:
+    DATABASES[REPORTING_DB_ALIAS] = {**DATABASES['default'], **_replica_overrides}
+
+DATABASE_ROUTERS = ['exam_app.routers.ReportingReplicaRouter']
+
+
+# Minimum attendance (percent of the exam term) required to submit an exam form.
+MIN_ATTENDANCE_PERCENT = config('MIN_ATTENDANCE_PERCENT', default=75, cast=float)
 
 
 # Password validation
@@ -144,9 +264,32 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Hashed filenames + gzip/brotli copies are written by collectstatic (see the
+# build_assets command); WhiteNoise serves hashed files with a far-future,
+# immutable Cache-Control header.
+STORAGES = {
+    'default': {
+        # Signed, expiring URLs for private uploads (see exam_app.storage)
+        'BACKEND': 'exam_app.storage.SignedMediaStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+WHITENOISE_KEEP_ONLY_HASHED_FILES = True
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+SERVE_MEDIA = config('SERVE_MEDIA', default=True, cast=bool)  # serve MEDIA_URL from Django (see exam_app.views.serve_media)
+MEDIA_URL_MAX_AGE = config('MEDIA_URL_MAX_AGE', default=3600, cast=int)  # seconds; signed links live 1-2x this
+MEDIA_ACCEL_REDIRECT = config('MEDIA_ACCEL_REDIRECT', default='')  # e.g. /protected-media/ behind nginx
+
+# Profile photo uploads (see exam_app.photos)
+PROFILE_PHOTO_MAX_SIZE = config('PROFILE_PHOTO_MAX_SIZE', default=5 * 1024 * 1024, cast=int)  # bytes
+PROFILE_PHOTO_MAX_PIXELS = config('PROFILE_PHOTO_MAX_PIXELS', default=25_000_000, cast=int)
+PROFILE_PHOTO_ASYNC = config('PROFILE_PHOTO_ASYNC', default=True, cast=bool)  # False: build thumbnails inline after commit
+PROFILE_PHOTO_WORKERS = config('PROFILE_PHOTO_WORKERS', default=2, cast=int)  # thumbnail threads per web process
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -0,0 +1,32 @@
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+    // Only classes that appear in these files end up in the built bundle.
+    content: [
+        './exam_app/templates/**/*.html',
+        './exam_app/assets/js/**/*.js',
+    ],
+    theme: {
+        extend: {
+            keyframes: {
+                fadeIn: {
+                    from: { opacity: '0' },
+                    to: { opacity: '1' },
+                },
+                slideUp: {
+                    from: { transform: 'translateY(20px)', opacity: '0' },
+                    to: { transform: 'translateY(0)', opacity: '1' },
+                },
+                float: {
+                    '0%, 100%': { transform: 'translateY(0px)' },
+                    '50%': { transform: 'translateY(-10px)' },
+                },
+            },
+            animation: {
+                'fade-in': 'fadeIn 0.5s ease-in-out',
+                'slide-up': 'slideUp 0.3s ease-out',
+                'float': 'float 3s ease-in-out infinite',
+            },
+        },
+    },
+    plugins: [],
+};